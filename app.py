@@ -1,22 +1,50 @@
-
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from flask_marshmallow import Marshmallow
 import os
-from spectree import SpecTree, SecurityScheme
+from datetime import timedelta
+from spectree import SecurityScheme
+
+import utils.database  # noqa: F401  (PRAGMA foreign_keys no SQLite)
+from utils.spec import PrebuiltSpecTree, openapi_cli
+from utils.validation import SampledFlaskPlugin
+from utils.ratelimit import RateLimiter
+from utils.due_scheduler import DueScheduler
+from utils.progress_history import ProgressHistory
+from utils.risk_score import RiskScoreJob
+from utils.leaderboard import Leaderboard
+from utils.async_db import AsyncDatabase
+from utils.token_blocklist import TokenBlocklist
+from utils.idempotency import Idempotency
+from utils.progress_stream import ProgressStream
+from utils.webhooks import WebhookDelivery
+from utils.pdi_archive import PDIArchiveJob
+from utils.user_import import UserImportQueue
 
 # Inicializar extensões globalmente
+# (nada aqui cria a aplicação: o app só é montado em create_app)
 db = SQLAlchemy()
-ma = Marshmallow()
 jwt = JWTManager()
 cors = CORS()
 migrate = Migrate()
+limiter = RateLimiter()
+due_scheduler = DueScheduler()
+progress_history = ProgressHistory()
+risk_score_job = RiskScoreJob()
+leaderboard = Leaderboard()
+async_db = AsyncDatabase()
+token_blocklist = TokenBlocklist()
+idempotency = Idempotency()
+progress_stream = ProgressStream()
+webhook_delivery = WebhookDelivery()
+pdi_archive_job = PDIArchiveJob()
+user_import_queue = UserImportQueue()
 
-api = SpecTree(
+api = PrebuiltSpecTree(
     "flask",
+    backend=SampledFlaskPlugin,
     title="PDI API",
     version="v.1.0",
     path="docs",
@@ -37,35 +65,128 @@ def create_app():
     app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-me'
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL') or 'sqlite:///pdi.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600
+    # Access token curto + refresh token; logout revoga pelo jti
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(
+        minutes=int(os.environ.get('JWT_ACCESS_TOKEN_MINUTES') or 15)
+    )
+    app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(
+        days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS') or 30)
+    )
+    # Número de processos servindo o app (o gunicorn.conf.py publica); com
+    # mais de um, os stores memory:// abaixo valem só por worker: a
+    # blocklist e a idempotência nem sobem assim, o stream SSE avisa
+    app.config['WEB_CONCURRENCY'] = int(os.environ.get('WEB_CONCURRENCY') or 1)
+    # Threads por worker (idem; 0 = fora do gunicorn, sem limite conhecido)
+    app.config['SERVER_THREADS'] = int(os.environ.get('GUNICORN_THREADS') or 0)
+    # Tokens revogados: database:// (tabela revoked_tokens, padrão) ou
+    # redis://... entre workers; memory:// só com um worker
+    app.config['BLOCKLIST_STORAGE_URL'] = os.environ.get('BLOCKLIST_STORAGE_URL') or 'database://'
+    # Respostas das rotas de criação por Idempotency-Key: database:// (tabela
+    # idempotency_keys, padrão) ou redis://...; memory:// só com um worker
+    app.config['IDEMPOTENCY_STORAGE_URL'] = os.environ.get('IDEMPOTENCY_STORAGE_URL') or 'database://'
+    app.config['IDEMPOTENCY_TTL_SECONDS'] = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS') or 86400)
+    # Eventos SSE de progresso entre workers: memory:// (um worker) ou
+    # redis://... (obrigatório em produção, com vários workers)
+    app.config['PROGRESS_STREAM_STORAGE_URL'] = os.environ.get('PROGRESS_STREAM_STORAGE_URL') or 'memory://'
+    # Conexões SSE por worker; nunca mais que metade de SERVER_THREADS
+    app.config['PROGRESS_STREAM_MAX_SUBSCRIBERS'] = int(os.environ.get('PROGRESS_STREAM_MAX_SUBSCRIBERS') or 100)
+    # Webhooks de PDI/meta concluídos (outbox); sem URL nada é gravado
+    app.config['WEBHOOK_URL'] = os.environ.get('WEBHOOK_URL')
+    app.config['WEBHOOK_SECRET'] = os.environ.get('WEBHOOK_SECRET')
+    app.config['WEBHOOK_DELIVERY_ENABLED'] = os.environ.get('WEBHOOK_DELIVERY_ENABLED', 'false').lower() == 'true'
+    # Limite de linhas por importação em lote de usuários (roda em background,
+    # ~0.2s de CPU por senha divididos pelo pool de hash do worker)
+    app.config['USER_IMPORT_MAX_ROWS'] = int(os.environ.get('USER_IMPORT_MAX_ROWS') or 10000)
+    # Documento OpenAPI pré-gerado (flask openapi dump); se ausente é gerado
+    # no primeiro acesso a /docs
+    app.config['OPENAPI_SPEC_FILE'] = os.environ.get('OPENAPI_SPEC_FILE')
+    # Validação das respostas pelo SpecTree: full | sampled | off
+    # (a validação das requisições continua sempre ligada)
+    app.config['API_RESPONSE_VALIDATION'] = os.environ.get('API_RESPONSE_VALIDATION') or 'full'
+    app.config['API_RESPONSE_VALIDATION_SAMPLE_RATE'] = float(
+        os.environ.get('API_RESPONSE_VALIDATION_SAMPLE_RATE') or 0.01
+    )
+    # Rate limit: memory:// por processo ou redis://... compartilhado entre workers
+    app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', 'true').lower() != 'false'
+    app.config['RATELIMIT_STORAGE_URL'] = os.environ.get('RATELIMIT_STORAGE_URL') or 'memory://'
+    # Lembretes de prazo (thread em background; desligado por padrão)
+    app.config['DUE_SCHEDULER_ENABLED'] = os.environ.get('DUE_SCHEDULER_ENABLED', 'false').lower() == 'true'
+    # Recalculo periódico do risk_score (0 = só pelo comando `flask risk compute`)
+    app.config['RISK_SCORE_INTERVAL_HOURS'] = float(os.environ.get('RISK_SCORE_INTERVAL_HOURS') or 0)
+    # Arquivamento periódico de PDIs (0 = só pelo comando `flask pdi-archive run`);
+    # com COMPLETED_DAYS > 0 leva também os concluídos parados há N dias
+    app.config['PDI_ARCHIVE_INTERVAL_HOURS'] = float(os.environ.get('PDI_ARCHIVE_INTERVAL_HOURS') or 0)
+    app.config['PDI_ARCHIVE_COMPLETED_DAYS'] = int(os.environ.get('PDI_ARCHIVE_COMPLETED_DAYS') or 0)
+    # Leaderboard em memória: tamanho do top-K e intervalo para remontar do banco
+    app.config['LEADERBOARD_SIZE'] = int(os.environ.get('LEADERBOARD_SIZE') or 100)
+    app.config['LEADERBOARD_REBUILD_SECONDS'] = int(os.environ.get('LEADERBOARD_REBUILD_SECONDS') or 300)
+    # Folga da marca d'água da remontagem (conclusões ainda gravando)
+    app.config['LEADERBOARD_COMMIT_GRACE_SECONDS'] = int(os.environ.get('LEADERBOARD_COMMIT_GRACE_SECONDS') or 30)
+    # Leituras de PDI com views async e consultas em paralelo (requer
+    # flask[async] e o driver assíncrono, p.ex. aiosqlite)
+    app.config['PDI_ASYNC_READS'] = os.environ.get('PDI_ASYNC_READS', 'false').lower() == 'true'
+    app.config['ASYNC_DATABASE_URL'] = os.environ.get('ASYNC_DATABASE_URL')
+    # Pool do engine assíncrono (conexões reaproveitadas entre requisições)
+    app.config['ASYNC_DB_POOL_SIZE'] = int(os.environ.get('ASYNC_DB_POOL_SIZE') or 5)
+    app.config['ASYNC_DB_MAX_OVERFLOW'] = int(os.environ.get('ASYNC_DB_MAX_OVERFLOW') or 10)
     
     # Inicializar extensões
     db.init_app(app)
-    ma.init_app(app)
     jwt.init_app(app)
+    token_blocklist.init_app(app)
     cors.init_app(app)
     migrate.init_app(app, db)
+    limiter.init_app(app)
+    progress_history.init_app(app)
+    leaderboard.init_app(app)
+    async_db.init_app(app)
+    idempotency.init_app(app)
+    progress_stream.init_app(app)
+    user_import_queue.init_app(app)
 
     # Importar controllers DENTRO da função para evitar imports circulares
     from controllers.auth import auth_controller
     from controllers.user import user_controller
     from controllers.PDIController import pdi_bp
+    from controllers.weekly_form import weekly_form_controller
+    from controllers.todo import todo_controller
     
     # Registrar blueprints
     app.register_blueprint(auth_controller, url_prefix='/api/auth')
     app.register_blueprint(user_controller, url_prefix='/api/users')
     app.register_blueprint(pdi_bp, url_prefix='/api/pdi')
+    app.register_blueprint(weekly_form_controller, url_prefix='/api/weekly-forms')
+    app.register_blueprint(todo_controller, url_prefix='/api/todos')
+
+    # Mesmas URLs, views assíncronas no lugar das síncronas
+    if app.config['PDI_ASYNC_READS']:
+        from controllers.PDIAsyncController import ASYNC_VIEWS
+        app.view_functions.update(ASYNC_VIEWS)
+
+    # Scheduler depois dos blueprints: os modelos PDI já estão configurados
+    due_scheduler.init_app(app)
+    risk_score_job.init_app(app)
+    webhook_delivery.init_app(app)
+    pdi_archive_job.init_app(app)
+
+    from models.PDI.tecnologia_model import tecnologias_cli
+    app.cli.add_command(tecnologias_cli)
     
     # Rota de teste
     @app.route('/')
     def index():
         return {'message': 'PDI API is running', 'status': 'ok'}
+
+    @app.route('/metrics/ratelimit')
+    def ratelimit_metrics():
+        return limiter.stats()
     
-    api.register(app) 
+    # Só registra as rotas de /docs; o documento é montado sob demanda
+    api.register(app)
+    app.extensions['spectree'] = api
+    app.cli.add_command(openapi_cli)
     return app
 
-# Criar aplicação
-app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,79 @@
+"""
+Relatório de tempo de import (cold start).
+
+Roda ``python -X importtime`` importando o app e montando a aplicação, agrupa o
+tempo cumulativo por pacote de topo e compara o total com um orçamento.
+
+Uso:
+    python benchmarks/import_budget.py [--budget-ms 1000] [--top 15]
+
+Sai com código 1 se o total passar do orçamento, para poder rodar no CI.
+
+O orçamento é de 1000 ms e o app fica em torno de 950 ms: dependências
+pesadas usadas só por alguns caminhos (NumPy nos cálculos de risk score,
+burndown e coortes; ``sqlalchemy.ext.asyncio`` no engine assíncrono) são
+importadas dentro das funções que as usam, não no topo do módulo.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TARGET = "from app import create_app; create_app()"
+
+
+def collect_import_times():
+    """Executa o import em um processo limpo e devolve [(modulo, self_us, cumulativo_us)]"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", TARGET],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(proc.returncode)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def summarize(rows):
+    """Soma o tempo próprio de cada módulo no pacote de topo ao qual ele pertence"""
+    per_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        per_package[name.strip().split(".")[0]] += self_us
+    return sorted(per_package.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = collect_import_times()
+    packages = summarize(rows)
+    total_ms = sum(us for _, us in packages) / 1000
+
+    print(f"{'pacote':<32}{'ms':>10}{'%':>8}")
+    for name, us in packages[: args.top]:
+        print(f"{name:<32}{us / 1000:>10.1f}{100 * us / 1000 / total_ms:>8.1f}")
+    print(f"{'TOTAL':<32}{total_ms:>10.1f}")
+    print(f"orçamento: {args.budget_ms:.0f} ms")
+
+    if total_ms > args.budget_ms:
+        print("❌ tempo de import acima do orçamento")
+        raise SystemExit(1)
+    print("✅ dentro do orçamento")
+
+
+if __name__ == "__main__":
+    main()
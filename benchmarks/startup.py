@@ -0,0 +1,66 @@
+"""
+Benchmark de cold start: tempo até a primeira resposta.
+
+Cada rodada sobe um interpretador novo, importa o app, chama ``create_app`` e
+faz um ``GET /`` pelo test client. O tempo é medido pelo processo pai, do
+``spawn`` até a resposta, então inclui a subida do Python como no serverless.
+
+Uso:
+    python benchmarks/startup.py [--runs 10] [--path /]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+
+CHILD = """
+import sys, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+status = app.test_client().get(sys.argv[1]).status_code
+t3 = time.perf_counter()
+print(f"{t1 - t0:.6f} {t2 - t1:.6f} {t3 - t2:.6f} {status}")
+"""
+
+
+def run_once(path):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD, path],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = time.perf_counter() - start
+    imports, factory, first_request, status = proc.stdout.split()
+    return total, float(imports), float(factory), float(first_request), int(status)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tempo até a primeira resposta")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/")
+    args = parser.parse_args()
+
+    results = [run_once(args.path) for _ in range(args.runs)]
+
+    print(f"GET {args.path} -> {results[0][4]} ({args.runs} rodadas)")
+    labels = ("total (spawn→resposta)", "import app", "create_app", "primeira requisição")
+    for index, label in enumerate(labels):
+        values = [result[index] * 1000 for result in results]
+        print(
+            f"{label:<26} mediana {statistics.median(values):8.1f} ms"
+            f"   min {min(values):8.1f} ms   max {max(values):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Overhead por requisição da validação do SpecTree, por modo.
+
+Monta um app mínimo com uma rota que devolve uma PDIResponseList (como
+``get_all_pdis``) e mede o tempo médio por requisição com a validação de
+resposta em ``full``, ``sampled`` e ``off``, além de uma rota sem
+``@api.validate`` como referência.
+
+Uso:
+    python benchmarks/validation_overhead.py [--requests 2000] [--pdis 50]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask, jsonify  # noqa: E402
+from spectree import Response  # noqa: E402
+
+from app import api  # noqa: E402
+from models.PDI.schemas import PDIResponseList  # noqa: E402
+from utils.validation import RESPONSE_VALIDATION_MODES  # noqa: E402
+
+
+def fake_pdis(count):
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "id": index, "title": f"PDI {index}", "subtitle": None, "description": None,
+            "goal": None, "status": "open", "progress": index % 100, "category": "backend",
+            "priority": "media", "nivel": "junior", "is_specific": True,
+            "is_measurable": True, "is_achievable": True, "is_relevant": True,
+            "is_time_bound": False, "data_inicio": None, "deadline": None,
+            "created_at": now, "last_update": now, "student_id": 1, "mentor_id": None,
+            "metas_concluidas": 1, "metas_totais": 3,
+            "projetos_concluidos": 0, "projetos_totais": 1,
+        }
+        for index in range(count)
+    ]
+
+
+def build_app(pdis):
+    app = Flask(__name__)
+    body = {"page": 1, "pages": 1, "total": len(pdis), "pdis": pdis}
+
+    @app.get("/validated")
+    @api.validate(resp=Response(HTTP_200=PDIResponseList), tags=["bench"])
+    def validated():
+        return jsonify(body), 200
+
+    @app.get("/plain")
+    def plain():
+        return jsonify(body), 200
+
+    return app
+
+
+def measure(client, path, requests):
+    for _ in range(min(requests, 200)):
+        client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="overhead da validação por modo")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--pdis", type=int, default=50)
+    args = parser.parse_args()
+
+    app = build_app(fake_pdis(args.pdis))
+    client = app.test_client()
+
+    baseline = measure(client, "/plain", args.requests)
+    print(f"{'modo':<12}{'us/req':>10}{'overhead':>12}")
+    print(f"{'sem spectree':<12}{baseline:>10.1f}{'-':>12}")
+    for mode in RESPONSE_VALIDATION_MODES:
+        app.config["API_RESPONSE_VALIDATION"] = mode
+        per_request = measure(client, "/validated", args.requests)
+        print(f"{mode:<12}{per_request:>10.1f}{per_request - baseline:>+12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Throughput do gunicorn por combinação de workers x threads.
+
+Para cada configuração sobe ``gunicorn main:app`` (com o gunicorn.conf.py do
+projeto, só trocando WEB_CONCURRENCY/GUNICORN_THREADS), espera responder e
+dispara requisições de vários clientes em paralelo por alguns segundos.
+Mostra requisições/s e latência p50/p99. O banco é um SQLite temporário.
+
+Uso:
+    python benchmarks/wsgi_throughput.py [--configs 1x1,2x1,2x4,4x2]
+        [--clients 16] [--seconds 5] [--path /]
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port, path, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn não respondeu na porta {port}")
+
+
+def client(port, path, stop_at, latencies, errors):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(None)
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run_config(workers, threads, clients, seconds, path, database_url):
+    port = free_port()
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_ACCESS_LOG="",
+        BIND=f"127.0.0.1:{port}",
+        DATABASE_URL=database_url,
+        API_RESPONSE_VALIDATION="off",
+        RATELIMIT_ENABLED="false",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port, path)
+        latencies, errors = [], []
+        stop_at = time.monotonic() + seconds
+        pool = [
+            threading.Thread(target=client, args=(port, path, stop_at, latencies, errors))
+            for _ in range(clients)
+        ]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / seconds,
+        "p50": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else float("nan"),
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="throughput por workers x threads")
+    parser.add_argument("--configs", default="1x1,2x1,2x4,4x2",
+                        help="lista de WORKERSxTHREADS separada por vírgula")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--path", default="/")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print(f"GET {args.path}, {args.clients} clientes, {args.seconds:g}s por configuração "
+              f"({os.cpu_count()} CPUs)")
+        print(f"{'workers x threads':<18}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'erros':>8}")
+        for config in args.configs.split(","):
+            workers, threads = (int(value) for value in config.lower().split("x"))
+            result = run_config(
+                workers, threads, args.clients, args.seconds, args.path, database_url
+            )
+            print(
+                f"{config:<18}{result['rps']:>10.0f}{result['p50']:>10.2f}"
+                f"{result['p99']:>10.2f}{result['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# controllers/PDIAsyncController.py
+# Versões assíncronas das rotas de leitura do PDI.
+#
+# Não têm rota própria: com PDI_ASYNC_READS ligado, create_app troca a view
+# dos endpoints síncronos equivalentes (mesma URL, mesmo contrato) por estas.
+# As consultas filhas são independentes entre si e rodam ao mesmo tempo no
+# engine assíncrono, então a latência fica perto da consulta mais lenta em
+# vez da soma de todas.
+from flask import jsonify
+from flask_jwt_extended import jwt_required
+from sqlalchemy import case, func, select
+from spectree import Response
+from typing import List
+
+from app import api, async_db
+from models.PDI import Meta, Tarefa
+from models.PDI.archive_model import pdi_tree_statements, pdi_completo_from_rows
+from models.PDI.enums import MetaStatus
+from models.PDI.schemas import PDIResponseCompleto, MetaResponse
+from controllers.PDIController import ErrorResponse
+
+# Consultas em Core (tabelas): não dependem da configuração dos mappers e
+# não deixam objetos ORM desanexados com relacionamentos lazy para trás
+metas = Meta.__table__
+tarefas = Tarefa.__table__
+
+COMPLETED = MetaStatus.COMPLETED.value
+
+
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=PDIResponseCompleto, HTTP_404=ErrorResponse),
+    tags=["PDI"]
+)
+async def get_one_pdi(pdi_id):
+    """
+    Obter um PDI específico
+
+    Retorna os detalhes completos de um PDI, incluindo metas e projetos.
+    PDIs já arquivados vêm das tabelas de arquivo (`archived: true`).
+    """
+    try:
+        archived = False
+        pdi_rows, meta_rows, projeto_rows, entregavel_rows = await async_db.gather(
+            *pdi_tree_statements(pdi_id)
+        )
+        if not pdi_rows:
+            # Já arquivado? Mesmas quatro consultas nas tabelas de arquivo
+            archived = True
+            pdi_rows, meta_rows, projeto_rows, entregavel_rows = await async_db.gather(
+                *pdi_tree_statements(pdi_id, archived=True)
+            )
+        if not pdi_rows:
+            return jsonify({"error": f"PDI {pdi_id} not found"}), 404
+
+        pdi_response = pdi_completo_from_rows(
+            pdi_rows[0], meta_rows, projeto_rows, entregavel_rows, archived=archived
+        )
+
+        return jsonify(pdi_response), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=List[MetaResponse], HTTP_400=ErrorResponse),
+    tags=["Metas"]
+)
+async def get_metas(pdi_id):
+    """
+    Listar metas de um PDI
+
+    Retorna todas as metas associadas a um PDI específico.
+    """
+    try:
+        meta_rows, count_rows = await async_db.gather(
+            select(metas).where(metas.c.pdi_id == pdi_id).order_by(metas.c.ordem),
+            select(
+                tarefas.c.meta_id,
+                func.count().label("totais"),
+                func.sum(case((tarefas.c.status == COMPLETED, 1), else_=0)).label("concluidas"),
+            )
+            .where(tarefas.c.pdi_id == pdi_id)
+            .group_by(tarefas.c.meta_id),
+        )
+        counts = {row["meta_id"]: row for row in count_rows}
+
+        metas_response = []
+        for meta in meta_rows:
+            meta_data = MetaResponse.model_validate(dict(meta)).model_dump()
+            count = counts.get(meta["id"])
+            meta_data['tarefas_concluidas'] = count["concluidas"] if count else 0
+            meta_data['tarefas_totais'] = count["totais"] if count else 0
+            metas_response.append(meta_data)
+
+        return jsonify(metas_response), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# endpoint síncrono -> view assíncrona que o substitui
+ASYNC_VIEWS = {
+    "pdi.get_one_pdi": get_one_pdi,
+    "pdi.get_metas": get_metas,
+}
@@ -1,23 +1,39 @@
 # controllers/PDIController.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response as FlaskResponse, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, delete
 from spectree import Response
 import math
 
-from app import db, api
+from app import db, api, limiter, progress_history, progress_stream, leaderboard, idempotency
 from models.UserModel import User
 from models.StudentModel import Student
-from models.PDI import PDI, Meta, Tarefa, Projeto
+from models.PDI import PDI, Meta, Tarefa, Projeto, Entregavel
+from models.PDI.entregavel_model import upsert_entregaveis
 from models.PDI.enums import PDIStatus, Prioridade
+from models.PDI.due_dates import due_items
+from models.PDI.due_reminder_model import recent_reminders
+from models.PDI.progress_event_model import progress_history_between
+from models.PDI.burndown import burndown_for
+from models.PDI.cohort_analytics import GROUP_COLUMNS, cached_cohort_stats
+from models.PDI.plan_import import import_plans
+from models.PDI.tecnologia_model import projetos_matching, tecnologia_usage
+from models.PDI.archive_model import archived_pdi_completo, pdi_page_with_archive
+from utils.leaderboard import PERIODS as LEADERBOARD_PERIODS
 from models.PDI.schemas import (
     PDICreate, PDIUpdate, PDIResponse, PDIResponseCompleto,
     MetaCreate, MetaResponse,
     TarefaCreate, TarefaResponse,
     ProjetoCreate, ProjetoResponse,
-    PDIResponseList
+    PDIResponseList, DueItemsResponse, DueRemindersResponse,
+    ProgressEventResponse, ProgressHistoryResponse,
+    BurndownResponse, BurndownListResponse, CohortAnalyticsResponse,
+    LeaderboardResponse, PlanImportResponse,
+    TecnologiaUsageResponse, TecnologiaProjetosResponse, TecnologiaStudentsResponse,
+    EntregavelBulkUpsert, EntregavelResponse, EntregavelBulkResponse
 )
 from datetime import datetime, timezone
+from typing import List
 
 # Importar ou definir esquema para respostas de erro
 from pydantic import BaseModel
@@ -38,7 +54,9 @@ pdi_bp = Blueprint('pdi', __name__, url_prefix='/pdi')
 # ----------------------------
 
 @pdi_bp.route('/', methods=['POST'])
+@limiter.limit("60/minute", key="user")
 @jwt_required()
+@idempotency.idempotent
 @api.validate(
     json=PDICreate,
     resp=Response(HTTP_201=PDIResponse, HTTP_404=ErrorResponse, HTTP_400=ErrorResponse),
@@ -91,6 +109,21 @@ def create_pdi():
         return jsonify({"error": str(e)}), 400
 
 
+def _include_archived():
+    """``?include_archived=true``: listas juntam os PDIs das tabelas de arquivo"""
+    return request.args.get('include_archived', 'false').lower() == 'true'
+
+
+def _archived_page(page, per_page, **filters):
+    total, pdis = pdi_page_with_archive(page, per_page, **filters)
+    return PDIResponseList(
+        page=page,
+        pages=math.ceil(total / per_page) if total > 0 else 1,
+        total=total,
+        pdis=[PDIResponse.model_validate(pdi).model_dump() for pdi in pdis]
+    ).model_dump()
+
+
 @pdi_bp.route('/', methods=['GET'])
 @jwt_required()
 @api.validate(
@@ -102,7 +135,8 @@ def get_all_pdis():
     Listar todos os PDIs
     
     Retorna uma lista paginada de PDIs.
-    Pode filtrar por status e student_id.
+    Pode filtrar por status e student_id; `include_archived=true` inclui
+    os PDIs já movidos para o arquivo.
     """
     try:
         page = request.args.get('page', 1, type=int)
@@ -110,6 +144,9 @@ def get_all_pdis():
         status = request.args.get('status')
         student_id = request.args.get('student_id')
         
+        if _include_archived():
+            return jsonify(_archived_page(page, per_page, status=status, student_id=student_id)), 200
+        
         # Construir query
         query = PDI.query
         
@@ -150,11 +187,15 @@ def get_one_pdi(pdi_id):
     Obter um PDI específico
     
     Retorna os detalhes completos de um PDI, incluindo metas e projetos.
+    PDIs já arquivados vêm das tabelas de arquivo (`archived: true`).
     """
     try:
         pdi = db.session.get(PDI, pdi_id)
         if not pdi:
-            return jsonify({"error": f"PDI {pdi_id} not found"}), 404
+            archived = archived_pdi_completo(pdi_id)
+            if archived is None:
+                return jsonify({"error": f"PDI {pdi_id} not found"}), 404
+            return jsonify(archived), 200
         
         # Carregar metas e projetos
         metas = Meta.query.filter_by(pdi_id=pdi_id).all()
@@ -221,11 +262,12 @@ def delete_pdi(pdi_id):
     Remove permanentemente um PDI e todos os seus dados relacionados.
     """
     try:
-        pdi = db.session.get(PDI, pdi_id)
-        if not pdi:
+        # Um único DELETE; metas, tarefas e projetos saem via ON DELETE CASCADE
+        result = db.session.execute(delete(PDI).where(PDI.id == pdi_id))
+        if result.rowcount == 0:
+            db.session.rollback()
             return jsonify({"error": f"PDI {pdi_id} not found"}), 404
         
-        db.session.delete(pdi)
         db.session.commit()
         
         return jsonify({"message": "PDI deleted successfully"}), 200
@@ -242,7 +284,7 @@ def delete_pdi(pdi_id):
 @pdi_bp.route('/<int:pdi_id>/metas', methods=['GET'])
 @jwt_required()
 @api.validate(
-    resp=Response(HTTP_200=MetaResponse(many=True), HTTP_400=ErrorResponse),
+    resp=Response(HTTP_200=List[MetaResponse], HTTP_400=ErrorResponse),
     tags=["Metas"]
 )
 def get_metas(pdi_id):
@@ -258,8 +300,9 @@ def get_metas(pdi_id):
         metas_response = []
         for meta in metas:
             meta_data = MetaResponse.model_validate(meta).model_dump()
-            meta_data['tarefas_concluidas'] = len([t for t in meta.tarefas if t.status == "completed"])
-            meta_data['tarefas_totais'] = len(meta.tarefas)
+            tarefas = meta.tarefas.all()  # relacionamento dinâmico: é uma query
+            meta_data['tarefas_concluidas'] = len([t for t in tarefas if t.status == "completed"])
+            meta_data['tarefas_totais'] = len(tarefas)
             metas_response.append(meta_data)
         
         return jsonify(metas_response), 200
@@ -269,7 +312,9 @@ def get_metas(pdi_id):
 
 
 @pdi_bp.route('/<int:pdi_id>/metas', methods=['POST'])
+@limiter.limit("60/minute", key="user")
 @jwt_required()
+@idempotency.idempotent
 @api.validate(
     json=MetaCreate,
     resp=Response(HTTP_201=MetaResponse, HTTP_404=ErrorResponse, HTTP_400=ErrorResponse),
@@ -325,7 +370,7 @@ def create_meta(pdi_id):
 @pdi_bp.route('/metas/<int:meta_id>/tarefas', methods=['GET'])
 @jwt_required()
 @api.validate(
-    resp=Response(HTTP_200=TarefaResponse(many=True), HTTP_400=ErrorResponse),
+    resp=Response(HTTP_200=List[TarefaResponse], HTTP_400=ErrorResponse),
     tags=["Tarefas"]
 )
 def get_tarefas(meta_id):
@@ -345,7 +390,9 @@ def get_tarefas(meta_id):
 
 
 @pdi_bp.route('/metas/<int:meta_id>/tarefas', methods=['POST'])
+@limiter.limit("60/minute", key="user")
 @jwt_required()
+@idempotency.idempotent
 @api.validate(
     json=TarefaCreate,
     resp=Response(HTTP_201=TarefaResponse, HTTP_404=ErrorResponse, HTTP_400=ErrorResponse),
@@ -425,7 +472,7 @@ def complete_tarefa(tarefa_id):
 @pdi_bp.route('/<int:pdi_id>/projetos', methods=['GET'])
 @jwt_required()
 @api.validate(
-    resp=Response(HTTP_200=ProjetoResponse(many=True), HTTP_400=ErrorResponse),
+    resp=Response(HTTP_200=List[ProjetoResponse], HTTP_400=ErrorResponse),
     tags=["Projetos"]
 )
 def get_projetos(pdi_id):
@@ -445,7 +492,9 @@ def get_projetos(pdi_id):
 
 
 @pdi_bp.route('/<int:pdi_id>/projetos', methods=['POST'])
+@limiter.limit("60/minute", key="user")
 @jwt_required()
+@idempotency.idempotent
 @api.validate(
     json=ProjetoCreate,
     resp=Response(HTTP_201=ProjetoResponse, HTTP_404=ErrorResponse, HTTP_400=ErrorResponse),
@@ -488,6 +537,71 @@ def create_projeto(pdi_id):
         return jsonify({"error": str(e)}), 400
 
 
+@pdi_bp.route('/projetos/<int:projeto_id>/entregaveis', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=List[EntregavelResponse], HTTP_400=ErrorResponse),
+    tags=["Projetos"]
+)
+def get_entregaveis(projeto_id):
+    """
+    Listar entregáveis de um projeto
+    
+    Retorna os arquivos/links entregues no projeto, com o status de cada um.
+    """
+    try:
+        entregaveis = Entregavel.query.filter_by(projeto_id=projeto_id).order_by(Entregavel.id).all()
+        
+        response = [EntregavelResponse.model_validate(entregavel).model_dump() for entregavel in entregaveis]
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/projetos/<int:projeto_id>/entregaveis', methods=['PUT'])
+@limiter.limit("60/minute", key="user")
+@jwt_required()
+@api.validate(
+    json=EntregavelBulkUpsert,
+    resp=Response(HTTP_200=EntregavelBulkResponse, HTTP_404=ErrorResponse, HTTP_400=ErrorResponse),
+    tags=["Projetos"]
+)
+def upsert_projeto_entregaveis(projeto_id):
+    """
+    Criar ou atualizar entregáveis em lote
+    
+    Cada item é identificado pelo `title` dentro do projeto: títulos novos
+    são criados; nos existentes só os campos enviados são sobrescritos
+    (trocar a `url` não mexe no `status`). Em INSERT ... ON CONFLICT; o
+    progresso do projeto é recalculado pelos aprovados.
+    """
+    try:
+        projeto = db.session.get(Projeto, projeto_id)
+        if not projeto:
+            return jsonify({"error": f"Projeto {projeto_id} not found"}), 404
+        
+        data = request.context.json
+        received = upsert_entregaveis(
+            projeto_id,
+            [entregavel.model_dump(mode="json", exclude_unset=True) for entregavel in data.entregaveis],
+        )
+        
+        projeto = db.session.get(Projeto, projeto_id)
+        response = EntregavelBulkResponse(
+            projeto_id=projeto_id,
+            received=received,
+            progress=projeto.progress,
+            status=projeto.status,
+            entregaveis=[EntregavelResponse.model_validate(entregavel) for entregavel in projeto.entregaveis]
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+
+
 # ----------------------------
 # Rotas adicionais úteis
 # ----------------------------
@@ -502,12 +616,16 @@ def get_pdis_by_student(student_id):
     """
     Listar PDIs de um estudante específico
     
-    Retorna todos os PDIs associados a um estudante.
+    Retorna todos os PDIs associados a um estudante
+    (`include_archived=true` inclui os arquivados).
     """
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
+        if _include_archived():
+            return jsonify(_archived_page(page, per_page, student_id=student_id)), 200
+        
         pdis = PDI.query.filter_by(student_id=student_id)\
                        .order_by(PDI.created_at.desc())\
                        .paginate(page=page, per_page=per_page, error_out=False)
@@ -525,6 +643,527 @@ def get_pdis_by_student(student_id):
         return jsonify({"error": str(e)}), 400
 
 
+@pdi_bp.route('/students/<int:student_id>/due', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=DueItemsResponse, HTTP_400=ErrorResponse),
+    tags=["Prazos"]
+)
+def get_due_by_student(student_id):
+    """
+    Prazos de um estudante
+    
+    Retorna tarefas, metas e PDIs em aberto já vencidos ou que vencem
+    nos próximos `days` dias (padrão 7).
+    """
+    try:
+        days = request.args.get('days', 7, type=int)
+        
+        response = DueItemsResponse(
+            **due_items(student_id=student_id, window_days=days)
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/mentors/<int:mentor_id>/due', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=DueItemsResponse, HTTP_400=ErrorResponse),
+    tags=["Prazos"]
+)
+def get_due_by_mentor(mentor_id):
+    """
+    Prazos dos PDIs de um mentor
+    
+    Retorna tarefas, metas e PDIs em aberto já vencidos ou que vencem
+    nos próximos `days` dias (padrão 7) em todos os PDIs do mentor.
+    """
+    try:
+        days = request.args.get('days', 7, type=int)
+        
+        response = DueItemsResponse(
+            **due_items(mentor_id=mentor_id, window_days=days)
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def _reminders_response(**owner):
+    """Lê ?since= (ISO 8601) e ?limit= e monta a resposta"""
+    since = request.args.get('since')
+    limit = min(request.args.get('limit', 50, type=int), 200)
+    reminders = recent_reminders(
+        since=datetime.fromisoformat(since) if since else None,
+        limit=limit,
+        **owner,
+    )
+    return DueRemindersResponse(reminders=reminders).model_dump()
+
+
+@pdi_bp.route('/students/<int:student_id>/reminders', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=DueRemindersResponse, HTTP_400=ErrorResponse),
+    tags=["Prazos"]
+)
+def get_reminders_by_student(student_id):
+    """
+    Lembretes de prazo enviados a um estudante
+    
+    Lembretes "upcoming" e "overdue" já disparados pelo scheduler de
+    prazos, mais recentes primeiro. Aceita `since` (ISO 8601) e `limit`
+    (padrão 50, máximo 200).
+    """
+    try:
+        return jsonify(_reminders_response(student_id=student_id)), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/mentors/<int:mentor_id>/reminders', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=DueRemindersResponse, HTTP_400=ErrorResponse),
+    tags=["Prazos"]
+)
+def get_reminders_by_mentor(mentor_id):
+    """
+    Lembretes de prazo dos PDIs de um mentor
+    
+    Lembretes já disparados em todos os PDIs do mentor, mais recentes
+    primeiro. Aceita `since` (ISO 8601) e `limit` (padrão 50, máximo 200).
+    """
+    try:
+        return jsonify(_reminders_response(mentor_id=mentor_id)), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# ----------------------------
+# Histórico de progresso
+# ----------------------------
+
+def _history_response(**filters):
+    """Lê o intervalo ?since=&until= (ISO 8601) e monta a resposta"""
+    since = request.args.get('since')
+    until = request.args.get('until')
+    limit = request.args.get('limit', 1000, type=int)
+    since = datetime.fromisoformat(since) if since else None
+    until = datetime.fromisoformat(until) if until else None
+    
+    events = [
+        ProgressEventResponse.model_validate(event)
+        for event in progress_history_between(since=since, until=until, limit=limit, **filters)
+    ]
+    # Junta os eventos ainda no buffer deste processo (sem gravar na leitura).
+    # Um lote gravado entre a consulta e a leitura do buffer aparece nos dois
+    stored = {_event_key(event) for event in events}
+    for event in progress_history.pending(since=since, until=until, **filters):
+        event = ProgressEventResponse.model_validate(event)
+        if _event_key(event) not in stored:
+            events.append(event)
+    events.sort(key=lambda event: event.ts)
+    return ProgressHistoryResponse(events=events[:limit]).model_dump()
+
+
+def _event_key(event):
+    return (event.entity_type, event.entity_id, event.progress, event.status, event.ts)
+
+
+@pdi_bp.route('/<int:pdi_id>/history', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=ProgressHistoryResponse, HTTP_400=ErrorResponse),
+    tags=["Histórico"]
+)
+def get_pdi_history(pdi_id):
+    """
+    Histórico de progresso de um PDI
+    
+    Eventos de mudança de progresso/status do PDI, em ordem cronológica.
+    Aceita `since` e `until` (ISO 8601).
+    """
+    try:
+        return jsonify(_history_response(entity_type="pdi", entity_id=pdi_id)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/metas/<int:meta_id>/history', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=ProgressHistoryResponse, HTTP_400=ErrorResponse),
+    tags=["Histórico"]
+)
+def get_meta_history(meta_id):
+    """
+    Histórico de progresso de uma meta
+    
+    Eventos de mudança de progresso/status da meta, em ordem cronológica.
+    Aceita `since` e `until` (ISO 8601).
+    """
+    try:
+        return jsonify(_history_response(entity_type="meta", entity_id=meta_id)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/students/<int:student_id>/history', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=ProgressHistoryResponse, HTTP_400=ErrorResponse),
+    tags=["Histórico"]
+)
+def get_student_history(student_id):
+    """
+    Histórico de progresso de um estudante
+    
+    Eventos de todos os PDIs e metas do estudante, em ordem cronológica.
+    Aceita `since` e `until` (ISO 8601).
+    """
+    try:
+        return jsonify(_history_response(student_id=student_id)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# ----------------------------
+# Burndown
+# ----------------------------
+
+@pdi_bp.route('/<int:pdi_id>/burndown', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=BurndownResponse, HTTP_404=ErrorResponse, HTTP_400=ErrorResponse),
+    tags=["Analytics"]
+)
+def get_pdi_burndown(pdi_id):
+    """
+    Burndown de um PDI
+    
+    Pontos restantes por dia contra a linha ideal até o deadline,
+    velocidade (pontos/dia na janela `window`, padrão 7) e data
+    projetada de conclusão.
+    """
+    try:
+        window = request.args.get('window', 7, type=int)
+        
+        burndowns = burndown_for(pdi_id=pdi_id, window=window)
+        if not burndowns:
+            return jsonify({"error": f"PDI {pdi_id} not found"}), 404
+        
+        response = BurndownResponse(**burndowns[0]).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/mentors/<int:mentor_id>/burndown', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=BurndownListResponse, HTTP_400=ErrorResponse),
+    tags=["Analytics"]
+)
+def get_mentor_burndown(mentor_id):
+    """
+    Burndown de todos os PDIs de um mentor
+    
+    Mesmo cálculo do burndown por PDI, feito de uma vez para todos os PDIs
+    do mentor. Use `series=false` para receber só os indicadores.
+    """
+    try:
+        window = request.args.get('window', 7, type=int)
+        include_series = request.args.get('series', 'true').lower() != 'false'
+        
+        burndowns = burndown_for(
+            mentor_id=mentor_id, window=window, include_series=include_series
+        )
+        
+        response = BurndownListResponse(burndowns=burndowns).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# ----------------------------
+# Stream de progresso (SSE)
+# ----------------------------
+
+def _progress_stream(*channels):
+    subscription = progress_stream.subscribe(*channels)
+    if subscription is None:
+        response = jsonify({"error": "Too many open progress streams, retry later"})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+    
+    return FlaskResponse(
+        progress_stream.events(subscription),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@pdi_bp.route('/students/<int:student_id>/stream', methods=['GET'])
+@jwt_required(locations=["headers", "query_string"])
+@api.validate(tags=["Histórico"])
+def stream_student_progress(student_id):
+    """
+    Stream de progresso dos PDIs de um estudante (SSE)
+    
+    Envia um evento `progress` ({type, pdi_id, meta_id, progress, status})
+    sempre que o progresso ou status de um PDI/meta do estudante muda.
+    `resync` pede para o cliente recarregar os PDIs. O EventSource do
+    navegador não envia headers: o token pode ir em `?jwt=`.
+    """
+    return _progress_stream(f"student:{student_id}")
+
+
+@pdi_bp.route('/mentors/<int:mentor_id>/stream', methods=['GET'])
+@jwt_required(locations=["headers", "query_string"])
+@api.validate(tags=["Histórico"])
+def stream_mentor_progress(mentor_id):
+    """
+    Stream de progresso dos PDIs de um mentor (SSE)
+    
+    Mesmos eventos de `/students/<id>/stream`, para todos os PDIs em que
+    o usuário é mentor.
+    """
+    return _progress_stream(f"mentor:{mentor_id}")
+
+
+@pdi_bp.route('/analytics/cohorts', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=CohortAnalyticsResponse, HTTP_400=ErrorResponse),
+    tags=["Analytics"]
+)
+def get_cohort_analytics():
+    """
+    Distribuição de progresso por grupo
+    
+    Agrupa os PDIs por `group_by` (category, nivel, priority, course ou
+    enrollment_year) e retorna mediana e p90 de progresso, taxa de
+    conclusão e tempo médio até concluir. Pode filtrar por `course` e
+    `enrollment_year`. O resultado é calculado uma vez por dia.
+    """
+    try:
+        group_by = request.args.get('group_by', 'category')
+        if group_by not in GROUP_COLUMNS:
+            return jsonify({"error": f"group_by must be one of {sorted(GROUP_COLUMNS)}"}), 400
+        
+        generated_on, groups = cached_cohort_stats(
+            group_by,
+            course=request.args.get('course'),
+            enrollment_year=request.args.get('enrollment_year', type=int),
+        )
+        
+        response = CohortAnalyticsResponse(
+            group_by=group_by,
+            generated_on=generated_on,
+            groups=groups
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/leaderboard', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=LeaderboardResponse, HTTP_400=ErrorResponse),
+    tags=["Analytics"]
+)
+def get_leaderboard():
+    """
+    Ranking de pontos das tarefas concluídas
+    
+    `period` pode ser weekly, monthly ou all; com `course` o ranking é só
+    dos estudantes daquele curso. `limit` (padrão 10) vai até o tamanho
+    do top-K mantido em memória.
+    """
+    try:
+        period = request.args.get('period', 'weekly')
+        if period not in LEADERBOARD_PERIODS:
+            return jsonify({"error": f"period must be one of {list(LEADERBOARD_PERIODS)}"}), 400
+        course = request.args.get('course')
+        limit = request.args.get('limit', 10, type=int)
+        
+        ranking = leaderboard.ranking(period, course=course, limit=max(limit, 0))
+        
+        response = LeaderboardResponse(
+            period=period,
+            course=course,
+            entries=[
+                {"rank": rank, "student_id": student_id, "points": points}
+                for rank, (student_id, points) in enumerate(ranking, start=1)
+            ]
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# ----------------------------
+# Índice de tecnologias
+# ----------------------------
+
+def _tecnologias_args():
+    """Lê ?tecnologias=a,b&match=all|any&after=&limit="""
+    names = [name for name in request.args.get('tecnologias', '').split(',') if name.strip()]
+    if not names:
+        raise ValueError("Informe ao menos uma tecnologia em `tecnologias`")
+    match = request.args.get('match', 'all')
+    if match not in ('all', 'any'):
+        raise ValueError("match must be one of ['all', 'any']")
+    after = request.args.get('after', 0, type=int)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+    return projetos_matching(names, match_all=(match == 'all')), match, after, limit
+
+
+@pdi_bp.route('/tecnologias', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=TecnologiaUsageResponse, HTTP_400=ErrorResponse),
+    tags=["Projetos"]
+)
+def get_tecnologias():
+    """
+    Tecnologias mais usadas nos projetos
+    
+    Quantidade de projetos e de estudantes por tecnologia, contada pelo
+    índice de tecnologias. `limit` limita a quantidade de tecnologias.
+    """
+    try:
+        limit = request.args.get('limit', type=int)
+        
+        response = TecnologiaUsageResponse(
+            tecnologias=[
+                {"name": name, "projetos": projetos, "students": students}
+                for name, projetos, students in tecnologia_usage(limit=limit)
+            ]
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/tecnologias/projetos', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=TecnologiaProjetosResponse, HTTP_400=ErrorResponse),
+    tags=["Projetos"]
+)
+def get_projetos_by_tecnologia():
+    """
+    Projetos por tecnologia
+    
+    `tecnologias` separadas por vírgula; `match=all` (padrão) exige todas,
+    `match=any` basta uma. Ordenado por id: passe `next_after` em `after`
+    para a próxima página.
+    """
+    try:
+        matching, match, after, limit = _tecnologias_args()
+        
+        projetos = Projeto.query.filter(
+            Projeto.id.in_(matching.scalar_subquery()),
+            Projeto.id > after
+        ).order_by(Projeto.id).limit(limit).all()
+        
+        response = TecnologiaProjetosResponse(
+            match=match,
+            projetos=[ProjetoResponse.model_validate(projeto) for projeto in projetos],
+            next_after=projetos[-1].id if len(projetos) == limit else None
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/tecnologias/students', methods=['GET'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=TecnologiaStudentsResponse, HTTP_400=ErrorResponse),
+    tags=["Projetos"]
+)
+def get_students_by_tecnologia():
+    """
+    Estudantes por tecnologia
+    
+    Estudantes com projetos que usam as `tecnologias` (mesmas regras de
+    `match` de /tecnologias/projetos), com quantos projetos casaram.
+    Paginado por `student_id` com `after`.
+    """
+    try:
+        matching, match, after, limit = _tecnologias_args()
+        
+        rows = db.session.execute(
+            db.select(PDI.student_id, db.func.count(Projeto.id))
+            .join(Projeto, Projeto.pdi_id == PDI.id)
+            .where(Projeto.id.in_(matching.scalar_subquery()), PDI.student_id > after)
+            .group_by(PDI.student_id)
+            .order_by(PDI.student_id)
+            .limit(limit)
+        ).all()
+        
+        response = TecnologiaStudentsResponse(
+            match=match,
+            students=[{"student_id": student_id, "projetos": count} for student_id, count in rows],
+            next_after=rows[-1][0] if len(rows) == limit else None
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@pdi_bp.route('/import', methods=['POST'])
+@jwt_required()
+@api.validate(
+    resp=Response(HTTP_200=PlanImportResponse, HTTP_400=ErrorResponse),
+    tags=["PDI"]
+)
+def import_pdi_plans():
+    """
+    Importar planos de uma planilha
+    
+    Recebe um arquivo CSV ou XLSX no campo `file`, uma linha por registro:
+    a coluna `registro` diz se é pdi, meta, tarefa ou projeto, e as demais
+    trazem os campos de criação de cada um. Metas e projetos pertencem ao
+    último pdi acima deles e tarefas à última meta. Planos com alguma linha
+    inválida não são gravados; os erros voltam com o número da linha.
+    """
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({"error": "Envie a planilha no campo 'file'"}), 400
+    
+    try:
+        received, totals, errors = import_plans(upload.stream, upload.filename or "")
+        
+        response = PlanImportResponse(
+            received=received,
+            errors=errors,
+            **totals
+        ).model_dump()
+        return jsonify(response), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+
+
 @pdi_bp.route('/me', methods=['GET'])
 @jwt_required()
 @api.validate(
@@ -535,7 +1174,8 @@ def get_my_pdis():
     """
     Listar PDIs do usuário atual
     
-    Retorna todos os PDIs do estudante associado ao usuário autenticado.
+    Retorna todos os PDIs do estudante associado ao usuário autenticado
+    (`include_archived=true` inclui os arquivados).
     """
     try:
         current_user_id = get_jwt_identity()
@@ -547,6 +1187,9 @@ def get_my_pdis():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
+        if _include_archived():
+            return jsonify(_archived_page(page, per_page, student_id=student.id)), 200
+        
         pdis = PDI.query.filter_by(student_id=student.id)\
                        .order_by(PDI.created_at.desc())\
                        .paginate(page=page, per_page=per_page, error_out=False)
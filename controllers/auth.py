@@ -1,21 +1,24 @@
-from app import db, api
+import time
+
+from app import db, api, limiter, token_blocklist
 
 from sqlalchemy import select
 from pydantic import BaseModel
 from spectree import Response
 
-from flask import Blueprint, request
-from flask_jwt_extended import create_access_token
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, current_app, request
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jti
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 
 from models import User
 from utils.responses import DefaultResponse
-from models.auth import LoginMessage,LoginResponseMessage
+from models.auth import LoginMessage,LoginResponseMessage,RefreshResponseMessage
 
 
 auth_controller = Blueprint("auth_controller", __name__, url_prefix="/auth")
 
 @auth_controller.post("/login")
+@limiter.limit("5/minute", key="ip")
 @api.validate(
     json=LoginMessage,
     resp=Response(HTTP_200=LoginResponseMessage, HTTP_401=DefaultResponse),
@@ -24,24 +27,46 @@ auth_controller = Blueprint("auth_controller", __name__, url_prefix="/auth")
 )
 def login():
     data = request.json
-    print("data recebida no login:", data)
 
     user = db.session.scalars(select(User).filter_by(username=data["username"])).first()
-    print("user:", user)
-    print("senha correta?:", user.verify_password(data["password"]) if user else None)
 
     if user and user.verify_password(data["password"]):
+        # Access token expira em JWT_ACCESS_TOKEN_EXPIRES; o refresh renova.
+        # O access leva o jti do refresh (rjti) para o logout derrubar os dois.
+        refresh_token = create_refresh_token(identity=user.username)
         return {
             "access_token": create_access_token(
-                identity=user.username, expires_delta=None
-            )
+                identity=user.username, additional_claims={"rjti": get_jti(refresh_token)}
+            ),
+            "refresh_token": refresh_token,
         }
 
     return {"msg": "Senha ou nome errado"}, 401
 
 
+@auth_controller.post("/refresh")
+@api.validate(resp=Response(HTTP_200=RefreshResponseMessage), tags=["auth"])
+@jwt_required(refresh=True)
+def refresh():
+    return {"access_token": create_access_token(
+        identity=get_jwt_identity(), additional_claims={"rjti": get_jwt()["jti"]}
+    )}
+
+
 @auth_controller.post("/logout")
 @api.validate(resp=Response(HTTP_200=DefaultResponse), tags=["auth"])
-@jwt_required()
+@jwt_required(verify_type=False)
 def logout():
-    return {"msg": "Entrou com sucesso"}
+    # Revoga o token enviado (access ou refresh) até ele expirar. Com o
+    # access, revoga também o refresh do par; com o refresh, os access
+    # gerados por ele caem pelo rjti (ver TokenBlocklist).
+    token = get_jwt()
+    token_blocklist.revoke(token["jti"], token.get("exp"))
+    if token.get("rjti"):
+        # exp do refresh não está no access: vale até o maior prazo possível
+        refresh_expires = current_app.config["JWT_REFRESH_TOKEN_EXPIRES"]
+        token_blocklist.revoke(
+            token["rjti"],
+            time.time() + refresh_expires.total_seconds() if refresh_expires else None,
+        )
+    return {"msg": "Saiu com sucesso"}
@@ -0,0 +1,142 @@
+from datetime import datetime, timezone
+
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy import delete as sql_delete, select
+from spectree import Response
+
+from app import db, api
+from models.StudentModel import Student
+from models.TodoModel import (
+    Todo, adjust_todo_counters, toggle_todos,
+    TodoCreate, TodoEdit, TodoToggle, TodoToggleResponse,
+    TodoResponse, TodoResponseList, TodoCountersResponse,
+)
+from utils.responses import DefaultResponse
+
+
+todo_controller = Blueprint("todo_controller", __name__, url_prefix="/todos")
+
+
+@todo_controller.get("/students/<int:student_id>")
+@api.validate(resp=Response(HTTP_200=TodoResponseList), tags=["todos"])
+@jwt_required()
+def get_student_todos(student_id):
+    done = request.args.get("done")
+    limit = request.args.get("limit", 100, type=int)
+
+    query = select(Todo).where(Todo.student_id == student_id)
+    if done is not None:
+        query = query.where(Todo.done.is_(done.lower() == "true"))
+
+    # mesma ordem do índice (student_id, done, due)
+    todos = db.session.scalars(
+        query.order_by(Todo.done, Todo.due).limit(limit)
+    ).all()
+
+    response = TodoResponseList(
+        todos=[TodoResponse.model_validate(todo) for todo in todos]
+    ).model_dump()
+
+    return response, 200
+
+
+@todo_controller.get("/students/<int:student_id>/counters")
+@api.validate(
+    resp=Response(HTTP_200=TodoCountersResponse, HTTP_404=DefaultResponse), tags=["todos"]
+)
+@jwt_required()
+def get_student_counters(student_id):
+    student = db.session.get(Student, student_id)
+    if student is None:
+        return {"msg": f"Estudante não encontrado {student_id}"}, 404
+
+    response = TodoCountersResponse(
+        student_id=student.id,
+        total_todos=student.total_todos or 0,
+        completed_todos=student.completed_todos or 0,
+    ).model_dump()
+
+    return response, 200
+
+
+@todo_controller.post("/")
+@api.validate(
+    json=TodoCreate,
+    resp=Response(HTTP_201=TodoResponse, HTTP_404=DefaultResponse),
+    tags=["todos"],
+)
+@jwt_required()
+def post_todo():
+    data = request.context.json
+
+    if db.session.get(Student, data.student_id) is None:
+        return {"msg": f"Estudante não encontrado {data.student_id}"}, 404
+
+    todo = Todo(
+        student_id=data.student_id,
+        title=data.title,
+        description=data.description,
+        due=data.due,
+        done=bool(data.done),
+        completed_at=datetime.now(timezone.utc) if data.done else None,
+    )
+    db.session.add(todo)
+    adjust_todo_counters({data.student_id: 1}, {data.student_id: 1 if data.done else 0})
+    db.session.commit()
+
+    return TodoResponse.model_validate(todo).model_dump(), 201
+
+
+@todo_controller.put("/<int:todo_id>")
+@api.validate(
+    json=TodoEdit,
+    resp=Response(HTTP_200=TodoResponse, HTTP_404=DefaultResponse),
+    tags=["todos"],
+)
+@jwt_required()
+def put_todo(todo_id):
+    todo = db.session.get(Todo, todo_id)
+    if todo is None:
+        return {"msg": f"Todo não encontrado {todo_id}"}, 404
+
+    for field, value in request.context.json.model_dump(exclude_unset=True).items():
+        setattr(todo, field, value)
+
+    db.session.commit()
+
+    return TodoResponse.model_validate(todo).model_dump(), 200
+
+
+@todo_controller.post("/toggle")
+@api.validate(json=TodoToggle, resp=Response(HTTP_200=TodoToggleResponse), tags=["todos"])
+@jwt_required()
+def post_toggle_todos():
+    data = request.context.json
+
+    changed = toggle_todos(data.ids, data.done)
+
+    return TodoToggleResponse(changed=changed).model_dump(), 200
+
+
+@todo_controller.delete("/<int:todo_id>")
+@api.validate(
+    resp=Response(HTTP_200=DefaultResponse, HTTP_404=DefaultResponse), tags=["todos"]
+)
+@jwt_required()
+def delete_todo(todo_id):
+    deleted = db.session.execute(
+        sql_delete(Todo)
+        .where(Todo.id == todo_id)
+        .returning(Todo.student_id, Todo.done)
+    ).first()
+    if deleted is None:
+        db.session.rollback()
+        return {"msg": f"Todo não encontrado {todo_id}"}, 404
+
+    adjust_todo_counters(
+        {deleted.student_id: -1}, {deleted.student_id: -1 if deleted.done else 0}
+    )
+    db.session.commit()
+
+    return {"msg": "Todo foi deletado"}, 200
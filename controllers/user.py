@@ -1,17 +1,28 @@
+import csv
+import io
+import json
 from datetime import datetime
 
-from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, current_user
-from sqlalchemy import select
+from flask import Blueprint, Response as FlaskResponse, current_app, request, stream_with_context
+from flask_jwt_extended import jwt_required, current_user, get_jwt_identity
+from sqlalchemy import delete as sql_delete, select
+from sqlalchemy.orm import contains_eager, joinedload
+from pydantic import ValidationError
 from spectree import Response
 
-from app import db, api
-from models.UserModel import User, UserCreate, UserEdit, UserResponse, UserResponseList
+from app import db, api, limiter, user_import_queue
+from models.RoleModel import Role
+from models.UserModel import (
+    User, UserCreate, UserEdit, UserResponse, UserResponseList,
+    UserListQuery, UserExportQuery, UserImportBody, UserImport, UserImportResponse,
+)
 from utils.responses import DefaultResponse
 
 
 user_controller = Blueprint("user_controller", __name__, url_prefix="/users")
 
+EXPORT_CHUNK = 1000
+
 
 @user_controller.get("/me")
 @jwt_required()
@@ -21,19 +32,115 @@ def me():
     return response, 200
 
 
+def _requester():
+    """Usuário do token (a identity é o username, ver auth.login)"""
+    return db.session.scalars(
+        select(User).filter_by(username=get_jwt_identity()).options(joinedload(User.role))
+    ).first()
+
+
+def _filter_users(query, filters):
+    """Aplica os filtros de papel, ativo e intervalo de criação"""
+    if filters.role is not None:
+        query = query.where(Role.name == filters.role)
+    if filters.active is not None:
+        # usuários antigos podem ter active nulo: contam como ativos
+        query = query.where(
+            User.active.is_not(False) if filters.active else User.active.is_(False)
+        )
+    if filters.created_from is not None:
+        query = query.where(User.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        query = query.where(User.created_at < filters.created_to)
+    return query
+
+
 @user_controller.get("/")
-@api.validate(resp=Response(HTTP_200=UserResponseList), tags=["users"])
+@api.validate(query=UserListQuery, resp=Response(HTTP_200=UserResponseList), tags=["users"])
 def get_users():
+    filters = request.context.query
+
+    # Paginação por chave (id > último visto): custo constante em qualquer
+    # página, ao contrário de OFFSET. O papel vem no mesmo SELECT.
+    query = _filter_users(
+        select(User).outerjoin(User.role).options(contains_eager(User.role)),
+        filters,
+    )
+    if filters.after is not None:
+        query = query.where(User.id > filters.after)
 
-    users = db.session.scalars(select(User)).all()
+    users = db.session.scalars(query.order_by(User.id).limit(filters.limit)).all()
 
     response = UserResponseList(
-        users=[UserResponse.model_validate(user).model_dump() for user in users]
+        users=[UserResponse.model_validate(user).model_dump() for user in users],
+        next_after=users[-1].id if len(users) == filters.limit else None,
     ).model_dump()
 
     return response, 200
 
 
+EXPORT_COLUMNS = ("id", "username", "email", "active", "role", "birthdate", "created_at")
+
+
+@user_controller.get("/export")
+@api.validate(query=UserExportQuery, tags=["users"])
+@jwt_required()
+def export_users():
+    requester = _requester()
+    if not (requester and requester.role and requester.role.can_access_sensitive_information):
+        return {"msg": "Você não tem permissão"}, 403
+
+    filters = request.context.query
+    query = _filter_users(
+        select(
+            User.id, User.username, User.email, User.active,
+            Role.name.label("role"), User.birthdate, User.created_at,
+        )
+        .outerjoin(User.role)
+        .order_by(User.id)
+        .execution_options(yield_per=EXPORT_CHUNK),
+        filters,
+    )
+
+    def rows():
+        # Tuplas direto do cursor, em lotes: memória constante em qualquer
+        # tamanho de tabela e nada de objetos ORM
+        for partition in db.session.execute(query).partitions():
+            yield [
+                {
+                    column: value.isoformat() if isinstance(value, datetime) else value
+                    for column, value in zip(EXPORT_COLUMNS, row)
+                }
+                for row in partition
+            ]
+
+    if filters.format == "ndjson":
+        def generate():
+            for partition in rows():
+                yield "".join(json.dumps(row) + "\n" for row in partition)
+
+        mimetype = "application/x-ndjson"
+    else:
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            for partition in rows():
+                writer.writerows(partition)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+
+        mimetype = "text/csv"
+
+    return FlaskResponse(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=users.{filters.format}"},
+    )
+
+
 @user_controller.get("/<int:user_id>")
 @api.validate(
     resp=Response(HTTP_200=UserResponse, HTTP_404=DefaultResponse), tags=["users"]
@@ -55,6 +162,7 @@ def get_user(user_id):
 
 
 @user_controller.post("/")
+@limiter.limit("10/minute", key="ip")
 @api.validate(
     json=UserCreate,
     resp=Response(HTTP_201=DefaultResponse),
@@ -85,6 +193,74 @@ def post_user():
     return {"msg": "Usuário criado com sucesso"}, 201
 
 
+def _import_rows():
+    """Linhas do corpo: JSON {"users": [...]}, CSV cru ou arquivo em 'file'"""
+    if "file" in request.files:
+        text = request.files["file"].read().decode("utf-8-sig")
+    elif request.mimetype == "text/csv":
+        text = request.get_data(as_text=True)
+    else:
+        return UserImportBody.model_validate(request.get_json()).users
+
+    return [
+        # célula vazia no CSV vale como ausente
+        {key: value for key, value in row.items() if value not in ("", None)}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+@user_controller.post("/import")
+@api.validate(
+    resp=Response(
+        HTTP_202=UserImportResponse, HTTP_400=DefaultResponse,
+        HTTP_403=DefaultResponse, HTTP_413=DefaultResponse,
+    ),
+    tags=["users"],
+)
+@jwt_required()
+def import_users_view():
+    """Enfileira a importação e responde 202; o resultado sai em
+    GET /users/import/<id> (Location) quando o status for done"""
+    requester = _requester()
+    if not (requester and requester.role and requester.role.can_manage_users):
+        return {"msg": "Você não tem permissão para importar usuários"}, 403
+
+    try:
+        rows = _import_rows()
+    except (ValidationError, UnicodeDecodeError, csv.Error) as e:
+        return {"msg": f"Arquivo inválido: {e}"}, 400
+
+    max_rows = current_app.config["USER_IMPORT_MAX_ROWS"]
+    if len(rows) > max_rows:
+        return {"msg": f"Máximo de {max_rows} usuários por importação"}, 413
+
+    job = UserImport(requested_by=requester.id, received=len(rows))
+    db.session.add(job)
+    db.session.commit()
+    user_import_queue.submit(job.id, rows)
+
+    response = UserImportResponse.model_validate(job).model_dump()
+    return response, 202, {"Location": f"{request.base_url}/{job.id}"}
+
+
+@user_controller.get("/import/<int:job_id>")
+@api.validate(
+    resp=Response(HTTP_200=UserImportResponse, HTTP_403=DefaultResponse, HTTP_404=DefaultResponse),
+    tags=["users"],
+)
+@jwt_required()
+def get_user_import(job_id):
+    requester = _requester()
+    if not (requester and requester.role and requester.role.can_manage_users):
+        return {"msg": "Você não tem permissão para importar usuários"}, 403
+
+    job = db.session.get(UserImport, job_id)
+    if job is None:
+        return {"msg": f"Importação não encontrada {job_id}"}, 404
+
+    return UserImportResponse.model_validate(job).model_dump(), 200
+
+
 @user_controller.put("/")
 @api.validate(
     json=UserEdit,
@@ -120,12 +296,16 @@ def put_user():
 )
 @jwt_required()
 def delete_user(user_id):
-    if not (current_user and current_user.role.can_manage_users):
+    requester = _requester()
+    if not (requester and requester.role and requester.role.can_manage_users):
         return {"msg": "Você não tem permissão para deletar usuários"}, 403
 
-    user = db.session.get(User, user_id)
+    # Estudante, PDIs e inscrições são removidos pelo banco (ON DELETE CASCADE)
+    result = db.session.execute(sql_delete(User).where(User.id == user_id))
+    if result.rowcount == 0:
+        db.session.rollback()
+        return {"msg": f"Usuário não encontrado {user_id}"}, 404
 
-    db.session.delete(user)
     db.session.commit()
 
     return {"msg": "Usuario foi deletado"}, 200
@@ -136,9 +316,8 @@ def delete_user(user_id):
 )
 @jwt_required()
 def delete():
-    user = db.session.get(User, current_user.id)
-
-    db.session.delete(user)
+    # username do token, sem carregar o usuário
+    db.session.execute(sql_delete(User).where(User.username == get_jwt_identity()))
     db.session.commit()
 
     return {"msg": "Usuario foi deletado"}, 200
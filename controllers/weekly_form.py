@@ -0,0 +1,124 @@
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func, select
+from spectree import Response
+
+from app import db, api
+from models.WeeklyFormModel import (
+    WeeklyForm, WeeklyStudentTotals, WeeklyCohortRollup, submit_weekly_forms,
+    WeeklyFormCreate, WeeklyFormBulkCreate, WeeklyFormBulkResponse,
+    WeeklyFormResponse, WeeklyStudentTrendResponse, WeeklyCohortTrendResponse,
+)
+from utils.responses import DefaultResponse
+
+
+weekly_form_controller = Blueprint("weekly_form_controller", __name__, url_prefix="/weekly-forms")
+
+
+def _bulk_response(received, created, updated, errors):
+    return WeeklyFormBulkResponse(
+        received=received,
+        created=created,
+        updated=updated,
+        errors=[{"index": index, "error": error} for index, error in errors],
+    ).model_dump()
+
+
+@weekly_form_controller.post("/")
+@api.validate(
+    json=WeeklyFormCreate,
+    resp=Response(HTTP_201=WeeklyFormBulkResponse, HTTP_404=DefaultResponse),
+    tags=["weekly forms"],
+)
+@jwt_required()
+def post_weekly_form():
+    form = request.context.json
+
+    created, updated, errors = submit_weekly_forms([form])
+    if errors:
+        return {"msg": errors[0][1]}, 404
+
+    return _bulk_response(1, created, updated, errors), 201
+
+
+@weekly_form_controller.post("/bulk")
+@api.validate(
+    json=WeeklyFormBulkCreate,
+    resp=Response(HTTP_200=WeeklyFormBulkResponse),
+    tags=["weekly forms"],
+)
+@jwt_required()
+def post_weekly_forms_bulk():
+    forms = request.context.json.forms
+
+    created, updated, errors = submit_weekly_forms(forms)
+
+    return _bulk_response(len(forms), created, updated, errors), 200
+
+
+@weekly_form_controller.get("/students/<int:student_id>")
+@api.validate(resp=Response(HTTP_200=WeeklyStudentTrendResponse), tags=["weekly forms"])
+@jwt_required()
+def get_student_trend(student_id):
+    weeks = request.args.get("weeks", 12, type=int)
+
+    forms = db.session.scalars(
+        select(WeeklyForm)
+        .where(WeeklyForm.student_id == student_id)
+        .order_by(WeeklyForm.week.desc())
+        .limit(weeks)
+    ).all()
+    totals = db.session.get(WeeklyStudentTotals, student_id)
+
+    count = totals.forms_count if totals else 0
+    response = WeeklyStudentTrendResponse(
+        student_id=student_id,
+        forms_count=count,
+        mood_avg=totals.mood_sum / count if count else None,
+        dedication_avg=totals.dedication_sum / count if count else None,
+        forms=[WeeklyFormResponse.model_validate(form) for form in reversed(forms)],
+    ).model_dump()
+
+    return response, 200
+
+
+@weekly_form_controller.get("/cohorts")
+@api.validate(resp=Response(HTTP_200=WeeklyCohortTrendResponse), tags=["weekly forms"])
+@jwt_required()
+def get_cohort_trend():
+    course = request.args.get("course")
+    enrollment_year = request.args.get("enrollment_year", type=int)
+    weeks = request.args.get("weeks", 12, type=int)
+
+    query = select(
+        WeeklyCohortRollup.week,
+        func.sum(WeeklyCohortRollup.forms_count).label("forms_count"),
+        func.sum(WeeklyCohortRollup.mood_sum).label("mood_sum"),
+        func.sum(WeeklyCohortRollup.dedication_sum).label("dedication_sum"),
+    ).group_by(WeeklyCohortRollup.week)
+
+    if course is not None:
+        query = query.where(WeeklyCohortRollup.course == course)
+    if enrollment_year is not None:
+        query = query.where(WeeklyCohortRollup.enrollment_year == enrollment_year)
+
+    rows = db.session.execute(
+        query.order_by(WeeklyCohortRollup.week.desc()).limit(weeks)
+    ).all()
+
+    response = WeeklyCohortTrendResponse(
+        course=course,
+        enrollment_year=enrollment_year,
+        weeks=[
+            {
+                "week": row.week,
+                "forms_count": row.forms_count,
+                "mood_avg": row.mood_sum / row.forms_count,
+                "dedication_avg": row.dedication_sum / row.forms_count,
+            }
+            for row in reversed(rows)
+            if row.forms_count
+        ],
+    ).model_dump()
+
+    return response, 200
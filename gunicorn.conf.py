@@ -0,0 +1,100 @@
+# gunicorn.conf.py
+# Uso: gunicorn main:app  (o gunicorn lê este arquivo automaticamente)
+#
+# Tudo pode ser ajustado por variável de ambiente; os padrões partem do
+# número de CPUs da máquina.
+import multiprocessing
+import os
+import re
+
+from gunicorn.glogging import Logger
+
+cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get("BIND") or f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Processos: a regra usual de 2 x CPUs + 1. Threads por processo cobrem o
+# tempo parado esperando o banco sem multiplicar a memória.
+workers = int(os.environ.get("WEB_CONCURRENCY") or cpus * 2 + 1)
+# Publicado para o app (create_app lê): com mais de um worker a blocklist e
+# a idempotência em memory:// recusam subir e o stream SSE avisa
+os.environ["WEB_CONCURRENCY"] = str(workers)
+threads = int(os.environ.get("GUNICORN_THREADS") or 2)
+# Também publicado: cada conexão SSE de progresso prende uma thread, e o
+# app limita os streams a metade delas (o resto atende a API)
+os.environ["GUNICORN_THREADS"] = str(threads)
+worker_class = "gthread" if threads > 1 else "sync"
+
+# App importado uma vez no master e compartilhado (copy-on-write) pelos
+# workers; main.py descarta as conexões herdadas depois do fork.
+preload_app = True
+
+# SIGTERM: o worker para de aceitar conexões e termina as requisições em
+# andamento por até graceful_timeout segundos antes de ser morto.
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT") or 30)
+timeout = int(os.environ.get("GUNICORN_TIMEOUT") or 30)
+keepalive = 5
+
+# Recicla workers aos poucos (com jitter para não reiniciarem juntos)
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS") or 0)
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+
+# O EventSource do stream SSE não manda headers: o token vai em ?jwt= e
+# não pode parar no access log
+_JWT_PARAM = re.compile(r"((?:^|[?&])jwt=)[^&\s]*")
+
+
+class RedactingLogger(Logger):
+    """Logger do gunicorn que troca o valor de ``jwt=`` por ``***`` na
+    linha da requisição, na query string e nos demais campos do access log"""
+
+    def atoms(self, resp, req, environ, request_time):
+        atoms = super().atoms(resp, req, environ, request_time)
+        return {
+            key: _JWT_PARAM.sub(r"\1***", value) if isinstance(value, str) else value
+            for key, value in atoms.items()
+        }
+
+
+logger_class = RedactingLogger
+
+
+def when_ready(server):
+    """O master não lembra de prazos: com preload_app a thread do scheduler
+    subiu nele, mas as escritas (notify) acontecem nos workers"""
+    from app import due_scheduler
+
+    if due_scheduler.app is not None and due_scheduler.app.config["DUE_SCHEDULER_ENABLED"]:
+        due_scheduler.stop()
+
+
+def post_worker_init(worker):
+    """Cada worker sobe o próprio scheduler de prazos e o recálculo do
+    risk_score (o fork não leva threads)"""
+    from app import due_scheduler, risk_score_job
+
+    due_scheduler.ensure_started()
+    risk_score_job.ensure_started()
+
+
+def worker_exit(server, worker):
+    """Grava o que ficou no buffer do histórico de progresso antes de sair
+    e marca como falhas as importações de usuários que não terminaram"""
+    from app import progress_history, user_import_queue
+
+    try:
+        failed = user_import_queue.fail_pending()
+        if failed:
+            server.log.warning("worker %s: %d importações de usuários interrompidas", worker.pid, failed)
+    except Exception:
+        server.log.exception("worker %s: falha ao marcar importações interrompidas", worker.pid)
+
+    try:
+        flushed = progress_history.flush()
+        if flushed:
+            server.log.info("worker %s: %d eventos de progresso gravados", worker.pid, flushed)
+    except Exception:
+        server.log.exception("worker %s: falha ao gravar histórico de progresso", worker.pid)
@@ -0,0 +1,29 @@
+# main.py
+# Ponto de entrada de produção: `gunicorn main:app` (config em gunicorn.conf.py)
+# e o módulo que o vercel.json aponta.
+import os
+
+from app import create_app, db
+
+app = create_app()
+
+
+def _dispose_engines():
+    """Descarta o pool de conexões herdado do processo pai.
+
+    Com o app pré-carregado no master, cada worker nasce com uma cópia das
+    conexões abertas antes do fork; usar o mesmo socket em dois processos
+    corrompe o protocolo do banco. ``close=False`` só esquece as conexões
+    herdadas (quem fecha é o pai) e o worker abre as suas sob demanda.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+# Vale para qualquer servidor que faz fork depois de importar este módulo
+os.register_at_fork(after_in_child=_dispose_engines)
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
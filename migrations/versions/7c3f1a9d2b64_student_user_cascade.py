@@ -0,0 +1,63 @@
+"""student.user_id on delete cascade
+
+Revision ID: 7c3f1a9d2b64
+Revises: 2e8cfd7ee687
+Create Date: 2026-10-19 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3f1a9d2b64'
+down_revision = '2e8cfd7ee687'
+branch_labels = None
+depends_on = None
+
+FK_NAME = 'student_user_id_fkey'
+# FKs sem nome (SQLite) recebem este nome na cópia do batch
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def _user_fk():
+    """FK student.user_id -> user.id como está no banco (ou None)"""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('student'):
+        return None
+    for fk in inspector.get_foreign_keys('student'):
+        if fk['referred_table'] == 'user' and fk['constrained_columns'] == ['user_id']:
+            return fk
+    return None
+
+
+def _replace_user_fk(ondelete):
+    fk = _user_fk()
+    if fk is None:
+        # A tabela student vem do create_all, que já cria a FK do modelo
+        return
+    if (fk.get('options', {}).get('ondelete') or '').upper() == (ondelete or '').upper():
+        return
+
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    if sqlite:
+        # O batch recria a tabela (DROP + RENAME): com as FKs ligadas o DROP
+        # apagaria em cascata os PDIs, formulários e todos dos estudantes.
+        # O SQLite ignora o PRAGMA dentro de transação, daí o autocommit.
+        with op.get_context().autocommit_block():
+            op.execute('PRAGMA foreign_keys=OFF')
+    with op.batch_alter_table('student', schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(fk['name'] or FK_NAME, type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'user', ['user_id'], ['id'], ondelete=ondelete)
+    if sqlite:
+        with op.get_context().autocommit_block():
+            op.execute('PRAGMA foreign_keys=ON')
+
+
+def upgrade():
+    # Apagar um usuário (DELETE em Core, sem o ORM) leva o estudante junto
+    _replace_user_fk('CASCADE')
+
+
+def downgrade():
+    _replace_user_fk(None)
@@ -0,0 +1,19 @@
+from app import db
+
+
+class IdempotencyKey(db.Model):
+    """Respostas guardadas por Idempotency-Key, store padrão de
+    utils/idempotency.py.
+
+    ``record`` é None enquanto a requisição original está em andamento e
+    aí ``expires_at`` é o fim da reserva (worker que morreu no meio não
+    trava a chave); com a resposta salva, é o fim do TTL.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = db.Column(db.String(512), primary_key=True)
+    record = db.Column(db.JSON)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey {self.key}>"
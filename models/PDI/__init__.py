@@ -6,20 +6,33 @@ from .pdi_model import PDI
 from .meta_model import Meta
 from .tarefa_model import Tarefa
 from .projeto_model import Projeto
+from .progress_event_model import ProgressEvent
+from .outbox_model import OutboxEvent
+from .tecnologia_model import Tecnologia
+from .entregavel_model import Entregavel
+from .due_reminder_model import DueReminder
+from . import archive_model  # noqa: F401  (tabelas *_archive no metadata)
 
 # Configurar relacionamentos
-PDI.metas = db.relationship("Meta", back_populates="pdi", cascade="all, delete-orphan", lazy="dynamic")
-PDI.projetos = db.relationship("Projeto", back_populates="pdi", cascade="all, delete-orphan", lazy="dynamic")
+# passive_deletes deixa o banco apagar os filhos via ON DELETE CASCADE,
+# sem carregar metas/tarefas/projetos na sessão.
+PDI.metas = db.relationship("Meta", back_populates="pdi", cascade="all, delete-orphan", passive_deletes=True, lazy="dynamic")
+PDI.projetos = db.relationship("Projeto", back_populates="pdi", cascade="all, delete-orphan", passive_deletes=True, lazy="dynamic")
 
 Meta.pdi = db.relationship("PDI", back_populates="metas")
-Meta.tarefas = db.relationship("Tarefa", back_populates="meta", cascade="all, delete-orphan", lazy="dynamic")
+Meta.tarefas = db.relationship("Tarefa", back_populates="meta", cascade="all, delete-orphan", passive_deletes=True, lazy="dynamic")
 
 Tarefa.meta = db.relationship("Meta", back_populates="tarefas")
 Tarefa.pdi = db.relationship("PDI", foreign_keys=[Tarefa.pdi_id])
 
 Projeto.pdi = db.relationship("PDI", back_populates="projetos")
+# selectin: os entregáveis de todos os projetos carregados vêm numa consulta só
+Projeto.entregaveis = db.relationship("Entregavel", back_populates="projeto", cascade="all, delete-orphan", passive_deletes=True, lazy="selectin", order_by="Entregavel.id")
+
+Entregavel.projeto = db.relationship("Projeto", back_populates="entregaveis")
 
 __all__ = [
-    'PDI', 'Meta', 'Tarefa', 'Projeto',
-    'PDIStatus', 'MetaStatus', 'TarefaTipo', 'Dificuldade', 'Prioridade', 'ProjetoTipo'
+    'PDI', 'Meta', 'Tarefa', 'Projeto', 'ProgressEvent', 'OutboxEvent', 'Tecnologia', 'Entregavel', 'DueReminder',
+    'PDIStatus', 'MetaStatus', 'TarefaTipo', 'Dificuldade', 'Prioridade', 'ProjetoTipo',
+    'EntregavelTipo', 'EntregavelStatus'
 ]
\ No newline at end of file
@@ -0,0 +1,247 @@
+# models/PDI/archive_model.py
+# Partição de arquivo: PDIs arquivados (e concluídos há muito tempo) saem
+# das tabelas quentes com metas, tarefas, projetos e entregáveis e vão para
+# tabelas *_archive com as mesmas colunas (mais archived_at). Índices e
+# contagens das tabelas quentes ficam do tamanho do que está em uso.
+from datetime import datetime, timedelta, timezone
+
+from app import db
+from .enums import PDIStatus, MetaStatus
+from .pdi_model import PDI
+from .meta_model import Meta
+from .tarefa_model import Tarefa
+from .projeto_model import Projeto
+from .entregavel_model import Entregavel
+
+
+def _archive_table(model, name, *indexes):
+    """Mesmas colunas da tabela quente, sem FKs (o arquivo não tem cascata)"""
+    columns = [
+        db.Column(
+            column.name, column.type,
+            primary_key=column.primary_key,
+            autoincrement=False,
+            nullable=column.nullable,
+        )
+        for column in model.__table__.columns
+    ]
+    return db.Table(
+        name,
+        *columns,
+        db.Column("archived_at", db.DateTime, nullable=False),
+        *indexes,
+    )
+
+
+pdi_archive = _archive_table(
+    PDI, "pdi_archive",
+    db.Index("ix_pdi_archive_student_id_created_at", "student_id", "created_at"),
+    db.Index("ix_pdi_archive_mentor_id", "mentor_id"),
+)
+metas_archive = _archive_table(
+    Meta, "pdi_metas_archive", db.Index("ix_pdi_metas_archive_pdi_id", "pdi_id"),
+)
+tarefas_archive = _archive_table(
+    Tarefa, "pdi_tarefas_archive", db.Index("ix_pdi_tarefas_archive_pdi_id", "pdi_id"),
+)
+projetos_archive = _archive_table(
+    Projeto, "pdi_projetos_archive", db.Index("ix_pdi_projetos_archive_pdi_id", "pdi_id"),
+)
+entregaveis_archive = _archive_table(
+    Entregavel, "pdi_entregaveis_archive",
+    db.Index("ix_pdi_entregaveis_archive_projeto_id", "projeto_id"),
+)
+
+COMPLETED = MetaStatus.COMPLETED.value
+
+
+# ----------------------------
+# Arquivamento
+# ----------------------------
+
+def archivable_pdis(completed_days=0):
+    """PDIs ARCHIVED e, com ``completed_days`` > 0, concluídos sem mudança há esse tempo"""
+    condition = PDI.status == PDIStatus.ARCHIVED.value
+    if completed_days > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=completed_days)
+        condition = db.or_(
+            condition,
+            db.and_(PDI.status == PDIStatus.COMPLETED.value, PDI.last_update < cutoff),
+        )
+    return db.select(PDI.id).where(condition).order_by(PDI.id)
+
+
+def _copy(hot, archive, where, now):
+    columns = [column.name for column in hot.columns]
+    db.session.execute(
+        archive.insert().from_select(
+            columns + ["archived_at"],
+            db.select(*hot.columns, db.literal(now, db.DateTime)).where(where),
+        )
+    )
+
+
+def archive_batch(batch_size=500, completed_days=0):
+    """Move um lote de árvores de PDI para o arquivo; devolve quantos PDIs.
+
+    Tudo numa transação: um INSERT ... SELECT por tabela e um DELETE dos
+    PDIs, que leva metas, tarefas, projetos e entregáveis pelo ON DELETE
+    CASCADE. Os PDIs do lote ficam travados (FOR UPDATE SKIP LOCKED): nada
+    é criado embaixo deles entre a cópia e o DELETE, e dois processos
+    arquivando pegam lotes diferentes.
+    """
+    ids = db.session.scalars(
+        archivable_pdis(completed_days).limit(batch_size).with_for_update(skip_locked=True)
+    ).all()
+    if not ids:
+        db.session.rollback()
+        return 0
+
+    now = datetime.now(timezone.utc)
+    projeto_ids = db.select(Projeto.id).where(Projeto.pdi_id.in_(ids))
+    _copy(PDI.__table__, pdi_archive, PDI.id.in_(ids), now)
+    _copy(Meta.__table__, metas_archive, Meta.pdi_id.in_(ids), now)
+    _copy(Tarefa.__table__, tarefas_archive, Tarefa.pdi_id.in_(ids), now)
+    _copy(Projeto.__table__, projetos_archive, Projeto.pdi_id.in_(ids), now)
+    _copy(Entregavel.__table__, entregaveis_archive, Entregavel.projeto_id.in_(projeto_ids), now)
+
+    db.session.execute(
+        db.delete(PDI).where(PDI.id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return len(ids)
+
+
+# ----------------------------
+# Leitura
+# ----------------------------
+
+def pdi_tree_statements(pdi_id, archived=False):
+    """Consultas do PDI, metas, projetos e entregáveis (quentes ou do arquivo).
+
+    Independentes entre si: a view assíncrona roda as quatro ao mesmo tempo.
+    """
+    pdis, metas, projetos, entregaveis = (
+        (pdi_archive, metas_archive, projetos_archive, entregaveis_archive) if archived
+        else (PDI.__table__, Meta.__table__, Projeto.__table__, Entregavel.__table__)
+    )
+    return (
+        db.select(pdis).where(pdis.c.id == pdi_id),
+        db.select(metas).where(metas.c.pdi_id == pdi_id),
+        db.select(projetos).where(projetos.c.pdi_id == pdi_id),
+        db.select(entregaveis)
+        .join(projetos, projetos.c.id == entregaveis.c.projeto_id)
+        .where(projetos.c.pdi_id == pdi_id)
+        .order_by(entregaveis.c.id),
+    )
+
+
+def pdi_completo_from_rows(pdi_row, meta_rows, projeto_rows, entregavel_rows, archived=False):
+    """Dict no formato de ``PDIResponseCompleto`` a partir das linhas (mappings)"""
+    from .schemas import PDIResponseCompleto, MetaResponse, ProjetoResponse
+
+    entregaveis_by_projeto = {}
+    for entregavel in entregavel_rows:
+        entregaveis_by_projeto.setdefault(entregavel["projeto_id"], []).append(dict(entregavel))
+
+    return PDIResponseCompleto(
+        **pdi_row,
+        archived=archived,
+        metas_concluidas=sum(1 for meta in meta_rows if meta["status"] == COMPLETED),
+        metas_totais=len(meta_rows),
+        projetos_concluidos=sum(1 for projeto in projeto_rows if projeto["status"] == COMPLETED),
+        projetos_totais=len(projeto_rows),
+        metas=[MetaResponse.model_validate(dict(meta)).model_dump() for meta in meta_rows],
+        projetos=[
+            ProjetoResponse.model_validate(
+                {**projeto, "entregaveis": entregaveis_by_projeto.get(projeto["id"], [])}
+            ).model_dump()
+            for projeto in projeto_rows
+        ]
+    ).model_dump()
+
+
+def archived_pdi_completo(pdi_id):
+    """PDI completo lido do arquivo, ou None se também não está lá"""
+    pdi_rows, meta_rows, projeto_rows, entregavel_rows = (
+        db.session.execute(statement).mappings().all()
+        for statement in pdi_tree_statements(pdi_id, archived=True)
+    )
+    if not pdi_rows:
+        return None
+    return pdi_completo_from_rows(
+        pdi_rows[0], meta_rows, projeto_rows, entregavel_rows, archived=True
+    )
+
+
+def _counts(metas, projetos, pdi_ids):
+    """``{pdi_id: {"metas": (total, concluídas), "projetos": (...)}}``"""
+    result = {}
+    for key, children in (("metas", metas), ("projetos", projetos)):
+        rows = db.session.execute(
+            db.select(
+                children.c.pdi_id,
+                db.func.count(),
+                db.func.sum(db.case((children.c.status == COMPLETED, 1), else_=0)),
+            )
+            .where(children.c.pdi_id.in_(pdi_ids))
+            .group_by(children.c.pdi_id)
+        ).all()
+        for pdi_id, total, concluidos in rows:
+            result.setdefault(pdi_id, {})[key] = (total, concluidos or 0)
+    return result
+
+
+def pdi_page_with_archive(page, per_page, status=None, student_id=None):
+    """Página de PDIs quentes + arquivados, mais novos primeiro.
+
+    Um UNION ALL das duas tabelas com os mesmos filtros; as contagens de
+    metas/projetos da página vêm em consultas agrupadas por origem.
+    Devolve ``(total, [dict no formato de PDIResponse])``.
+    """
+    hot = PDI.__table__
+    columns = [column.name for column in hot.columns]
+
+    def source(table, archived):
+        query = db.select(
+            *(table.c[name] for name in columns), db.literal(archived).label("archived")
+        )
+        if status:
+            query = query.where(table.c.status == status)
+        if student_id:
+            query = query.where(table.c.student_id == student_id)
+        return query
+
+    union = db.union_all(source(hot, False), source(pdi_archive, True)).subquery()
+    total = db.session.scalar(db.select(db.func.count()).select_from(union))
+    rows = db.session.execute(
+        db.select(union)
+        .order_by(union.c.created_at.desc(), union.c.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    ).mappings().all()
+
+    counts = {}
+    for archived, children in (
+        (False, (Meta.__table__, Projeto.__table__)),
+        (True, (metas_archive, projetos_archive)),
+    ):
+        ids = [row["id"] for row in rows if bool(row["archived"]) == archived]
+        if ids:
+            counts[archived] = _counts(*children, ids)
+
+    pdis = []
+    for row in rows:
+        archived = bool(row["archived"])
+        pdi_counts = counts.get(archived, {}).get(row["id"], {})
+        metas_totais, metas_concluidas = pdi_counts.get("metas", (0, 0))
+        projetos_totais, projetos_concluidos = pdi_counts.get("projetos", (0, 0))
+        pdis.append({
+            **row,
+            "archived": archived,
+            "metas_concluidas": metas_concluidas,
+            "metas_totais": metas_totais,
+            "projetos_concluidos": projetos_concluidos,
+            "projetos_totais": projetos_totais,
+        })
+    return total, pdis
@@ -0,0 +1,160 @@
+# models/PDI/burndown.py
+# Burndown, velocidade e projeção de conclusão calculados com NumPy
+# (importado nas funções: fora delas custaria o cold start de todo processo)
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app import db
+from .enums import MetaStatus
+from .pdi_model import PDI
+from .tarefa_model import Tarefa
+
+def _load(pdi_filter):
+    """Uma consulta: PDIs do filtro com suas tarefas (outer join)"""
+    import numpy as np
+
+    rows = db.session.execute(
+        select(
+            PDI.id,
+            PDI.data_inicio,
+            PDI.created_at,
+            PDI.deadline,
+            Tarefa.pontos,
+            Tarefa.status,
+            Tarefa.data_conclusao,
+        )
+        .outerjoin(Tarefa, Tarefa.pdi_id == PDI.id)
+        .where(pdi_filter)
+        .order_by(PDI.id)
+    ).all()
+
+    if not rows:
+        return None
+
+    ids, data_inicio, created_at, deadline, pontos, status, concluida = zip(*rows)
+    return {
+        "pdi_id": np.array(ids, dtype=np.int64),
+        "start": np.array(
+            [inicio or criado for inicio, criado in zip(data_inicio, created_at)],
+            dtype="datetime64[D]",
+        ),
+        "deadline": np.array(deadline, dtype="datetime64[D]"),
+        "has_task": np.array([s is not None for s in status]),
+        "points": np.array([p or 0 for p in pontos], dtype=np.float64),
+        "done": np.array(
+            [s == MetaStatus.COMPLETED.value for s in status], dtype=bool
+        ),
+        "done_at": np.array(concluida, dtype="datetime64[D]"),
+    }
+
+
+def compute_burndowns(data, today, window=7, include_series=True):
+    """Calcula o burndown de todos os PDIs de ``data`` de uma vez.
+
+    Monta uma matriz (PDIs x dias) com os pontos concluídos por dia e tira
+    dela, com operações vetorizadas, o restante acumulado, a linha ideal até
+    o deadline, a velocidade na janela dos últimos ``window`` dias e a data
+    projetada de conclusão (regressão linear do restante nessa janela).
+    Quando um PDI não tem pontos definidos, cada tarefa vale 1 ponto.
+    """
+    import numpy as np
+
+    day = np.timedelta64(1, "D")
+
+    pdi_ids, row_index = np.unique(data["pdi_id"], return_inverse=True)
+    n_pdis = len(pdi_ids)
+
+    starts = np.full(n_pdis, np.datetime64("NaT"), dtype="datetime64[D]")
+    starts[row_index] = data["start"]
+    deadlines = np.full(n_pdis, np.datetime64("NaT"), dtype="datetime64[D]")
+    deadlines[row_index] = data["deadline"]
+    starts = np.minimum(starts, today)
+
+    has_task = data["has_task"]
+    task_pdi = row_index[has_task]
+    points = data["points"][has_task]
+    declared = np.bincount(task_pdi, weights=points, minlength=n_pdis)
+    weights = np.where(declared[task_pdi] > 0, points, 1.0)
+    totals = np.bincount(task_pdi, weights=weights, minlength=n_pdis)
+
+    origin = starts.min()
+    n_days = int((today - origin) / day) + 1
+
+    done = data["done"][has_task] & ~np.isnat(data["done_at"][has_task])
+    done_day = ((data["done_at"][has_task][done] - origin) / day).astype(np.int64)
+    done_day = np.clip(done_day, 0, n_days - 1)
+
+    completed = np.zeros((n_pdis, n_days))
+    np.add.at(completed, (task_pdi[done], done_day), weights[done])
+    remaining = totals[:, None] - np.cumsum(completed, axis=1)
+
+    # Velocidade: pontos concluídos na janela / tamanho da janela
+    window = max(1, min(window, n_days))
+    cumulative = np.cumsum(completed, axis=1)
+    before_window = cumulative[:, -window - 1] if n_days > window else np.zeros(n_pdis)
+    velocity = (cumulative[:, -1] - before_window) / window
+
+    # Projeção: inclinação (mínimos quadrados) do restante na janela
+    t = np.arange(window, dtype=np.float64)
+    t_centered = t - t.mean()
+    recent = remaining[:, -window:]
+    slope = (
+        (recent - recent.mean(axis=1, keepdims=True)) * t_centered
+    ).sum(axis=1) / max((t_centered ** 2).sum(), 1.0)
+    remaining_now = remaining[:, -1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = np.where(slope < 0, np.ceil(remaining_now / -slope), np.nan)
+    days_left = np.where(remaining_now <= 0, 0, days_left)
+
+    start_offset = ((starts - origin) / day).astype(np.int64)
+    day_numbers = np.arange(n_days)
+    span = np.maximum(((deadlines - starts) / day).astype(np.float64), 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        elapsed = (day_numbers[None, :] - start_offset[:, None]) / span[:, None]
+    ideal = totals[:, None] * np.clip(1 - elapsed, 0, 1)
+
+    origin_dt = origin.astype(datetime)
+    results = []
+    for i, pdi_id in enumerate(pdi_ids.tolist()):
+        deadline = None if np.isnat(deadlines[i]) else deadlines[i].astype(datetime)
+        projected = (
+            None if np.isnan(days_left[i])
+            else today.astype(datetime) + timedelta(days=int(days_left[i]))
+        )
+        result = {
+            "pdi_id": pdi_id,
+            "total_points": float(totals[i]),
+            "remaining_points": float(remaining_now[i]),
+            "velocity": float(velocity[i]),
+            "deadline": deadline,
+            "projected_completion": projected,
+            "on_track": (
+                None if deadline is None or projected is None
+                else bool(projected <= deadline)
+            ),
+        }
+        if include_series:
+            first = start_offset[i]
+            result["series"] = {
+                "dates": [origin_dt + timedelta(days=int(d)) for d in range(first, n_days)],
+                "remaining": remaining[i, first:].tolist(),
+                "ideal": ideal[i, first:].tolist() if deadline is not None else [],
+            }
+        results.append(result)
+
+    return results
+
+
+def burndown_for(pdi_id=None, mentor_id=None, window=7, include_series=True):
+    """Burndown de um PDI ou de todos os PDIs de um mentor"""
+    import numpy as np
+
+    pdi_filter = PDI.id == pdi_id if pdi_id is not None else PDI.mentor_id == mentor_id
+    data = _load(pdi_filter)
+    if data is None:
+        return []
+
+    today = np.datetime64(datetime.now(timezone.utc).date(), "D")
+    return compute_burndowns(data, today, window=window, include_series=include_series)
@@ -0,0 +1,138 @@
+# models/PDI/cohort_analytics.py
+# Distribuição de progresso por grupo (categoria, nível, prioridade, turma)
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app import db
+from models.StudentModel import Student
+from utils.cache import TTLCache
+from .enums import PDIStatus
+from .pdi_model import PDI
+
+GROUP_COLUMNS = {
+    "category": PDI.category,
+    "nivel": PDI.nivel,
+    "priority": PDI.priority,
+    "course": Student.course,
+    "enrollment_year": Student.enrollment_year,
+}
+
+PROGRESS_BINS = 101  # progresso é inteiro de 0 a 100
+
+_cache = TTLCache(maxsize=256, ttl=24 * 3600)
+
+
+def _percentiles(histograms, quantiles):
+    """Percentis (nearest-rank) de cada linha de um histograma de progresso"""
+    import numpy as np
+
+    totals = histograms.sum(axis=1)
+    cdf = np.cumsum(histograms, axis=1)
+    result = []
+    for q in quantiles:
+        rank = np.maximum(np.ceil(q * totals), 1)
+        result.append((cdf >= rank[:, None]).argmax(axis=1))
+    return result
+
+
+def cohort_stats(group_by, chunk_size=5000, filters=()):
+    """Mediana e p90 de progresso, taxa de conclusão e tempo médio de
+    conclusão por grupo.
+
+    As linhas vêm do banco em blocos de ``chunk_size`` (``yield_per``) e cada
+    bloco vira arrays NumPy que são somados em um histograma de progresso
+    por grupo (101 posições). A memória depende do número de grupos, não do
+    número de PDIs, e os percentis saem exatos do histograma.
+    """
+    # NumPy só aqui: importado no topo custaria o cold start de todo processo
+    import numpy as np
+
+    group_column = GROUP_COLUMNS[group_by]
+    stmt = (
+        select(
+            group_column,
+            PDI.progress,
+            PDI.status,
+            PDI.data_inicio,
+            PDI.created_at,
+            PDI.last_update,
+        )
+        .join(Student, Student.id == PDI.student_id)
+        .where(*filters)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    groups = {}
+    histograms = np.zeros((0, PROGRESS_BINS), dtype=np.int64)
+    completed = np.zeros(0, dtype=np.int64)
+    days_to_complete = np.zeros(0, dtype=np.float64)
+
+    for chunk in db.session.execute(stmt).partitions():
+        keys, progress, status, inicio, criado, atualizado = zip(*chunk)
+
+        index = np.fromiter(
+            (groups.setdefault(key, len(groups)) for key in keys),
+            dtype=np.int64,
+            count=len(keys),
+        )
+        if len(groups) > len(completed):
+            grow = len(groups) - len(completed)
+            histograms = np.vstack([histograms, np.zeros((grow, PROGRESS_BINS), dtype=np.int64)])
+            completed = np.concatenate([completed, np.zeros(grow, dtype=np.int64)])
+            days_to_complete = np.concatenate([days_to_complete, np.zeros(grow)])
+
+        progress = np.clip(np.array([p or 0 for p in progress], dtype=np.int64), 0, 100)
+        np.add.at(histograms, (index, progress), 1)
+
+        done = np.array(status, dtype=object) == PDIStatus.COMPLETED.value
+        start = np.array(
+            [i or c for i, c in zip(inicio, criado)], dtype="datetime64[s]"
+        )
+        end = np.array(atualizado, dtype="datetime64[s]")
+        days = (end - start) / np.timedelta64(1, "D")
+        done &= ~np.isnan(days)
+
+        completed += np.bincount(index[done], minlength=len(completed))
+        days_to_complete += np.bincount(
+            index[done], weights=days[done], minlength=len(completed)
+        )
+
+    if not groups:
+        return []
+
+    counts = histograms.sum(axis=1)
+    median, p90 = _percentiles(histograms, (0.5, 0.9))
+
+    results = []
+    for key, i in groups.items():
+        results.append({
+            "group": None if key is None else str(key),
+            "count": int(counts[i]),
+            "median_progress": int(median[i]),
+            "p90_progress": int(p90[i]),
+            "completion_rate": float(completed[i] / counts[i]),
+            "avg_days_to_complete": (
+                float(days_to_complete[i] / completed[i]) if completed[i] else None
+            ),
+        })
+    results.sort(key=lambda item: item["count"], reverse=True)
+    return results
+
+
+def cached_cohort_stats(group_by, course=None, enrollment_year=None):
+    """``cohort_stats`` com cache por dia (a chave inclui a data de hoje)"""
+    today = datetime.now(timezone.utc).date()
+    key = (group_by, course, enrollment_year, today)
+
+    stats = _cache.get(key)
+    if stats is None:
+        filters = []
+        if course is not None:
+            filters.append(Student.course == course)
+        if enrollment_year is not None:
+            filters.append(Student.enrollment_year == enrollment_year)
+        stats = cohort_stats(group_by, filters=filters)
+        _cache.set(key, stats)
+
+    return today, stats
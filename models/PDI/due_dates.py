@@ -0,0 +1,132 @@
+# models/PDI/due_dates.py
+# Consultas de prazos (vencidos / próximos) usando os índices de data
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import literal, select, union_all
+
+from app import db
+from .enums import MetaStatus, PDIStatus
+from .meta_model import Meta
+from .pdi_model import PDI
+from .tarefa_model import Tarefa
+
+TAREFA_CLOSED = (MetaStatus.COMPLETED.value, MetaStatus.CANCELLED.value)
+META_CLOSED = (MetaStatus.COMPLETED.value, MetaStatus.CANCELLED.value)
+PDI_CLOSED = (PDIStatus.COMPLETED.value, PDIStatus.ARCHIVED.value)
+
+
+def _due_selects(owner_filter, until, since=None):
+    """Um SELECT por tipo (tarefa, meta, pdi) com colunas iguais para o UNION"""
+    tarefas = (
+        select(
+            literal("tarefa").label("kind"),
+            Tarefa.id.label("id"),
+            Tarefa.pdi_id.label("pdi_id"),
+            Tarefa.title.label("title"),
+            Tarefa.data_prevista.label("due"),
+        )
+        .join(PDI, PDI.id == Tarefa.pdi_id)
+        .where(
+            Tarefa.data_prevista.is_not(None),
+            Tarefa.data_prevista < until,
+            Tarefa.status.not_in(TAREFA_CLOSED),
+        )
+    )
+    metas = (
+        select(
+            literal("meta").label("kind"),
+            Meta.id.label("id"),
+            Meta.pdi_id.label("pdi_id"),
+            Meta.title.label("title"),
+            Meta.data_fim_previsto.label("due"),
+        )
+        .join(PDI, PDI.id == Meta.pdi_id)
+        .where(
+            Meta.data_fim_previsto.is_not(None),
+            Meta.data_fim_previsto < until,
+            Meta.status.not_in(META_CLOSED),
+        )
+    )
+    pdis = select(
+        literal("pdi").label("kind"),
+        PDI.id.label("id"),
+        PDI.id.label("pdi_id"),
+        PDI.title.label("title"),
+        PDI.deadline.label("due"),
+    ).where(
+        PDI.deadline.is_not(None),
+        PDI.deadline < until,
+        PDI.status.not_in(PDI_CLOSED),
+    )
+
+    if since is not None:
+        tarefas = tarefas.where(Tarefa.data_prevista >= since)
+        metas = metas.where(Meta.data_fim_previsto >= since)
+        pdis = pdis.where(PDI.deadline >= since)
+
+    if owner_filter is not None:
+        tarefas = tarefas.where(owner_filter)
+        metas = metas.where(owner_filter)
+        pdis = pdis.where(owner_filter)
+
+    return union_all(tarefas, metas, pdis)
+
+
+def due_items(student_id=None, mentor_id=None, window_days=7, now=None):
+    """Itens em aberto vencidos e com prazo nos próximos ``window_days`` dias.
+
+    Filtra por estudante ou por mentor (dono do PDI). Devolve
+    ``{"overdue": [...], "upcoming": [...]}``, cada lista ordenada por prazo.
+    """
+    now = now or datetime.now(timezone.utc)
+    until = now + timedelta(days=window_days)
+
+    owner_filter = None
+    if student_id is not None:
+        owner_filter = PDI.student_id == student_id
+    elif mentor_id is not None:
+        owner_filter = PDI.mentor_id == mentor_id
+
+    query = _due_selects(owner_filter, until).subquery()
+    rows = db.session.execute(select(query).order_by(query.c.due)).all()
+
+    naive_now = now.replace(tzinfo=None)
+    overdue, upcoming = [], []
+    for row in rows:
+        item = row._asdict()
+        due = item["due"].replace(tzinfo=None)
+        (overdue if due < naive_now else upcoming).append(item)
+
+    return {"overdue": overdue, "upcoming": upcoming}
+
+
+def pending_due_between(since, until):
+    """Todos os itens em aberto com prazo em [since, until), para o scheduler"""
+    query = _due_selects(None, until, since=since).subquery()
+    return db.session.execute(select(query).order_by(query.c.due)).all()
+
+
+_DUE_BY_KIND = {
+    "tarefa": (Tarefa, Tarefa.data_prevista, TAREFA_CLOSED),
+    "meta": (Meta, Meta.data_fim_previsto, META_CLOSED),
+    "pdi": (PDI, PDI.deadline, PDI_CLOSED),
+}
+
+
+def is_stale(kind, item_id, due):
+    """O lembrete perdeu o sentido? (conferido antes de lembrar)
+
+    Item fechado ou com outro prazo no banco: a escrita pode ter acontecido
+    em outro worker, cujo ``notify`` não chega a este heap. Item não
+    encontrado conta como válido: o lembrete pode disparar antes do commit
+    de quem acabou de criá-lo.
+    """
+    from utils.due_scheduler import _timestamp
+
+    model, due_column, closed = _DUE_BY_KIND[kind]
+    row = db.session.execute(
+        select(model.status, due_column.label("due")).where(model.id == item_id)
+    ).first()
+    if row is None:
+        return False
+    return row.status in closed or _timestamp(row.due) != due
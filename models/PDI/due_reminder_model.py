@@ -0,0 +1,77 @@
+# models/PDI/due_reminder_model.py
+from datetime import datetime, timezone
+from app import db
+from utils.database import upsert
+from .outbox_model import add_outbox_event
+from .pdi_model import PDI
+
+
+class DueReminder(db.Model):
+    """Lembretes de prazo já enviados, um por (item, tipo de lembrete, prazo).
+
+    Cada worker roda o próprio scheduler com o mesmo heap; antes de enviar,
+    o lembrete é reivindicado aqui (INSERT ... ON CONFLICT DO NOTHING) e só
+    quem inseriu a linha envia. Prazo novo é outra chave e lembra de novo.
+    As linhas também são a caixa de lembretes que os clientes leem
+    (``recent_reminders``).
+    """
+    __tablename__ = "pdi_due_reminders"
+    __table_args__ = (
+        db.Index("ix_pdi_due_reminders_pdi_id_sent_at", "pdi_id", "sent_at"),
+    )
+
+    kind = db.Column(db.String(8), primary_key=True)  # "tarefa" | "meta" | "pdi"
+    # Sem FK: o registro sobrevive à remoção/arquivamento do item
+    item_id = db.Column(db.Integer, primary_key=True)
+    reminder = db.Column(db.String(8), primary_key=True)  # "upcoming" | "overdue"
+    due = db.Column(db.DateTime, primary_key=True)
+    pdi_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.UnicodeText, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<DueReminder {self.kind} {self.item_id} {self.reminder} {self.due}>"
+
+
+def claim_reminder(kind, item_id, reminder, due, pdi_id, title):
+    """True só para o primeiro processo que reivindica este lembrete.
+
+    Quem reivindica grava, na mesma transação, o evento
+    ``<kind>.due_<reminder>`` no outbox (ex. ``tarefa.due_upcoming``): o
+    lembrete chega aos webhooks exatamente uma vez.
+    """
+    result = upsert(
+        DueReminder.__table__,
+        [{"kind": kind, "item_id": item_id, "reminder": reminder, "due": due,
+          "pdi_id": pdi_id, "title": title, "sent_at": datetime.now(timezone.utc)}],
+        index_elements=["kind", "item_id", "reminder", "due"],
+    )
+    claimed = result.rowcount == 1
+    if claimed:
+        add_outbox_event(f"{kind}.due_{reminder}", kind, item_id, {
+            f"{kind}_id": item_id,
+            "pdi_id": pdi_id,
+            "title": title,
+            "due": due.isoformat(),
+        })
+    db.session.commit()
+    return claimed
+
+
+def recent_reminders(student_id=None, mentor_id=None, since=None, limit=50):
+    """Lembretes enviados dos PDIs de um estudante ou mentor, mais recentes primeiro"""
+    query = db.select(DueReminder).join(PDI, PDI.id == DueReminder.pdi_id)
+    if student_id is not None:
+        query = query.where(PDI.student_id == student_id)
+    elif mentor_id is not None:
+        query = query.where(PDI.mentor_id == mentor_id)
+    if since is not None:
+        query = query.where(DueReminder.sent_at >= since)
+    query = query.order_by(DueReminder.sent_at.desc()).limit(limit)
+    return db.session.scalars(query).all()
+
+
+def prune_reminders(before):
+    """Apaga os registros de prazos anteriores a ``before``"""
+    db.session.execute(db.delete(DueReminder).where(DueReminder.due < before))
+    db.session.commit()
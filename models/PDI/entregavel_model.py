@@ -0,0 +1,86 @@
+# models/PDI/entregavel_model.py
+from collections import defaultdict
+from datetime import datetime, timezone
+from app import db
+from utils.database import upsert
+from .enums import EntregavelTipo, EntregavelStatus
+
+
+class Entregavel(db.Model):
+    """Entregável de um projeto: um arquivo ou link, com status de revisão"""
+    __tablename__ = "pdi_entregaveis"
+    __table_args__ = (
+        # Chave do upsert em lote: o título identifica o entregável no projeto
+        db.UniqueConstraint("projeto_id", "title", name="uq_pdi_entregaveis_projeto_id_title"),
+        # Ids não reaproveitados depois do arquivamento (ver PDI)
+        {"sqlite_autoincrement": True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    projeto_id = db.Column(
+        db.Integer,
+        db.ForeignKey("pdi_projetos.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    title = db.Column(db.Unicode(255), nullable=False)
+    description = db.Column(db.UnicodeText)
+
+    tipo = db.Column(db.String(16), nullable=False, default=EntregavelTipo.LINK.value)
+    status = db.Column(db.String(16), nullable=False, default=EntregavelStatus.PENDING.value)
+
+    # Link ou metadados do arquivo (o arquivo fica num storage externo)
+    url = db.Column(db.String(1024))
+    file_name = db.Column(db.Unicode(255))
+    mime_type = db.Column(db.String(128))
+    size_bytes = db.Column(db.BigInteger)
+
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # NOTA: Os relacionamentos serão configurados no __init__.py
+
+    def __repr__(self):
+        return f"<Entregavel {self.id} - {self.title}>"
+
+
+UPSERT_COLUMNS = (
+    "description", "tipo", "status", "url", "file_name", "mime_type", "size_bytes",
+)
+
+
+def upsert_entregaveis(projeto_id, entregaveis):
+    """Cria ou atualiza (pelo título) os entregáveis do projeto.
+
+    Cada entregável traz só os campos enviados (``exclude_unset``): em
+    título existente só esses são sobrescritos, os demais (p.ex. o status
+    de um aprovado que só trocou a url) ficam como estão; em título novo os
+    ausentes ficam com o default da coluna. Um INSERT ... ON CONFLICT por
+    conjunto de campos (normalmente um só). Títulos repetidos na mesma
+    lista valem pelo último. Recalcula o progresso do projeto e faz o
+    commit.
+    """
+    from .projeto_model import Projeto
+
+    now = datetime.now(timezone.utc)
+    rows = {
+        entregavel["title"]: {
+            **entregavel, "projeto_id": projeto_id, "created_at": now, "updated_at": now
+        }
+        for entregavel in entregaveis
+    }
+
+    groups = defaultdict(list)
+    for row in rows.values():
+        groups[frozenset(row)].append(row)
+
+    for columns, group in groups.items():
+        upsert(
+            Entregavel.__table__,
+            group,
+            index_elements=["projeto_id", "title"],
+            replace=[column for column in UPSERT_COLUMNS if column in columns] + ["updated_at"],
+        )
+    Projeto.recalculate_progress(projeto_id)
+    return len(rows)
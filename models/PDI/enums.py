@@ -41,4 +41,16 @@ class ProjetoTipo(str, Enum):
     BIBLIOTECA = "biblioteca"
     EVENTO = "evento"
     DOCUMENTACAO = "documentacao"
-    PESQUISA = "pesquisa"
\ No newline at end of file
+    PESQUISA = "pesquisa"
+
+
+class EntregavelTipo(str, Enum):
+    ARQUIVO = "arquivo"
+    LINK = "link"
+
+
+class EntregavelStatus(str, Enum):
+    PENDING = "pending"
+    SUBMITTED = "submitted"
+    APPROVED = "approved"
+    REJECTED = "rejected"
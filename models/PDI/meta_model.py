@@ -5,6 +5,11 @@ from .enums import MetaStatus
 
 class Meta(db.Model):
     __tablename__ = "pdi_metas"
+    __table_args__ = (
+        db.Index("ix_pdi_metas_pdi_id_data_fim_previsto", "pdi_id", "data_fim_previsto"),
+        # Ids não reaproveitados depois do arquivamento (ver PDI)
+        {"sqlite_autoincrement": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -33,7 +38,7 @@ class Meta(db.Model):
     
     # Datas
     data_inicio = db.Column(db.DateTime, nullable=True)
-    data_fim_previsto = db.Column(db.DateTime, nullable=True)
+    data_fim_previsto = db.Column(db.DateTime, nullable=True, index=True)
     data_fim = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     
@@ -43,31 +48,93 @@ class Meta(db.Model):
     # NOTA: Os relacionamentos serão configurados no __init__.py
 
     def update_progress(self):
-        """Atualiza progresso baseado nas tarefas"""
+        """Recalcula o progresso a partir das tarefas num único UPDATE.
+
+        O cálculo roda no banco, dentro do próprio UPDATE, sobre as tarefas
+        já gravadas: duas conclusões simultâneas na mesma meta não se
+        sobrescrevem com contagens velhas, e não é preciso travar nada. O
+        UPDATE só acontece (e só propaga para o PDI) se algo mudou.
+        """
         from .tarefa_model import Tarefa
-        
-        tarefas = Tarefa.query.filter_by(meta_id=self.id).all()
-        if not tarefas:
-            self.progress = 0
-            db.session.commit()
-            return
-        
-        concluidas = len([t for t in tarefas if t.status == "completed"])
-        total = len(tarefas)
-        self.progress = (concluidas * 100) // total if total > 0 else 0
-        
-        if self.progress == 100:
-            self.status = MetaStatus.COMPLETED.value
-            self.data_fim = datetime.now(timezone.utc)
-        elif self.progress > 0:
-            self.status = MetaStatus.IN_PROGRESS.value
-        
+        from .pdi_model import PDI
+
+        stats = (
+            db.select(
+                db.case(
+                    (db.func.count(Tarefa.id) == 0, 0),
+                    else_=db.func.sum(
+                        db.case((Tarefa.status == MetaStatus.COMPLETED.value, 100), else_=0)
+                    ) // db.func.count(Tarefa.id),
+                ).label("progress")
+            )
+            .where(Tarefa.meta_id == self.id)
+            .subquery()
+        )
+        progress = stats.c.progress
+        status = db.case(
+            (progress == 100, MetaStatus.COMPLETED.value),
+            (progress > 0, MetaStatus.IN_PROGRESS.value),
+            else_=Meta.status,
+        )
+
+        changed = db.session.execute(
+            db.update(Meta)
+            .where(
+                Meta.id == self.id,
+                db.or_(Meta.progress.is_distinct_from(progress), Meta.status.is_distinct_from(status)),
+            )
+            .values(
+                progress=progress,
+                status=status,
+                data_fim=db.case((progress == 100, datetime.now(timezone.utc)), else_=Meta.data_fim),
+            )
+            .returning(Meta.progress, Meta.status, Meta.data_fim, Meta.title, Meta.data_fim_previsto)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if changed is not None and changed.status == MetaStatus.COMPLETED.value:
+            # Mesma transação do UPDATE: o evento só existe se a mudança existir
+            from .outbox_model import add_outbox_event
+            add_outbox_event("meta.completed", "meta", self.id, {
+                "meta_id": self.id,
+                "pdi_id": self.pdi_id,
+                "progress": changed.progress,
+                "completed_at": changed.data_fim.isoformat() if changed.data_fim else None,
+            })
         db.session.commit()
+
+        if changed is None:
+            return
+        # UPDATE em Core não dispara os eventos do mapper: avisa o scheduler
+        from app import due_scheduler
+        from .due_dates import META_CLOSED
+        due_scheduler.notify(
+            "meta", self.id, self.pdi_id, changed.title, changed.data_fim_previsto,
+            closed=changed.status in META_CLOSED,
+        )
+        self._record_progress(changed.progress, changed.status)
         # Propaga para o PDI
+        PDI.recalculate_progress(self.pdi_id)
+
+    def _record_progress(self, progress, status):
+        """Registra no histórico e publica no stream o que o UPDATE gravou"""
+        from app import progress_history, progress_stream
         from .pdi_model import PDI
-        pdi = PDI.query.get(self.pdi_id)
-        if pdi:
-            pdi.update_progress()
+        owners = db.session.execute(
+            db.select(PDI.student_id, PDI.mentor_id).where(PDI.id == self.pdi_id)
+        ).first()
+        if owners is None:
+            # PDI apagado por outra requisição: sem dono não há o que registrar
+            # (student_id é NOT NULL e derrubaria o lote inteiro no flush)
+            return
+        student_id, mentor_id = owners
+        progress_history.record(
+            "meta", self.id, self.pdi_id, student_id, progress, status
+        )
+        progress_stream.publish(
+            {"type": "meta", "pdi_id": self.pdi_id, "meta_id": self.id,
+             "progress": progress, "status": status},
+            student_id=student_id, mentor_id=mentor_id,
+        )
 
     def __repr__(self):
         return f"<Meta {self.id} - {self.title}>"
\ No newline at end of file
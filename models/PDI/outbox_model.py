@@ -0,0 +1,63 @@
+# models/PDI/outbox_model.py
+from datetime import datetime, timezone
+from app import db
+
+OUTBOX_PENDING = "pending"
+OUTBOX_DELIVERED = "delivered"
+OUTBOX_FAILED = "failed"
+
+
+class OutboxEvent(db.Model):
+    """Eventos para sistemas externos, gravados na mesma transação da mudança.
+
+    Se a transação desfaz, o evento some junto; se confirma, o worker de
+    webhooks (``utils/webhooks.py``) entrega depois, com retentativas.
+    """
+    __tablename__ = "pdi_outbox"
+    __table_args__ = (
+        # O worker busca só pendentes vencidos, em ordem
+        db.Index("ix_pdi_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    event_type = db.Column(db.String(32), nullable=False)
+    # "pdi.completed" | "meta.completed" | "<kind>.due_upcoming" | "<kind>.due_overdue"
+    entity_type = db.Column(db.String(8), nullable=False)
+    # Sem FK: o evento sobrevive à remoção do PDI/meta
+    entity_id = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    status = db.Column(db.String(16), nullable=False, default=OUTBOX_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    delivered_at = db.Column(db.DateTime)
+    last_error = db.Column(db.UnicodeText)
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.event_type} {self.entity_type} {self.entity_id}>"
+
+
+def add_outbox_event(event_type, entity_type, entity_id, payload):
+    """Acrescenta o evento na transação corrente (quem chamou faz o commit).
+
+    Sem ``WEBHOOK_URL`` configurada não há para quem entregar e nada é
+    gravado.
+    """
+    from flask import current_app
+    if not current_app.config.get("WEBHOOK_URL"):
+        return
+    now = datetime.now(timezone.utc)
+    db.session.execute(
+        db.insert(OutboxEvent).values(
+            event_type=event_type,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            payload=payload,
+            created_at=now,
+            status=OUTBOX_PENDING,
+            attempts=0,
+            next_attempt_at=now,
+        )
+    )
@@ -5,6 +5,13 @@ from .enums import PDIStatus, Prioridade
 
 class PDI(db.Model):
     __tablename__ = "pdi"
+    __table_args__ = (
+        db.Index("ix_pdi_student_id_deadline", "student_id", "deadline"),
+        db.Index("ix_pdi_mentor_id_deadline", "mentor_id", "deadline"),
+        # Ids nunca reaproveitados (no SQLite o padrão reusa o maior id
+        # apagado): o PDI movido para pdi_archive continua dono do seu id
+        {"sqlite_autoincrement": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -30,7 +37,7 @@ class PDI(db.Model):
 
     # Datas
     data_inicio = db.Column(db.DateTime, nullable=True)
-    deadline = db.Column(db.DateTime, nullable=True)
+    deadline = db.Column(db.DateTime, nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     last_update = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), 
                            onupdate=lambda: datetime.now(timezone.utc))
@@ -65,43 +72,96 @@ class PDI(db.Model):
     
     @property
     def projetos_concluidos(self):
+        # COUNT no banco: carregar os projetos traria junto os entregáveis
         if hasattr(self, 'projetos'):
-            projetos = self.projetos.all() if hasattr(self.projetos, 'all') else self.projetos
-            return len([p for p in projetos if p.status == "completed"])
+            return self.projetos.filter_by(status="completed").count()
         return 0
     
     @property
     def projetos_totais(self):
         if hasattr(self, 'projetos'):
-            projetos = self.projetos.all() if hasattr(self.projetos, 'all') else self.projetos
-            return len(projetos)
+            return self.projetos.count()
         return 0
 
     def update_progress(self):
         """Atualiza progresso automaticamente baseado nas metas"""
+        PDI.recalculate_progress(self.id)
+
+    @staticmethod
+    def recalculate_progress(pdi_id):
+        """Recalcula o progresso do PDI a partir das metas num único UPDATE.
+
+        Média das metas ponderada por ``peso`` (simples se nenhuma tem peso),
+        calculada pelo banco sobre o que já está gravado, como em
+        ``Meta.update_progress``. ``last_update`` só muda quando o progresso
+        ou o status mudam.
+        """
         from .meta_model import Meta
-        
-        metas = Meta.query.filter_by(pdi_id=self.id).all()
-        if not metas:
-            self.progress = 0
-            db.session.commit()
-            return
-        
-        total_peso = sum(meta.peso for meta in metas if meta.peso)
-        if total_peso == 0:
-            progressos = [meta.progress for meta in metas]
-            self.progress = sum(progressos) // len(progressos) if progressos else 0
-        else:
-            weighted_sum = sum(meta.progress * meta.peso for meta in metas if meta.peso)
-            self.progress = weighted_sum // total_peso
-        
-        if self.progress == 100:
-            self.status = PDIStatus.COMPLETED.value
-        elif self.progress > 0:
-            self.status = PDIStatus.IN_PROGRESS.value
-        
-        self.last_update = datetime.now(timezone.utc)
+
+        peso = db.func.coalesce(Meta.peso, 0)
+        meta_progress = db.func.coalesce(Meta.progress, 0)
+        total = db.func.count(Meta.id)
+        total_peso = db.func.coalesce(db.func.sum(peso), 0)
+        stats = (
+            db.select(
+                db.case(
+                    (total == 0, 0),
+                    (total_peso == 0, db.func.sum(meta_progress) // total),
+                    else_=db.func.sum(meta_progress * peso) // total_peso,
+                ).label("progress")
+            )
+            .where(Meta.pdi_id == pdi_id)
+            .subquery()
+        )
+        progress = stats.c.progress
+        status = db.case(
+            (progress == 100, PDIStatus.COMPLETED.value),
+            (progress > 0, PDIStatus.IN_PROGRESS.value),
+            else_=PDI.status,
+        )
+
+        changed = db.session.execute(
+            db.update(PDI)
+            .where(
+                PDI.id == pdi_id,
+                db.or_(PDI.progress.is_distinct_from(progress), PDI.status.is_distinct_from(status)),
+            )
+            .values(progress=progress, status=status, last_update=datetime.now(timezone.utc))
+            .returning(
+                PDI.student_id, PDI.mentor_id, PDI.progress, PDI.status, PDI.last_update,
+                PDI.title, PDI.deadline,
+            )
+            .execution_options(synchronize_session=False)
+        ).first()
+        if changed is not None and changed.status == PDIStatus.COMPLETED.value:
+            # Mesma transação do UPDATE: o evento só existe se a mudança existir
+            from .outbox_model import add_outbox_event
+            add_outbox_event("pdi.completed", "pdi", pdi_id, {
+                "pdi_id": pdi_id,
+                "student_id": changed.student_id,
+                "mentor_id": changed.mentor_id,
+                "progress": changed.progress,
+                "completed_at": changed.last_update.isoformat(),
+            })
         db.session.commit()
 
+        if changed is None:
+            return
+        from app import due_scheduler, progress_history, progress_stream
+        from .due_dates import PDI_CLOSED
+        # UPDATE em Core não dispara os eventos do mapper: avisa o scheduler
+        due_scheduler.notify(
+            "pdi", pdi_id, pdi_id, changed.title, changed.deadline,
+            closed=changed.status in PDI_CLOSED,
+        )
+        progress_history.record(
+            "pdi", pdi_id, pdi_id, changed.student_id, changed.progress, changed.status
+        )
+        progress_stream.publish(
+            {"type": "pdi", "pdi_id": pdi_id, "meta_id": None,
+             "progress": changed.progress, "status": changed.status},
+            student_id=changed.student_id, mentor_id=changed.mentor_id,
+        )
+
     def __repr__(self):
         return f"<PDI {self.id} - {self.title}>"
\ No newline at end of file
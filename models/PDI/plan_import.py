@@ -0,0 +1,288 @@
+# models/PDI/plan_import.py
+# Importação de planos (PDI, metas, tarefas, projetos) a partir de planilhas
+#
+# Formato: uma linha por registro, com a coluna "registro" dizendo o que ela
+# é (pdi, meta, tarefa ou projeto) e as demais colunas com os campos dos
+# schemas de criação. A ordem das linhas define a hierarquia: metas e
+# projetos pertencem ao último "pdi", tarefas à última "meta".
+#
+#   registro,title,student_id,deadline,peso,pontos,tipo,tecnologias
+#   pdi,Backend Python,12,2025-12-01,,,,
+#   meta,Dominar Flask,,,2,,,
+#   tarefa,Tutorial oficial,,,,3,leitura,
+#   projeto,API de notas,,,,,aplicacao,flask;sqlalchemy
+import csv
+import io
+import re
+from datetime import datetime, timezone
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from .pdi_model import PDI
+from .meta_model import Meta
+from .tarefa_model import Tarefa
+from .projeto_model import Projeto
+from .tecnologia_model import index_tecnologias
+from .schemas import PDICreate, MetaCreate, TarefaCreate, ProjetoCreate
+
+RECORD_COLUMN = "registro"
+PLAN_BATCH = 200  # planos gravados por lote (4 INSERTs por lote)
+
+# Os schemas exigem os ids dos pais, que só existem depois do INSERT;
+# a validação usa este valor e o id real entra na gravação
+PENDING_ID = 0
+
+DATE_ONLY = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def read_rows(stream, filename):
+    """Gera ``(linha, dict)`` da planilha sem carregá-la inteira.
+
+    CSV é lido direto do stream; XLSX usa o modo read_only do openpyxl, que
+    percorre o XML da planilha linha a linha. Células vazias são omitidas.
+    """
+    if filename.lower().endswith(".xlsx"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise RuntimeError("Importar .xlsx requer o pacote 'openpyxl'") from e
+
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell).strip().lower() if cell is not None else "" for cell in next(rows, ())]
+            for line, values in enumerate(rows, start=2):
+                yield line, {
+                    column: value.strip() if isinstance(value, str) else value
+                    for column, value in zip(header, values)
+                    if column and value not in (None, "")
+                }
+        finally:
+            workbook.close()
+        return
+
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        yield reader.line_num, {
+            column.strip().lower(): value.strip()
+            for column, value in row.items()
+            if column and isinstance(value, str) and value.strip()
+        }
+
+
+def _validate(schema, line, data, errors, **ids):
+    for column, value in data.items():
+        # planilhas costumam trazer só a data; os schemas esperam datetime
+        if isinstance(value, str) and DATE_ONLY.fullmatch(value):
+            data[column] = f"{value}T00:00:00"
+    if isinstance(data.get("tecnologias"), str):
+        data["tecnologias"] = [
+            tech.strip() for tech in data["tecnologias"].replace(",", ";").split(";") if tech.strip()
+        ]
+    try:
+        return schema.model_validate({**data, **ids})
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = ".".join(str(part) for part in error["loc"])
+        errors.append({"row": line, "error": f"{field}: {error['msg']}" if field else error["msg"]})
+        return None
+
+
+def parse_plans(rows, errors):
+    """Agrupa as linhas em planos, um de cada vez.
+
+    Cada plano é um dict com o PDI validado, as metas (cada uma com suas
+    tarefas) e os projetos. Um plano com qualquer linha inválida sai com
+    ``valid=False`` e não é gravado; os erros vão para ``errors``.
+    """
+    plan = None
+
+    for line, row in rows:
+        kind = str(row.pop(RECORD_COLUMN, "")).strip().lower()
+
+        if kind == "pdi":
+            if plan is not None:
+                yield plan
+            plan = {"line": line, "valid": True, "metas": [], "projetos": []}
+            plan["pdi"] = _validate(PDICreate, line, row, errors)
+            plan["valid"] = plan["pdi"] is not None
+            continue
+
+        if kind not in ("meta", "tarefa", "projeto"):
+            errors.append({"row": line, "error": f"{RECORD_COLUMN} inválido: '{kind}'"})
+            if plan is not None:
+                plan["valid"] = False
+            continue
+
+        if plan is None:
+            errors.append({"row": line, "error": f"{kind} antes de qualquer linha 'pdi'"})
+            continue
+
+        if kind == "meta":
+            meta = _validate(MetaCreate, line, row, errors, pdi_id=PENDING_ID)
+            plan["metas"].append((meta, []))
+            plan["valid"] &= meta is not None
+        elif kind == "tarefa":
+            if not plan["metas"]:
+                errors.append({"row": line, "error": "tarefa antes de qualquer linha 'meta'"})
+                plan["valid"] = False
+                continue
+            tarefa = _validate(
+                TarefaCreate, line, row, errors, pdi_id=PENDING_ID, meta_id=PENDING_ID
+            )
+            plan["metas"][-1][1].append(tarefa)
+            plan["valid"] &= tarefa is not None
+        else:
+            projeto = _validate(ProjetoCreate, line, row, errors, pdi_id=PENDING_ID)
+            plan["projetos"].append(projeto)
+            plan["valid"] &= projeto is not None
+
+    if plan is not None:
+        yield plan
+
+
+def _write_plans(plans):
+    """Grava os planos com um INSERT ... RETURNING por tabela"""
+    now = datetime.now(timezone.utc)
+    returning = dict(sort_by_parameter_order=True)
+
+    pdi_ids = db.session.scalars(
+        insert(PDI).returning(PDI.id, **returning),
+        [{**plan["pdi"].model_dump(), "created_at": now, "last_update": now} for plan in plans],
+    ).all()
+
+    metas = [
+        (pdi_id, meta, tarefas)
+        for plan, pdi_id in zip(plans, pdi_ids)
+        for meta, tarefas in plan["metas"]
+    ]
+    meta_ids = db.session.scalars(
+        insert(Meta).returning(Meta.id, **returning),
+        [{**meta.model_dump(), "pdi_id": pdi_id, "created_at": now} for pdi_id, meta, _ in metas],
+    ).all() if metas else []
+
+    tarefas = [
+        (pdi_id, meta_id, tarefa)
+        for (pdi_id, _, meta_tarefas), meta_id in zip(metas, meta_ids)
+        for tarefa in meta_tarefas
+    ]
+    tarefa_ids = db.session.scalars(
+        insert(Tarefa).returning(Tarefa.id, **returning),
+        [
+            {**tarefa.model_dump(), "pdi_id": pdi_id, "meta_id": meta_id, "created_at": now}
+            for pdi_id, meta_id, tarefa in tarefas
+        ],
+    ).all() if tarefas else []
+
+    projetos = [
+        {**projeto.model_dump(), "pdi_id": pdi_id, "created_at": now}
+        for plan, pdi_id in zip(plans, pdi_ids)
+        for projeto in plan["projetos"]
+    ]
+    if projetos:
+        projeto_ids = db.session.scalars(
+            insert(Projeto).returning(Projeto.id, **returning), projetos
+        ).all()
+        # INSERT em lote não dispara o evento que mantém o índice de tecnologias
+        index_tecnologias(db.session.connection(), {
+            projeto_id: projeto["tecnologias"]
+            for projeto_id, projeto in zip(projeto_ids, projetos)
+            if projeto["tecnologias"]
+        })
+
+    _notify_due_dates(plans, pdi_ids, metas, meta_ids, tarefas, tarefa_ids)
+    return {
+        "pdis": len(pdi_ids), "metas": len(meta_ids),
+        "tarefas": len(tarefas), "projetos": len(projetos),
+    }
+
+
+def _notify_due_dates(plans, pdi_ids, metas, meta_ids, tarefas, tarefa_ids):
+    # INSERT em lote não dispara os eventos do mapper que avisam o scheduler
+    from app import due_scheduler
+
+    for plan, pdi_id in zip(plans, pdi_ids):
+        if plan["pdi"].deadline:
+            due_scheduler.notify("pdi", pdi_id, pdi_id, plan["pdi"].title, plan["pdi"].deadline)
+    for (pdi_id, meta, _), meta_id in zip(metas, meta_ids):
+        if meta.data_fim_previsto:
+            due_scheduler.notify("meta", meta_id, pdi_id, meta.title, meta.data_fim_previsto)
+    for (pdi_id, _, tarefa), tarefa_id in zip(tarefas, tarefa_ids):
+        if tarefa.data_prevista:
+            due_scheduler.notify("tarefa", tarefa_id, pdi_id, tarefa.title, tarefa.data_prevista)
+
+
+def _flush(batch, errors, totals):
+    from models.StudentModel import Student
+    from models.UserModel import User
+
+    # estudantes e mentores do lote inteiro em uma consulta cada
+    students = set(db.session.scalars(
+        select(Student.id).where(Student.id.in_({plan["pdi"].student_id for plan in batch}))
+    ))
+    mentor_ids = {plan["pdi"].mentor_id for plan in batch if plan["pdi"].mentor_id}
+    mentors = set(db.session.scalars(
+        select(User.id).where(User.id.in_(mentor_ids))
+    )) if mentor_ids else set()
+
+    plans = []
+    for plan in batch:
+        pdi = plan["pdi"]
+        if pdi.student_id not in students:
+            errors.append({"row": plan["line"], "error": f"Student {pdi.student_id} not found"})
+        elif pdi.mentor_id and pdi.mentor_id not in mentors:
+            errors.append({"row": plan["line"], "error": f"Mentor {pdi.mentor_id} not found"})
+        else:
+            plans.append(plan)
+
+    if not plans:
+        return
+
+    try:
+        with db.session.begin_nested():
+            written = _write_plans(plans)
+    except IntegrityError:
+        # algum registro sumiu entre a checagem e o INSERT: plano a plano
+        written = {"pdis": 0, "metas": 0, "tarefas": 0, "projetos": 0}
+        for plan in plans:
+            try:
+                with db.session.begin_nested():
+                    for key, count in _write_plans([plan]).items():
+                        written[key] += count
+            except IntegrityError as e:
+                errors.append({"row": plan["line"], "error": str(e.orig)})
+
+    db.session.commit()
+    for key, count in written.items():
+        totals[key] += count
+
+
+def import_plans(stream, filename):
+    """Importa os planos de uma planilha, gravando em lotes de ``PLAN_BATCH``.
+
+    Só um lote de planos fica em memória por vez. Devolve
+    ``(planos lidos, totais gravados por tabela, erros por linha)``.
+    """
+    errors = []
+    totals = {"pdis": 0, "metas": 0, "tarefas": 0, "projetos": 0}
+    received = 0
+    batch = []
+
+    for plan in parse_plans(read_rows(stream, filename), errors):
+        received += 1
+        if not plan["valid"]:
+            errors.append({"row": plan["line"], "error": "plano ignorado: há linhas inválidas"})
+            continue
+        batch.append(plan)
+        if len(batch) >= PLAN_BATCH:
+            _flush(batch, errors, totals)
+            batch = []
+
+    if batch:
+        _flush(batch, errors, totals)
+
+    errors.sort(key=lambda error: error["row"])
+    return received, totals, errors
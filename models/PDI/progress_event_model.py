@@ -0,0 +1,47 @@
+# models/PDI/progress_event_model.py
+from datetime import datetime, timezone
+from app import db
+
+class ProgressEvent(db.Model):
+    """Histórico append-only das mudanças de progresso de PDIs e metas"""
+    __tablename__ = "pdi_progress_events"
+    __table_args__ = (
+        db.Index("ix_pdi_progress_events_entity_ts", "entity_type", "entity_id", "ts"),
+        db.Index("ix_pdi_progress_events_student_ts", "student_id", "ts"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    entity_type = db.Column(db.String(8), nullable=False)  # "pdi" | "meta"
+    entity_id = db.Column(db.Integer, nullable=False)
+    # Sem FK: o histórico sobrevive à remoção do PDI/meta
+    pdi_id = db.Column(db.Integer, nullable=False)
+    student_id = db.Column(db.Integer, nullable=False)
+
+    progress = db.Column(db.SmallInteger, nullable=False)
+    status = db.Column(db.String(64))
+    ts = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<ProgressEvent {self.entity_type} {self.entity_id} {self.progress}%>"
+
+
+def progress_history_between(entity_type=None, entity_id=None, student_id=None,
+                             since=None, until=None, limit=1000):
+    """Eventos de um PDI/meta (índice entity_ts) ou de um estudante (student_ts)
+    no intervalo [since, until), em ordem cronológica"""
+    query = ProgressEvent.query
+    if student_id is not None:
+        query = query.filter(ProgressEvent.student_id == student_id)
+    else:
+        query = query.filter(
+            ProgressEvent.entity_type == entity_type,
+            ProgressEvent.entity_id == entity_id,
+        )
+
+    if since is not None:
+        query = query.filter(ProgressEvent.ts >= since)
+    if until is not None:
+        query = query.filter(ProgressEvent.ts < until)
+
+    return query.order_by(ProgressEvent.ts).limit(limit).all()
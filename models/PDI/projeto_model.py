@@ -1,10 +1,12 @@
 # models/PDI/projeto_model.py
 from datetime import datetime, timezone
 from app import db
-from .enums import MetaStatus, Dificuldade, ProjetoTipo
+from .enums import MetaStatus, Dificuldade, ProjetoTipo, EntregavelStatus
 
 class Projeto(db.Model):
     __tablename__ = "pdi_projetos"
+    # Ids não reaproveitados depois do arquivamento (ver PDI)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -36,10 +38,59 @@ class Projeto(db.Model):
     
     # NOTA: Os relacionamentos serão configurados no __init__.py
 
-    @property
-    def entregaveis(self):
-        # Pode ser estendido para buscar de uma tabela separada
-        return []
+    @staticmethod
+    def recalculate_progress(projeto_id):
+        """Progresso = entregáveis aprovados / total, num único UPDATE.
+
+        Mesmo esquema de ``Meta.update_progress``: o banco calcula sobre os
+        entregáveis já gravados e o UPDATE só acontece se algo mudou.
+        """
+        from .entregavel_model import Entregavel
+
+        stats = (
+            db.select(
+                db.case(
+                    (db.func.count(Entregavel.id) == 0, 0),
+                    else_=db.func.sum(
+                        db.case((Entregavel.status == EntregavelStatus.APPROVED.value, 100), else_=0)
+                    ) // db.func.count(Entregavel.id),
+                ).label("progress")
+            )
+            .where(Entregavel.projeto_id == projeto_id)
+            .subquery()
+        )
+        progress = stats.c.progress
+        # Sem aprovados volta a pending se estava concluído ou em andamento;
+        # pending/cancelled definidos à mão ficam como estão
+        status = db.case(
+            (progress == 100, MetaStatus.COMPLETED.value),
+            (progress > 0, MetaStatus.IN_PROGRESS.value),
+            (
+                Projeto.status.in_((MetaStatus.COMPLETED.value, MetaStatus.IN_PROGRESS.value)),
+                MetaStatus.PENDING.value,
+            ),
+            else_=Projeto.status,
+        )
+
+        db.session.execute(
+            db.update(Projeto)
+            .where(
+                Projeto.id == projeto_id,
+                db.or_(Projeto.progress.is_distinct_from(progress), Projeto.status.is_distinct_from(status)),
+            )
+            .values(
+                progress=progress,
+                status=status,
+                # Mantém a data da primeira conclusão; some se deixou de estar concluído
+                data_fim=db.case(
+                    (progress < 100, None),
+                    (Projeto.data_fim.is_(None), datetime.now(timezone.utc)),
+                    else_=Projeto.data_fim,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
 
     def __repr__(self):
         return f"<Projeto {self.id} - {self.title}>"
\ No newline at end of file
@@ -1,8 +1,8 @@
 # models/PDI/schemas.py
-from datetime import datetime
-from pydantic import BaseModel
+from datetime import date, datetime
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-from .enums import PDIStatus, MetaStatus, TarefaTipo, Dificuldade, Prioridade, ProjetoTipo
+from .enums import PDIStatus, MetaStatus, TarefaTipo, Dificuldade, Prioridade, ProjetoTipo, EntregavelTipo, EntregavelStatus
 from utils.models import OrmBase
 
 class SmartCriteria(BaseModel):
@@ -90,6 +90,9 @@ class PDIResponse(OrmBase):
     projetos_concluidos: int
     projetos_totais: int
 
+    # True quando veio das tabelas de arquivo (somente leitura)
+    archived: bool = False
+
 
 # Meta Schemas
 class MetaCreate(BaseModel):
@@ -188,6 +191,36 @@ class ProjetoCreate(BaseModel):
     tecnologias: Optional[List[str]] = []
 
 
+class EntregavelUpsert(BaseModel):
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    tipo: EntregavelTipo = EntregavelTipo.LINK
+    status: EntregavelStatus = EntregavelStatus.PENDING
+    url: Optional[str] = None
+    file_name: Optional[str] = None
+    mime_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+
+
+class EntregavelBulkUpsert(BaseModel):
+    entregaveis: List[EntregavelUpsert] = Field(..., max_length=500)
+
+
+class EntregavelResponse(OrmBase):
+    id: int
+    projeto_id: int
+    title: str
+    description: Optional[str]
+    tipo: str
+    status: str
+    url: Optional[str]
+    file_name: Optional[str]
+    mime_type: Optional[str]
+    size_bytes: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+
+
 class ProjetoResponse(OrmBase):
     id: int
     pdi_id: int
@@ -208,7 +241,7 @@ class ProjetoResponse(OrmBase):
     # Links e tecnologias
     link: Optional[str]
     tecnologias: List[str]
-    entregaveis: List[str] = []
+    entregaveis: List[EntregavelResponse] = []
 
 
 # Schemas de Resposta Completa
@@ -221,4 +254,153 @@ class PDIResponseList(BaseModel):
     page: int
     pages: int
     total: int
-    pdis: List[PDIResponse]
\ No newline at end of file
+    pdis: List[PDIResponse]
+
+
+# Prazos
+class DueItem(BaseModel):
+    kind: str
+    id: int
+    pdi_id: int
+    title: str
+    due: datetime
+
+
+class DueItemsResponse(BaseModel):
+    overdue: List[DueItem]
+    upcoming: List[DueItem]
+
+
+class DueReminderResponse(OrmBase):
+    kind: str
+    item_id: int
+    pdi_id: int
+    title: str
+    reminder: str
+    due: datetime
+    sent_at: datetime
+
+
+class DueRemindersResponse(BaseModel):
+    reminders: List[DueReminderResponse]
+
+
+
+# Histórico de progresso
+class ProgressEventResponse(OrmBase):
+    entity_type: str
+    entity_id: int
+    pdi_id: int
+    student_id: int
+    progress: int
+    status: Optional[str]
+    ts: datetime
+
+
+class ProgressHistoryResponse(BaseModel):
+    events: List[ProgressEventResponse]
+
+
+
+# Burndown
+class BurndownSeries(BaseModel):
+    dates: List[date]
+    remaining: List[float]
+    ideal: List[float]
+
+
+class BurndownResponse(BaseModel):
+    pdi_id: int
+    total_points: float
+    remaining_points: float
+    velocity: float
+    deadline: Optional[date]
+    projected_completion: Optional[date]
+    on_track: Optional[bool]
+    series: Optional[BurndownSeries] = None
+
+
+class BurndownListResponse(BaseModel):
+    burndowns: List[BurndownResponse]
+
+
+
+# Analytics por turma/categoria
+class CohortGroupStats(BaseModel):
+    group: Optional[str]
+    count: int
+    median_progress: int
+    p90_progress: int
+    completion_rate: float
+    avg_days_to_complete: Optional[float]
+
+
+class CohortAnalyticsResponse(BaseModel):
+    group_by: str
+    generated_on: date
+    groups: List[CohortGroupStats]
+
+
+# Leaderboard de pontos
+class LeaderboardEntry(BaseModel):
+    rank: int
+    student_id: int
+    points: int
+
+
+class LeaderboardResponse(BaseModel):
+    period: str
+    course: Optional[str]
+    entries: List[LeaderboardEntry]
+
+
+# Importação de planos por planilha
+class PlanImportError(BaseModel):
+    row: int
+    error: str
+
+
+class PlanImportResponse(BaseModel):
+    received: int
+    pdis: int
+    metas: int
+    tarefas: int
+    projetos: int
+    errors: List[PlanImportError]
+
+
+# Índice de tecnologias dos projetos
+class TecnologiaUsage(BaseModel):
+    name: str
+    projetos: int
+    students: int
+
+
+class TecnologiaUsageResponse(BaseModel):
+    tecnologias: List[TecnologiaUsage]
+
+
+class TecnologiaProjetosResponse(BaseModel):
+    match: str
+    projetos: List[ProjetoResponse]
+    next_after: Optional[int] = None
+
+
+class TecnologiaStudent(BaseModel):
+    student_id: int
+    projetos: int
+
+
+class TecnologiaStudentsResponse(BaseModel):
+    match: str
+    students: List[TecnologiaStudent]
+    next_after: Optional[int] = None
+
+
+# Entregáveis dos projetos
+class EntregavelBulkResponse(BaseModel):
+    projeto_id: int
+    received: int
+    progress: int
+    status: str
+    entregaveis: List[EntregavelResponse]
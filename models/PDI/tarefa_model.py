@@ -5,6 +5,14 @@ from .enums import MetaStatus, TarefaTipo, Dificuldade
 
 class Tarefa(db.Model):
     __tablename__ = "pdi_tarefas"
+    __table_args__ = (
+        # Prazos por PDI (consulta por estudante/mentor faz join pelo pdi_id)
+        db.Index("ix_pdi_tarefas_pdi_id_data_prevista", "pdi_id", "data_prevista"),
+        # Progresso da meta: contagem por status sem ler a tabela
+        db.Index("ix_pdi_tarefas_meta_id_status", "meta_id", "status"),
+        # Ids não reaproveitados depois do arquivamento (ver PDI)
+        {"sqlite_autoincrement": True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -32,23 +40,55 @@ class Tarefa(db.Model):
     recurso = db.Column(db.UnicodeText)
     
     # Datas
-    data_prevista = db.Column(db.DateTime, nullable=True)
-    data_conclusao = db.Column(db.DateTime, nullable=True)
+    data_prevista = db.Column(db.DateTime, nullable=True, index=True)
+    data_conclusao = db.Column(db.DateTime, nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     
     # NOTA: Os relacionamentos serão configurados no __init__.py
 
     def complete(self):
         """Marca tarefa como concluída"""
-        self.status = MetaStatus.COMPLETED.value
-        self.data_conclusao = datetime.now(timezone.utc)
+        # Só a primeira conclusão passa pelo WHERE: duas requisições
+        # simultâneas não somam os pontos duas vezes
+        completed_now = db.session.execute(
+            db.update(Tarefa)
+            .where(
+                Tarefa.id == self.id,
+                Tarefa.status.is_distinct_from(MetaStatus.COMPLETED.value),
+            )
+            .values(status=MetaStatus.COMPLETED.value, data_conclusao=datetime.now(timezone.utc))
+            .returning(Tarefa.id)
+            .execution_options(synchronize_session=False)
+        ).first() is not None
         db.session.commit()
-        
+
+        if not completed_now:
+            return
+        # UPDATE em Core não dispara os eventos do mapper: cancela o lembrete
+        from app import due_scheduler
+        due_scheduler.notify("tarefa", self.id, self.pdi_id, self.title, self.data_prevista, closed=True)
+        self._record_points()
+
         # Propaga para a meta
         from .meta_model import Meta
-        meta = Meta.query.get(self.meta_id)
+        meta = db.session.get(Meta, self.meta_id)
         if meta:
             meta.update_progress()
 
+    def _record_points(self):
+        """Soma os pontos da tarefa no leaderboard em memória"""
+        if not self.pontos:
+            return
+        from app import leaderboard
+        from models.StudentModel import Student
+        from .pdi_model import PDI
+        row = db.session.execute(
+            db.select(Student.id, Student.course)
+            .join(PDI, PDI.student_id == Student.id)
+            .where(PDI.id == self.pdi_id)
+        ).first()
+        if row:
+            leaderboard.record_completion(row.id, row.course, self.pontos, self.data_conclusao)
+
     def __repr__(self):
         return f"<Tarefa {self.id} - {self.title}>"
\ No newline at end of file
@@ -0,0 +1,179 @@
+# models/PDI/tecnologia_model.py
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import event, inspect
+
+from app import db
+from utils.database import upsert
+from .projeto_model import Projeto
+
+REINDEX_CHUNK = 1000
+
+
+class Tecnologia(db.Model):
+    """Tecnologias citadas em ``Projeto.tecnologias``, uma linha por nome.
+
+    O JSON do projeto continua sendo o que a API devolve; estas tabelas são
+    o índice para buscar projetos por tecnologia e contar uso sem ler o JSON
+    de todos os projetos.
+    """
+    __tablename__ = "pdi_tecnologias"
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Normalizado (minúsculas, sem espaços nas pontas): "Flask" e "flask" são a mesma
+    name = db.Column(db.String(128), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<Tecnologia {self.id} - {self.name}>"
+
+
+projeto_tecnologias = db.Table(
+    "pdi_projeto_tecnologias",
+    db.Column("projeto_id", db.Integer, db.ForeignKey("pdi_projetos.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("tecnologia_id", db.Integer, db.ForeignKey("pdi_tecnologias.id", ondelete="CASCADE"), primary_key=True),
+    # Busca e contagem partem da tecnologia
+    db.Index("ix_pdi_projeto_tecnologias_tecnologia_id_projeto_id", "tecnologia_id", "projeto_id"),
+)
+
+
+def normalize(names):
+    """Nomes normalizados, sem vazios nem repetidos, na ordem em que aparecem"""
+    seen = {}
+    for name in names or ():
+        if isinstance(name, str) and name.strip():
+            seen.setdefault(name.strip().lower()[:128], None)
+    return list(seen)
+
+
+def index_tecnologias(connection, tecnologias_by_projeto):
+    """Reescreve o índice de ``{projeto_id: [tecnologias]}`` em poucas instruções.
+
+    Cadastra as tecnologias novas (ON CONFLICT DO NOTHING, seguro com
+    workers concorrentes), apaga as associações antigas dos projetos e
+    insere as novas.
+    """
+    if not tecnologias_by_projeto:
+        return
+    names = {
+        projeto_id: normalize(tecnologias)
+        for projeto_id, tecnologias in tecnologias_by_projeto.items()
+    }
+    all_names = {name for projeto_names in names.values() for name in projeto_names}
+
+    ids = {}
+    if all_names:
+        upsert(
+            Tecnologia.__table__,
+            # ordem fixa: dois workers inserindo nomes em comum não se travam
+            [{"name": name} for name in sorted(all_names)],
+            index_elements=["name"],
+            connection=connection,
+        )
+        ids = dict(connection.execute(
+            db.select(Tecnologia.name, Tecnologia.id).where(Tecnologia.name.in_(all_names))
+        ).all())
+
+    connection.execute(
+        projeto_tecnologias.delete().where(projeto_tecnologias.c.projeto_id.in_(list(names)))
+    )
+    rows = [
+        {"projeto_id": projeto_id, "tecnologia_id": ids[name]}
+        for projeto_id, projeto_names in names.items()
+        for name in projeto_names
+    ]
+    if rows:
+        connection.execute(projeto_tecnologias.insert(), rows)
+
+
+@event.listens_for(Projeto, "after_insert")
+def _index_new_projeto(mapper, connection, target):
+    if target.tecnologias:
+        index_tecnologias(connection, {target.id: target.tecnologias})
+
+
+@event.listens_for(Projeto, "after_update")
+def _reindex_projeto(mapper, connection, target):
+    # Só reindexa quando o JSON foi trocado (atribuição, não mutação in-place)
+    if inspect(target).attrs.tecnologias.history.has_changes():
+        index_tecnologias(connection, {target.id: target.tecnologias})
+
+
+def _tecnologia_ids(names):
+    return db.session.scalars(
+        db.select(Tecnologia.id).where(Tecnologia.name.in_(normalize(names)))
+    ).all()
+
+
+def projetos_matching(names, match_all=True):
+    """Subconsulta com os ids dos projetos que usam as tecnologias.
+
+    ``match_all`` exige todas (AND: ``HAVING count = n`` sobre a
+    associação); senão basta uma (OR). Tecnologia desconhecida com AND não
+    casa com nada.
+    """
+    wanted = normalize(names)
+    ids = _tecnologia_ids(wanted)
+    query = (
+        db.select(projeto_tecnologias.c.projeto_id)
+        .where(projeto_tecnologias.c.tecnologia_id.in_(ids))
+        .group_by(projeto_tecnologias.c.projeto_id)
+    )
+    if match_all:
+        if len(ids) < len(wanted):
+            return query.where(db.false())
+        query = query.having(db.func.count() == len(ids))
+    return query
+
+
+def tecnologia_usage(limit=None):
+    """``(tecnologia, projetos, estudantes)`` pelo índice, mais usadas primeiro"""
+    from .pdi_model import PDI
+
+    query = (
+        db.select(
+            Tecnologia.name,
+            db.func.count(projeto_tecnologias.c.projeto_id).label("projetos"),
+            db.func.count(db.distinct(PDI.student_id)).label("students"),
+        )
+        .join(projeto_tecnologias, projeto_tecnologias.c.tecnologia_id == Tecnologia.id)
+        .join(Projeto, Projeto.id == projeto_tecnologias.c.projeto_id)
+        .join(PDI, PDI.id == Projeto.pdi_id)
+        .group_by(Tecnologia.id, Tecnologia.name)
+        .order_by(db.desc("projetos"), Tecnologia.name)
+    )
+    if limit:
+        query = query.limit(limit)
+    return db.session.execute(query).all()
+
+
+def reindex_all():
+    """Remonta o índice a partir do JSON de todos os projetos, em blocos"""
+    total = 0
+    last_id = 0
+    while True:
+        chunk = db.session.execute(
+            db.select(Projeto.id, Projeto.tecnologias)
+            .where(Projeto.id > last_id)
+            .order_by(Projeto.id)
+            .limit(REINDEX_CHUNK)
+        ).all()
+        if not chunk:
+            break
+        index_tecnologias(db.session.connection(), dict(chunk))
+        db.session.commit()
+        total += len(chunk)
+        last_id = chunk[-1].id
+    return total
+
+
+@click.group("tecnologias")
+def tecnologias_cli():
+    """Índice de tecnologias dos projetos"""
+
+
+@tecnologias_cli.command("reindex")
+@with_appcontext
+def reindex_command():
+    """Remonta o índice de tecnologias a partir de Projeto.tecnologias"""
+    count = reindex_all()
+    click.echo(f"{count} projetos indexados")
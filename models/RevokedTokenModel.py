@@ -0,0 +1,17 @@
+from app import db
+
+
+class RevokedToken(db.Model):
+    """jti revogados (logout), store padrão da blocklist de tokens.
+
+    Cada linha vale até ``expires_at`` (quando o token expiraria de
+    qualquer jeito; None = para sempre). As vencidas são apagadas pela
+    sincronização da blocklist (ver utils/token_blocklist.py).
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(64), primary_key=True)
+    expires_at = db.Column(db.DateTime, index=True)
+
+    def __repr__(self) -> str:
+        return f"<RevokedToken {self.jti}>"
@@ -13,7 +13,7 @@ class Student(db.Model):
     __tablename__ = "student"
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), unique=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), unique=True)
 
     # Dados acadêmicos
     enrollment_year = db.Column(db.Integer)
@@ -35,6 +35,6 @@ class Student(db.Model):
     risk_score = db.Column(db.Float)
 
     # Relacionamentos
-    pdis = db.relationship("PDI", backref="student", cascade="all, delete-orphan")
-    weekly_forms = db.relationship("WeeklyForm", backref="student", cascade="all, delete-orphan")
-    todos = db.relationship("Todo", backref="student", cascade="all, delete-orphan")
+    pdis = db.relationship("PDI", backref="student", cascade="all, delete-orphan", passive_deletes=True)
+    weekly_forms = db.relationship("WeeklyForm", backref="student", cascade="all, delete-orphan", passive_deletes=True)
+    todos = db.relationship("Todo", backref="student", cascade="all, delete-orphan", passive_deletes=True)
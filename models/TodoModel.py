@@ -0,0 +1,139 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+from app import db
+from pydantic import BaseModel, field_validator
+from typing import List, Optional
+from sqlalchemy import update
+from utils.models import OrmBase
+
+
+class Todo(db.Model):
+    __tablename__ = "todo"
+    __table_args__ = (
+        # "meus todos" (pendentes/concluídos, por prazo) sai direto do índice
+        db.Index("ix_todo_student_id_done_due", "student_id", "done", "due"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(
+        db.Integer,
+        db.ForeignKey("student.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    title = db.Column(db.UnicodeText, nullable=False)
+    description = db.Column(db.UnicodeText)
+    done = db.Column(db.Boolean, nullable=False, default=False)
+    due = db.Column(db.DateTime, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Todo {self.id} - {self.title}>"
+
+
+def adjust_todo_counters(total_delta, completed_delta):
+    """Aplica variações em Student.total_todos / completed_todos.
+
+    Recebe dicts ``{student_id: delta}`` e soma no banco
+    (``col = col + delta``), sem ler o valor atual, dentro da transação
+    corrente. Um UPDATE por estudante afetado.
+    """
+    from models.StudentModel import Student
+
+    for student_id in set(total_delta) | set(completed_delta):
+        total = total_delta.get(student_id, 0)
+        completed = completed_delta.get(student_id, 0)
+        if not (total or completed):
+            continue
+
+        db.session.execute(
+            update(Student)
+            .where(Student.id == student_id)
+            .values(
+                total_todos=db.func.coalesce(Student.total_todos, 0) + total,
+                completed_todos=db.func.coalesce(Student.completed_todos, 0) + completed,
+            )
+        )
+
+
+def toggle_todos(todo_ids, done, student_id=None):
+    """Marca vários todos como feitos/não feitos em um UPDATE.
+
+    Só altera os que estão no estado oposto; o ``RETURNING`` diz quais
+    mudaram e de qual estudante, para ajustar os contadores na mesma
+    transação. Devolve os ids alterados.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = (
+        update(Todo)
+        .where(Todo.id.in_(todo_ids), Todo.done.is_not(done))
+        .values(done=done, completed_at=now if done else None)
+        .returning(Todo.id, Todo.student_id)
+        .execution_options(synchronize_session=False)
+    )
+    if student_id is not None:
+        stmt = stmt.where(Todo.student_id == student_id)
+
+    changed = db.session.execute(stmt).all()
+
+    per_student = Counter(row.student_id for row in changed)
+    sign = 1 if done else -1
+    adjust_todo_counters({}, {sid: sign * count for sid, count in per_student.items()})
+    db.session.commit()
+
+    return [row.id for row in changed]
+
+
+class TodoCreate(BaseModel):
+    student_id: int
+    title: str
+    description: Optional[str] = None
+    due: Optional[datetime] = None
+    done: Optional[bool] = False
+
+
+class TodoEdit(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    due: Optional[datetime] = None
+
+    # title pode ser omitido, mas não apagado: a coluna é NOT NULL
+    @field_validator("title")
+    @classmethod
+    def title_not_null(cls, value):
+        if value is None:
+            raise ValueError("title não pode ser null")
+        return value
+
+
+class TodoToggle(BaseModel):
+    ids: List[int]
+    done: bool
+
+
+class TodoToggleResponse(BaseModel):
+    changed: List[int]
+
+
+class TodoResponse(OrmBase):
+    id: int
+    student_id: int
+    title: str
+    description: Optional[str]
+    done: bool
+    due: Optional[datetime]
+    created_at: datetime
+    completed_at: Optional[datetime]
+
+
+class TodoResponseList(BaseModel):
+    todos: List[TodoResponse]
+
+
+class TodoCountersResponse(BaseModel):
+    student_id: int
+    total_todos: int
+    completed_todos: int
@@ -1,11 +1,12 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timezone
 
 from app import db
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Literal, Optional
 from utils.models import OrmBase
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from models.RoleModel import Role, RoleResponse
@@ -13,6 +14,10 @@ from models.RoleModel import Role, RoleResponse
 
 class User(db.Model):
     __tablename__ = "user"
+    __table_args__ = (
+        # listagem paginada por id filtrando por papel
+        db.Index("ix_user_role_id_id", "role_id", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     active = db.Column(db.Boolean, default=True)
@@ -21,14 +26,15 @@ class User(db.Model):
     password_hash = db.Column(db.String(256), index=True)
     email = db.Column(db.String(128), unique=True, nullable=False, index=True)
     birthdate = db.Column(db.DateTime)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
     
     role = db.relationship("Role", back_populates="users")
 
     registrations = db.relationship(
         "Registrations",
-        backref=db.backref("user", passive_deletes=True),
-        cascade="all, delete-orphan"
+        backref="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
 
@@ -53,6 +59,148 @@ class User(db.Model):
         return f"<User {self.username}>"
 
 
+class UserImport(db.Model):
+    """Importação em lote rodando em background (ver utils/user_import.py).
+
+    Só o resultado é gravado: as linhas (com as senhas) ficam na memória
+    do worker que recebeu o arquivo até o job terminar.
+    """
+    __tablename__ = "user_imports"
+
+    id = db.Column(db.Integer, primary_key=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"))
+    status = db.Column(db.String(16), nullable=False, default="queued")  # queued | running | done | failed
+    received = db.Column(db.Integer, nullable=False)
+    created = db.Column(db.Integer)
+    failed = db.Column(db.Integer)
+    results = db.Column(db.JSON)
+    error = db.Column(db.UnicodeText)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self) -> str:
+        return f"<UserImport {self.id} {self.status}>"
+
+
+IMPORT_CHUNK = 1000
+LOOKUP_CHUNK = 500  # valores por IN (...) na checagem de duplicados
+
+
+def _taken(column, values):
+    """Quais ``values`` já existem em ``column`` (IN em lotes)"""
+    values = list(values)
+    taken = set()
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        taken.update(db.session.scalars(
+            select(column).where(column.in_(values[start:start + LOOKUP_CHUNK]))
+        ))
+    return taken
+
+
+def import_users(rows, role_name="user"):
+    """Cria vários usuários de uma vez e devolve um resultado por linha.
+
+    ``rows`` são dicts (linhas de CSV ou objetos JSON). Cada linha é
+    validada com ``UserImportRow``; username/email repetidos no arquivo ou
+    já cadastrados são recusados com uma consulta por coluna para o lote
+    inteiro. As senhas são hasheadas em paralelo, o papel padrão é buscado
+    uma vez e a inserção é feita em lotes de ``IMPORT_CHUNK``.
+    """
+    from utils.passwords import hash_passwords
+
+    results = [None] * len(rows)
+    accepted = []
+    seen_usernames, seen_emails = set(), set()
+
+    for index, row in enumerate(rows):
+        try:
+            data = UserImportRow.model_validate(row)
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            results[index] = {
+                "index": index,
+                "username": row.get("username") if isinstance(row, dict) else None,
+                "status": "invalid",
+                "error": f"{field}: {error['msg']}" if field else error["msg"],
+            }
+            continue
+
+        if data.username in seen_usernames or data.email in seen_emails:
+            results[index] = {
+                "index": index, "username": data.username,
+                "status": "duplicate", "error": "username ou email repetido no arquivo",
+            }
+            continue
+
+        seen_usernames.add(data.username)
+        seen_emails.add(data.email)
+        accepted.append((index, data))
+
+    taken_usernames = _taken(User.username, seen_usernames)
+    taken_emails = _taken(User.email, seen_emails)
+
+    to_create = []
+    for index, data in accepted:
+        if data.username in taken_usernames or data.email in taken_emails:
+            results[index] = {
+                "index": index, "username": data.username,
+                "status": "duplicate", "error": "username ou email já cadastrado",
+            }
+        else:
+            to_create.append((index, data))
+
+    if to_create:
+        hashes = hash_passwords(data.password for _, data in to_create)
+        role_id = db.session.scalar(select(Role.id).filter_by(name=role_name))
+        now = datetime.now(timezone.utc)
+
+        values = [
+            {
+                "username": data.username,
+                "email": data.email,
+                "password_hash": password_hash,
+                "birthdate": (
+                    datetime.combine(data.birthdate, time()) if data.birthdate else None
+                ),
+                "role_id": role_id,
+                "active": True,
+                "created_at": now,
+            }
+            for (_, data), password_hash in zip(to_create, hashes)
+        ]
+        for start in range(0, len(values), IMPORT_CHUNK):
+            chunk = list(zip(to_create[start:start + IMPORT_CHUNK], values[start:start + IMPORT_CHUNK]))
+            _insert_chunk(chunk, results)
+
+    db.session.commit()
+    return results
+
+
+def _insert_chunk(chunk, results):
+    stmt = insert(User).returning(User.id, sort_by_parameter_order=True)
+    try:
+        with db.session.begin_nested():
+            ids = db.session.scalars(stmt, [value for _, value in chunk]).all()
+    except IntegrityError:
+        # alguém cadastrou o mesmo email entre a checagem e o INSERT:
+        # refaz o lote linha a linha para saber qual falhou
+        ids = []
+        for _, value in chunk:
+            try:
+                with db.session.begin_nested():
+                    ids.append(db.session.scalar(stmt, [value]))
+            except IntegrityError:
+                ids.append(None)
+
+    for ((index, data), _), user_id in zip(chunk, ids):
+        results[index] = {
+            "index": index, "username": data.username, "id": user_id,
+            "status": "created" if user_id is not None else "duplicate",
+            "error": None if user_id is not None else "username ou email já cadastrado",
+        }
+
+
 class UserEdit(BaseModel):
     username: str
     email: str
@@ -72,6 +220,53 @@ class UserResponse(OrmBase):
 
 class UserResponseList(BaseModel):
     users: list[UserResponse]
+    # id do último usuário da página; passar em ?after= para a próxima
+    next_after: Optional[int] = None
+
+
+class UserListQuery(BaseModel):
+    role: Optional[str] = None
+    active: Optional[bool] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    after: Optional[int] = None
+    limit: int = Field(50, ge=1, le=500)
+
+
+class UserImportRow(UserCreate):
+    birthdate: Optional[date] = None
+
+
+class UserImportBody(BaseModel):
+    users: List[dict]
+
+
+class UserImportResult(BaseModel):
+    index: int
+    username: Optional[str] = None
+    status: Literal["created", "duplicate", "invalid"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class UserImportResponse(OrmBase):
+    id: int
+    status: Literal["queued", "running", "done", "failed"]
+    received: int
+    created: Optional[int] = None
+    failed: Optional[int] = None
+    results: Optional[List[UserImportResult]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class UserExportQuery(BaseModel):
+    role: Optional[str] = None
+    active: Optional[bool] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    format: Literal["csv", "ndjson"] = "csv"
 
 
 class UserResponseSimple(OrmBase):
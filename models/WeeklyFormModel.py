@@ -0,0 +1,253 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from app import db
+from pydantic import BaseModel
+from typing import List, Optional
+from sqlalchemy import select, tuple_, update
+from utils.database import upsert
+from utils.models import OrmBase
+
+
+class WeeklyForm(db.Model):
+    __tablename__ = "weekly_form"
+    __table_args__ = (
+        db.UniqueConstraint("student_id", "week", name="uq_weekly_form_student_week"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(
+        db.Integer,
+        db.ForeignKey("student.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    # Segunda-feira da semana do check-in
+    week = db.Column(db.Date, nullable=False)
+
+    mood = db.Column(db.Float, nullable=False)
+    dedication = db.Column(db.Float, nullable=False)
+    hours_studied = db.Column(db.Integer)
+    highlights = db.Column(db.UnicodeText)
+    difficulties = db.Column(db.UnicodeText)
+
+    submitted_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self) -> str:
+        return f"<WeeklyForm {self.student_id} {self.week}>"
+
+
+class WeeklyStudentTotals(db.Model):
+    """Somatórios de todas as semanas de cada estudante (uma linha por
+    estudante), atualizados a cada envio"""
+    __tablename__ = "weekly_form_student_totals"
+
+    student_id = db.Column(
+        db.Integer,
+        db.ForeignKey("student.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    forms_count = db.Column(db.Integer, nullable=False, default=0)
+    mood_sum = db.Column(db.Float, nullable=False, default=0)
+    dedication_sum = db.Column(db.Float, nullable=False, default=0)
+
+
+class WeeklyCohortRollup(db.Model):
+    """Somatórios por turma (curso + ano de ingresso) e semana"""
+    __tablename__ = "weekly_form_cohort_rollup"
+
+    # Curso/ano ausentes viram "" / 0 para poderem fazer parte da chave
+    course = db.Column(db.String(128), primary_key=True)
+    enrollment_year = db.Column(db.Integer, primary_key=True)
+    week = db.Column(db.Date, primary_key=True)
+
+    forms_count = db.Column(db.Integer, nullable=False, default=0)
+    mood_sum = db.Column(db.Float, nullable=False, default=0)
+    dedication_sum = db.Column(db.Float, nullable=False, default=0)
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def submit_weekly_forms(forms):
+    """Grava vários formulários e atualiza os rollups de forma incremental.
+
+    ``forms`` é uma lista de ``WeeklyFormCreate``. Reenvio para a mesma
+    (student_id, semana) substitui o formulário anterior e aplica só a
+    diferença nos rollups. Devolve ``(created, updated, errors)``, onde
+    ``errors`` é uma lista de ``(índice, mensagem)``.
+    """
+    from models.StudentModel import Student
+
+    errors = []
+    student_ids = {form.student_id for form in forms}
+    cohorts = {
+        row.id: (row.course or "", row.enrollment_year or 0)
+        for row in db.session.execute(
+            select(Student.id, Student.course, Student.enrollment_year)
+            .where(Student.id.in_(student_ids))
+        )
+    }
+
+    # Último envio vence quando a mesma semana aparece repetida no lote
+    latest = {}
+    for index, form in enumerate(forms):
+        if form.student_id not in cohorts:
+            errors.append((index, f"Student {form.student_id} not found"))
+            continue
+        latest[(form.student_id, week_start(form.week))] = form
+
+    if not latest:
+        return 0, 0, errors
+
+    now = datetime.now(timezone.utc)
+    rows = {
+        (student_id, week): {
+            "student_id": student_id,
+            "week": week,
+            "mood": form.mood,
+            "dedication": form.dedication,
+            "hours_studied": form.hours_studied,
+            "highlights": form.highlights,
+            "difficulties": form.difficulties,
+            "submitted_at": now,
+        }
+        for (student_id, week), form in latest.items()
+    }
+
+    # Semanas novas entram com ON CONFLICT DO NOTHING: o RETURNING diz quais
+    # entraram de fato. Um envio concorrente da mesma semana espera no
+    # índice único e cai no caminho de atualização abaixo.
+    created = {
+        (row.student_id, row.week)
+        for row in upsert(
+            WeeklyForm.__table__,
+            [rows[key] for key in sorted(rows)],
+            index_elements=["student_id", "week"],
+            returning=(WeeklyForm.student_id, WeeklyForm.week),
+        )
+    }
+
+    # As demais já existiam: travadas (FOR UPDATE) antes de ler o valor
+    # antigo, então dois reenvios simultâneos não calculam a diferença a
+    # partir do mesmo valor
+    to_update = sorted(set(rows) - created)
+    existing = {}
+    if to_update:
+        existing = {
+            (row.student_id, row.week): row
+            for row in db.session.execute(
+                select(
+                    WeeklyForm.id, WeeklyForm.student_id, WeeklyForm.week,
+                    WeeklyForm.mood, WeeklyForm.dedication
+                )
+                .where(tuple_(WeeklyForm.student_id, WeeklyForm.week).in_(to_update))
+                .order_by(WeeklyForm.student_id, WeeklyForm.week)
+                .with_for_update()
+            )
+        }
+
+    changed_rows = []
+    student_delta = defaultdict(lambda: [0, 0.0, 0.0])
+    cohort_delta = defaultdict(lambda: [0, 0.0, 0.0])
+
+    for (student_id, week), form in latest.items():
+        previous = existing.get((student_id, week))
+        if (student_id, week) in created:
+            delta = (1, form.mood, form.dedication)
+        elif previous is not None:
+            changed_rows.append({"id": previous.id, **rows[(student_id, week)]})
+            delta = (0, form.mood - previous.mood, form.dedication - previous.dedication)
+        else:
+            continue  # apagado por outra transação entre o INSERT e o SELECT
+
+        for acc in (student_delta[student_id], cohort_delta[cohorts[student_id] + (week,)]):
+            acc[0] += delta[0]
+            acc[1] += delta[1]
+            acc[2] += delta[2]
+
+    if changed_rows:
+        db.session.execute(update(WeeklyForm), changed_rows)
+
+    upsert(
+        WeeklyStudentTotals.__table__,
+        [
+            {"student_id": student_id, "forms_count": count,
+             "mood_sum": mood, "dedication_sum": dedication}
+            for student_id, (count, mood, dedication) in student_delta.items()
+        ],
+        index_elements=["student_id"],
+        increment=("forms_count", "mood_sum", "dedication_sum"),
+    )
+    upsert(
+        WeeklyCohortRollup.__table__,
+        [
+            {"course": course, "enrollment_year": year, "week": week,
+             "forms_count": count, "mood_sum": mood, "dedication_sum": dedication}
+            for (course, year, week), (count, mood, dedication) in cohort_delta.items()
+        ],
+        index_elements=["course", "enrollment_year", "week"],
+        increment=("forms_count", "mood_sum", "dedication_sum"),
+    )
+    db.session.commit()
+
+    return len(created), len(changed_rows), errors
+
+
+class WeeklyFormCreate(BaseModel):
+    student_id: int
+    week: date
+    mood: float
+    dedication: float
+    hours_studied: Optional[int] = None
+    highlights: Optional[str] = None
+    difficulties: Optional[str] = None
+
+
+class WeeklyFormBulkCreate(BaseModel):
+    forms: List[WeeklyFormCreate]
+
+
+class WeeklyFormError(BaseModel):
+    index: int
+    error: str
+
+
+class WeeklyFormBulkResponse(BaseModel):
+    received: int
+    created: int
+    updated: int
+    errors: List[WeeklyFormError]
+
+
+class WeeklyFormResponse(OrmBase):
+    id: int
+    student_id: int
+    week: date
+    mood: float
+    dedication: float
+    hours_studied: Optional[int]
+    highlights: Optional[str]
+    difficulties: Optional[str]
+    submitted_at: datetime
+
+
+class WeeklyTrendPoint(BaseModel):
+    week: date
+    forms_count: int
+    mood_avg: float
+    dedication_avg: float
+
+
+class WeeklyStudentTrendResponse(BaseModel):
+    student_id: int
+    forms_count: int
+    mood_avg: Optional[float]
+    dedication_avg: Optional[float]
+    forms: List[WeeklyFormResponse]
+
+
+class WeeklyCohortTrendResponse(BaseModel):
+    course: Optional[str]
+    enrollment_year: Optional[int]
+    weeks: List[WeeklyTrendPoint]
@@ -1,6 +1,10 @@
 # models/__init__.py
 from .UserModel import User
 from .StudentModel import Student
+from .WeeklyFormModel import WeeklyForm
+from .TodoModel import Todo
+from .RevokedTokenModel import RevokedToken
+from .IdempotencyKeyModel import IdempotencyKey
 
 # Importar modelos PDI
 from .PDI.pdi_model import PDI
@@ -8,4 +12,4 @@ from .PDI.meta_model import Meta
 from .PDI.tarefa_model import Tarefa
 from .PDI.projeto_model import Projeto
 
-__all__ = ['User', 'Student', 'Teacher', 'PDI', 'Meta', 'Tarefa', 'Projeto']
\ No newline at end of file
+__all__ = ['User', 'Student', 'WeeklyForm', 'Todo', 'Teacher', 'PDI', 'Meta', 'Tarefa', 'Projeto']
\ No newline at end of file
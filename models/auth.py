@@ -7,4 +7,9 @@ class LoginMessage(BaseModel):
 
 
 class LoginResponseMessage(BaseModel):
-    access_token: str
\ No newline at end of file
+    access_token: str
+    refresh_token: str
+
+
+class RefreshResponseMessage(BaseModel):
+    access_token: str
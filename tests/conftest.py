@@ -0,0 +1,80 @@
+# tests/conftest.py
+import pytest
+from flask_jwt_extended import create_access_token
+
+# Tabelas de quem usa o app autenticado como estudante
+STUDENT_TABLES = ("role", "user", "student")
+
+# Tabelas do PDI (registrations depende de talks, que não tem modelo, por
+# isso cada teste cria só as tabelas que usa)
+PDI_TABLES = STUDENT_TABLES + (
+    "pdi", "pdi_metas", "pdi_tarefas", "pdi_projetos", "pdi_entregaveis",
+    "pdi_tecnologias", "pdi_projeto_tecnologias", "pdi_outbox", "pdi_progress_events",
+)
+
+# Tabelas de arquivo dos PDIs (ver models/PDI/archive_model.py)
+PDI_ARCHIVE_TABLES = (
+    "pdi_archive", "pdi_metas_archive", "pdi_tarefas_archive",
+    "pdi_projetos_archive", "pdi_entregaveis_archive",
+)
+
+
+def seed_student(session):
+    from models.StudentModel import Student
+    session.add(Student(course="cc", enrollment_year=2024))
+
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    """Monta o app num SQLite temporário com só as tabelas ``tables``.
+
+    ``tables`` aceita nomes ou objetos ``Table``; ``seed(session)`` grava os
+    dados iniciais e ``env`` sobrescreve variáveis de ambiente. Com
+    ``identity`` o client já manda o Bearer de um access token dessa
+    identidade. O app context fica aberto durante o teste.
+    """
+    contexts = []
+
+    def make(tables, seed=None, identity="1", env=None):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+        monkeypatch.setenv("API_RESPONSE_VALIDATION", "off")
+        monkeypatch.setenv("RATELIMIT_ENABLED", "false")
+        for key, value in (env or {}).items():
+            monkeypatch.setenv(key, value)
+
+        from app import create_app, db
+        import models  # noqa: F401
+        import models.registrations  # noqa: F401
+        import models.TodoModel  # noqa: F401
+        import models.WeeklyFormModel  # noqa: F401
+        from models.PDI import archive_model  # noqa: F401
+
+        app = create_app()
+        context = app.app_context()
+        context.push()
+        contexts.append(context)
+
+        # revoked_tokens: toda rota com JWT consulta a blocklist
+        db.metadata.create_all(db.engine, tables=[
+            db.metadata.tables[table] if isinstance(table, str) else table
+            for table in ("revoked_tokens", *tables)
+        ])
+        if seed is not None:
+            seed(db.session)
+            db.session.commit()
+
+        client = app.test_client()
+        if identity is not None:
+            token = create_access_token(identity=identity)
+            client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        return client
+
+    yield make
+
+    from app import db, progress_history
+    for context in reversed(contexts):
+        # o buffer é global: grava agora, no banco deste teste
+        progress_history.flush()
+        db.session.remove()
+        db.engine.dispose()
+        context.pop()
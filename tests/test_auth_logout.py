@@ -0,0 +1,44 @@
+# tests/test_auth_logout.py
+# Logout derruba o par access/refresh, com qualquer um dos dois tokens
+import pytest
+
+
+def _seed_user(session):
+    from models.RoleModel import Role
+    from models.UserModel import User
+
+    session.add(Role(name="user"))
+    session.flush()
+    user = User(username="ana", email="ana@example.com")
+    user.password = "segredo"
+    session.add(user)
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(("role", "user"), seed=_seed_user, identity=None)
+
+
+def _login(client):
+    return client.post("/api/auth/login", json={"username": "ana", "password": "segredo"}).json
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_logout_with_access_token_revokes_refresh(client):
+    tokens = _login(client)
+    assert client.post("/api/auth/logout", headers=_bearer(tokens["access_token"])).status_code == 200
+
+    assert client.post("/api/auth/refresh", headers=_bearer(tokens["refresh_token"])).status_code == 401
+
+
+def test_logout_with_refresh_token_revokes_derived_access_tokens(client):
+    tokens = _login(client)
+    refreshed = client.post("/api/auth/refresh", headers=_bearer(tokens["refresh_token"])).json
+    assert client.post("/api/auth/logout", headers=_bearer(tokens["refresh_token"])).status_code == 200
+
+    for access_token in (tokens["access_token"], refreshed["access_token"]):
+        response = client.post("/api/auth/logout", headers=_bearer(access_token))
+        assert response.status_code == 401
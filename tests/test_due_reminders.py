@@ -0,0 +1,63 @@
+# tests/test_due_reminders.py
+# Lembrete de prazo disparado: gravado uma vez, no outbox e na caixa do estudante
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import PDI_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(
+        PDI_TABLES + ("pdi_due_reminders",), seed=seed_student,
+        env={"WEBHOOK_URL": "http://hooks.invalid/pdi"},
+    )
+
+
+@pytest.fixture
+def scheduler(client):
+    from utils.due_scheduler import DueScheduler
+
+    # desligado (DUE_SCHEDULER_ENABLED=false): sem thread, o teste dispara
+    return DueScheduler(client.application)
+
+
+def _tarefa_due(client, hours):
+    due = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(hours=hours)
+    pdi = client.post("/api/pdi/", json={"title": "pdi", "student_id": 1}).json
+    meta = client.post(f"/api/pdi/{pdi['id']}/metas", json={"pdi_id": pdi["id"], "title": "m"}).json
+    tarefa = client.post(f"/api/pdi/metas/{meta['id']}/tarefas", json={
+        "meta_id": meta["id"], "pdi_id": pdi["id"], "title": "entregar", "data_prevista": due.isoformat(),
+    }).json
+    return tarefa, due
+
+
+def test_reminder_reaches_outbox_and_inbox_once(client, scheduler):
+    from app import db
+    from models.PDI import OutboxEvent
+    from utils.due_scheduler import due_reminder
+
+    tarefa, due = _tarefa_due(client, 2)
+    scheduler._push("tarefa", tarefa["id"], tarefa["pdi_id"], "entregar", due.timestamp())
+    item = ("tarefa", tarefa["id"], tarefa["pdi_id"], "entregar", due.timestamp())
+
+    sent = []
+    receiver = lambda sender, **kwargs: sent.append(kwargs["reminder"])  # noqa: E731
+    with due_reminder.connected_to(receiver):
+        scheduler._fire("upcoming", item)
+        # outro worker com o mesmo item no heap: já reivindicado
+        scheduler._fire("upcoming", item)
+    assert sent == ["upcoming"]
+
+    events = db.session.scalars(db.select(OutboxEvent)).all()
+    assert [(e.event_type, e.entity_id) for e in events] == [("tarefa.due_upcoming", tarefa["id"])]
+    assert events[0].payload["pdi_id"] == tarefa["pdi_id"]
+
+    response = client.get("/api/pdi/students/1/reminders")
+    assert response.status_code == 200
+    [reminder] = response.json["reminders"]
+    assert (reminder["kind"], reminder["item_id"], reminder["reminder"]) == ("tarefa", tarefa["id"], "upcoming")
+    assert reminder["title"] == "entregar"
+
+    assert client.get("/api/pdi/students/2/reminders").json["reminders"] == []
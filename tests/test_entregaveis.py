@@ -0,0 +1,67 @@
+# tests/test_entregaveis.py
+# Upsert em lote dos entregáveis e o progresso do projeto que sai deles
+import pytest
+
+from conftest import PDI_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(PDI_TABLES, seed=seed_student)
+
+
+@pytest.fixture
+def projeto(client):
+    pdi = client.post("/api/pdi/", json={"title": "pdi", "student_id": 1}).json
+    return client.post(
+        f"/api/pdi/{pdi['id']}/projetos", json={"pdi_id": pdi["id"], "title": "app"}
+    ).json
+
+
+def _upsert(client, projeto, *entregaveis):
+    return client.put(
+        f"/api/pdi/projetos/{projeto['id']}/entregaveis", json={"entregaveis": list(entregaveis)}
+    )
+
+
+@pytest.mark.parametrize("field, value", [
+    ("status", "bogus"), ("status", None), ("tipo", "video"), ("tipo", None),
+])
+def test_upsert_rejects_unknown_or_null_enums(client, projeto, field, value):
+    response = _upsert(client, projeto, {"title": "repo", field: value})
+    assert 400 <= response.status_code < 500
+
+    listed = client.get(f"/api/pdi/projetos/{projeto['id']}/entregaveis")
+    assert listed.status_code == 200
+    assert listed.json == []
+
+
+def test_reupsert_keeps_fields_that_were_not_sent(client, projeto):
+    _upsert(client, projeto, {"title": "repo", "url": "https://a", "status": "approved"})
+
+    response = _upsert(client, projeto, {"title": "repo", "url": "https://b"}, {"title": "demo"})
+    assert response.status_code == 200
+    assert response.json["received"] == 2
+    assert response.json["progress"] == 50
+
+    entregaveis = {item["title"]: item for item in response.json["entregaveis"]}
+    assert entregaveis["repo"]["url"] == "https://b"
+    assert entregaveis["repo"]["status"] == "approved"
+    assert entregaveis["demo"]["status"] == "pending"
+    assert entregaveis["demo"]["tipo"] == "link"
+
+
+def test_projeto_reopens_when_approval_is_withdrawn(client, projeto):
+    from app import db
+    from models.PDI import PDI, Projeto
+
+    response = _upsert(client, projeto, {"title": "repo", "status": "approved"})
+    assert (response.json["progress"], response.json["status"]) == (100, "completed")
+    assert db.session.get(Projeto, projeto["id"]).data_fim is not None
+
+    response = _upsert(client, projeto, {"title": "repo", "status": "rejected"})
+    assert (response.json["progress"], response.json["status"]) == (0, "pending")
+
+    db.session.expire_all()
+    assert db.session.get(Projeto, projeto["id"]).data_fim is None
+    assert db.session.get(PDI, projeto["pdi_id"]).projetos_concluidos == 0
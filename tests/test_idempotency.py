@@ -0,0 +1,85 @@
+# tests/test_idempotency.py
+# Idempotency-Key nas rotas de criação, com o store padrão no banco
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from conftest import PDI_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(PDI_TABLES + ("idempotency_keys",), seed=seed_student)
+
+
+def _create(client, key, title="pdi", student_id=1):
+    return client.post(
+        "/api/pdi/", json={"title": title, "student_id": student_id},
+        headers={"Idempotency-Key": key},
+    )
+
+
+def _pdi_count():
+    from app import db
+    from models.PDI import PDI
+
+    return db.session.scalar(db.select(db.func.count()).select_from(PDI))
+
+
+def test_retry_replays_the_first_response(client):
+    first = _create(client, "k1")
+    retry = _create(client, "k1")
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json == first.json
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert _pdi_count() == 1
+
+    assert _create(client, "k1", title="outro").status_code == 422
+
+
+def test_error_response_releases_the_key(client):
+    assert _create(client, "k2", student_id=999).status_code == 404
+    assert _create(client, "k2").status_code == 201
+    assert _pdi_count() == 1
+
+
+def test_stale_reservation_from_a_dead_worker_is_taken_over(client):
+    from app import db
+    from models.IdempotencyKeyModel import IdempotencyKey
+
+    # reserva de um worker que morreu antes de salvar a resposta
+    db.session.add(IdempotencyKey(
+        key="1:POST:/api/pdi/:k3", record=None,
+        expires_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+    ))
+    db.session.commit()
+
+    assert _create(client, "k3").status_code == 201
+    assert _pdi_count() == 1
+
+    db.session.expire_all()
+    assert db.session.get(IdempotencyKey, "1:POST:/api/pdi/:k3").record["status"] == 201
+
+
+def test_memory_store_refused_with_several_workers(make_client):
+    with pytest.raises(RuntimeError, match="IDEMPOTENCY_STORAGE_URL"):
+        make_client((), env={"IDEMPOTENCY_STORAGE_URL": "memory://", "WEB_CONCURRENCY": "3"})
+
+
+def test_duplicate_of_a_request_in_flight_gets_409(client):
+    from app import db
+    from models.IdempotencyKeyModel import IdempotencyKey
+
+    # outro worker reservou a chave e ainda está executando
+    db.session.add(IdempotencyKey(
+        key="1:POST:/api/pdi/:k4", record=None,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=60),
+    ))
+    db.session.commit()
+    client.application.config["IDEMPOTENCY_WAIT_SECONDS"] = 0.1
+
+    response = _create(client, "k4")
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert _pdi_count() == 0
@@ -0,0 +1,72 @@
+# tests/test_leaderboard.py
+# Leaderboard em memória: conclusões durante a remontagem contam uma vez
+import os
+
+import pytest
+
+from conftest import PDI_ARCHIVE_TABLES, PDI_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client, monkeypatch):
+    import app
+    from utils.leaderboard import Leaderboard
+
+    client = make_client(PDI_TABLES + PDI_ARCHIVE_TABLES, seed=seed_student)
+    board = Leaderboard(client.application)
+    board._pid = os.getpid()  # sem a thread: o teste chama rebuild()
+    monkeypatch.setattr(app, "leaderboard", board)
+    return client
+
+
+@pytest.fixture
+def board(client):
+    import app
+    return app.leaderboard
+
+
+def _tarefa(client, pontos):
+    pdi = client.post("/api/pdi/", json={"title": "pdi", "student_id": 1}).json
+    meta = client.post(f"/api/pdi/{pdi['id']}/metas", json={"pdi_id": pdi["id"], "title": "m"}).json
+    return client.post(f"/api/pdi/metas/{meta['id']}/tarefas", json={
+        "meta_id": meta["id"], "pdi_id": pdi["id"], "title": "t", "pontos": pontos,
+    }).json
+
+
+def _complete(client, tarefa):
+    assert client.put(f"/api/pdi/tarefas/{tarefa['id']}/complete").status_code == 200
+
+
+def test_completion_is_counted_once_across_rebuilds(client, board):
+    board.rebuild()
+    _complete(client, _tarefa(client, 10))
+    assert board.ranking("all") == [(1, 10)]
+
+    # ainda depois da marca: fora do banco lido, reaplicada da memória
+    board.rebuild()
+    assert board.ranking("all") == [(1, 10)]
+
+    # marca depois da conclusão: vem do banco e não é reaplicada
+    client.application.config["LEADERBOARD_COMMIT_GRACE_SECONDS"] = -1
+    board.rebuild()
+    assert board.ranking("all") == [(1, 10)]
+    assert board.ranking("weekly") == [(1, 10)]
+
+
+def test_completion_during_rebuild_is_not_lost(client, board, monkeypatch):
+    board.rebuild()
+    first, second = _tarefa(client, 10), _tarefa(client, 5)
+    _complete(client, first)
+
+    build = board._build
+
+    def build_then_complete(period, now, hwm):
+        result = build(period, now, hwm)
+        if period == "weekly":
+            _complete(client, second)  # concluída enquanto a montagem roda
+        return result
+
+    monkeypatch.setattr(board, "_build", build_then_complete)
+    board.rebuild()
+    assert board.ranking("all") == [(1, 15)]
+    assert board.ranking("monthly") == [(1, 15)]
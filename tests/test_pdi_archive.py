@@ -0,0 +1,30 @@
+# tests/test_pdi_archive.py
+# Arquivamento de PDIs: ids arquivados não podem voltar para PDIs novos
+import pytest
+
+from conftest import PDI_ARCHIVE_TABLES, PDI_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(PDI_TABLES + PDI_ARCHIVE_TABLES, seed=seed_student)
+
+
+def test_new_pdi_does_not_reuse_archived_id(client):
+    from models.PDI.archive_model import archive_batch
+
+    archived = client.post("/api/pdi/", json={"title": "antigo", "student_id": 1}).json
+    client.put(f"/api/pdi/{archived['id']}", json={"status": "archived"})
+    assert archive_batch() == 1
+
+    created = client.post("/api/pdi/", json={"title": "novo", "student_id": 1})
+    assert created.status_code == 201
+    assert created.json["id"] != archived["id"]
+
+    old = client.get(f"/api/pdi/{archived['id']}").json
+    assert old["archived"] is True
+    assert old["title"] == "antigo"
+
+    # Arquivar o novo não colide com o que já está em pdi_archive
+    client.put(f"/api/pdi/{created.json['id']}", json={"status": "archived"})
+    assert archive_batch() == 1
@@ -0,0 +1,63 @@
+# tests/test_progress_history.py
+# Histórico de progresso: a leitura junta o buffer em memória sem gravá-lo
+import pytest
+
+from conftest import PDI_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(PDI_TABLES, seed=seed_student)
+
+
+def _meta(client):
+    pdi = client.post("/api/pdi/", json={"title": "pdi", "student_id": 1}).json
+    meta = client.post(f"/api/pdi/{pdi['id']}/metas", json={"pdi_id": pdi["id"], "title": "m"}).json
+    client.post(f"/api/pdi/metas/{meta['id']}/tarefas", json={
+        "meta_id": meta["id"], "pdi_id": pdi["id"], "title": "t1",
+    })
+    tarefa = client.post(f"/api/pdi/metas/{meta['id']}/tarefas", json={
+        "meta_id": meta["id"], "pdi_id": pdi["id"], "title": "t2",
+    }).json
+    return pdi, meta, tarefa
+
+
+def _history(client, pdi_id):
+    return [(e["entity_type"], e["progress"]) for e in client.get(f"/api/pdi/{pdi_id}/history").json["events"]]
+
+
+def test_history_merges_buffer_without_flushing(client, monkeypatch):
+    from app import progress_history
+
+    pdi, meta, tarefa = _meta(client)
+    progress_history.flush()
+
+    def no_flush():
+        raise AssertionError("a leitura não deve gravar o buffer")
+
+    with monkeypatch.context() as patch:
+        # a thread de fundo também falha (e loga): o buffer fica na memória
+        patch.setattr(progress_history, "flush", no_flush)
+        assert client.put(f"/api/pdi/tarefas/{tarefa['id']}/complete").status_code == 200
+        assert progress_history.pending(student_id=1)
+        buffered = _history(client, pdi["id"])
+    assert ("pdi", 50) in buffered
+
+    # gravado: mesmo histórico, sem duplicar
+    progress_history.flush()
+    assert _history(client, pdi["id"]) == buffered
+
+
+def test_meta_of_deleted_pdi_records_nothing(client):
+    from app import db, progress_history
+    from models.PDI import PDI, Meta
+
+    pdi, meta, _ = _meta(client)
+    progress_history.flush()
+    meta = db.session.get(Meta, meta["id"])
+    # outra requisição apaga o PDI (e a meta, em cascata) no meio do caminho
+    with db.engine.begin() as connection:
+        connection.execute(db.delete(PDI).where(PDI.id == pdi["id"]))
+
+    meta._record_progress(50, "in_progress")
+    assert progress_history.pending(entity_type="meta", entity_id=meta.id) == []
@@ -0,0 +1,68 @@
+# tests/test_progress_rollup.py
+# Concluir tarefa recalcula meta e PDI no banco (média ponderada por peso)
+import pytest
+
+from conftest import PDI_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(PDI_TABLES, seed=seed_student)
+
+
+def _plan(client):
+    pdi = client.post("/api/pdi/", json={"title": "pdi", "student_id": 1}).json
+    metas, tarefas = [], []
+    for peso, n_tarefas in ((3, 2), (1, 1)):
+        meta = client.post(f"/api/pdi/{pdi['id']}/metas", json={
+            "pdi_id": pdi["id"], "title": f"peso {peso}", "peso": peso,
+        }).json
+        metas.append(meta)
+        tarefas.append([
+            client.post(f"/api/pdi/metas/{meta['id']}/tarefas", json={
+                "meta_id": meta["id"], "pdi_id": pdi["id"], "title": f"t{i}",
+            }).json
+            for i in range(n_tarefas)
+        ])
+    return pdi, metas, tarefas
+
+
+def _state(pdi_id):
+    from app import db
+    from models.PDI import PDI, Meta
+
+    db.session.expire_all()
+    pdi = db.session.get(PDI, pdi_id)
+    metas = db.session.scalars(db.select(Meta).where(Meta.pdi_id == pdi_id).order_by(Meta.id)).all()
+    return (pdi.progress, pdi.status), [(meta.progress, meta.status) for meta in metas]
+
+
+def _complete(client, tarefa):
+    assert client.put(f"/api/pdi/tarefas/{tarefa['id']}/complete").status_code == 200
+
+
+def test_completion_rolls_up_to_meta_and_weighted_pdi(client):
+    pdi, _, (heavy, light) = _plan(client)
+
+    _complete(client, heavy[0])
+    assert _state(pdi["id"]) == ((37, "in_progress"), [(50, "in_progress"), (0, "pending")])
+
+    _complete(client, light[0])
+    assert _state(pdi["id"]) == ((62, "in_progress"), [(50, "in_progress"), (100, "completed")])
+
+    _complete(client, heavy[1])
+    assert _state(pdi["id"]) == ((100, "completed"), [(100, "completed"), (100, "completed")])
+
+
+def test_repeated_completion_does_not_touch_meta_or_pdi(client):
+    from app import db
+    from models.PDI import PDI
+
+    pdi, _, (heavy, _) = _plan(client)
+    _complete(client, heavy[0])
+    before = _state(pdi["id"])
+    last_update = db.session.get(PDI, pdi["id"]).last_update
+
+    _complete(client, heavy[0])
+    assert _state(pdi["id"]) == before
+    assert db.session.get(PDI, pdi["id"]).last_update == last_update
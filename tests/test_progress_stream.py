@@ -0,0 +1,41 @@
+# tests/test_progress_stream.py
+# Streams SSE de progresso: cada conexão prende uma thread do worker
+import pytest
+
+from conftest import STUDENT_TABLES
+
+
+@pytest.fixture
+def stream(make_client):
+    from app import progress_stream
+
+    make_client(STUDENT_TABLES, env={"GUNICORN_THREADS": "4"})
+    return progress_stream
+
+
+def test_subscribers_capped_at_half_the_worker_threads(stream):
+    first = stream.subscribe("student:1")
+    second = stream.subscribe("mentor:2")
+    assert first is not None and second is not None
+    assert stream.subscribe("student:3") is None
+
+    stream.unsubscribe(first)
+    third = stream.subscribe("student:3")
+    assert third is not None
+
+    stream.unsubscribe(second)
+    stream.unsubscribe(third)
+
+
+def test_publish_reaches_only_matching_channels(stream):
+    student = stream.subscribe("student:1")
+    mentor = stream.subscribe("mentor:2")
+
+    event = {"type": "pdi", "pdi_id": 7, "meta_id": None, "progress": 50, "status": "in_progress"}
+    stream.publish(event, student_id=1, mentor_id=3)
+
+    assert student.get(0) == ([event], False)
+    assert mentor.get(0) == ([], False)
+
+    stream.unsubscribe(student)
+    stream.unsubscribe(mentor)
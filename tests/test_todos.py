@@ -0,0 +1,55 @@
+# tests/test_todos.py
+# Todos: edição parcial (title não aceita null) e contadores do estudante
+import pytest
+
+from conftest import STUDENT_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(STUDENT_TABLES + ("todo",), seed=seed_student)
+
+
+def test_edit_rejects_null_title(client):
+    todo = client.post("/api/todos/", json={"student_id": 1, "title": "ler"}).json
+
+    response = client.put(f"/api/todos/{todo['id']}", json={"title": None})
+    assert 400 <= response.status_code < 500
+
+    edited = client.put(f"/api/todos/{todo['id']}", json={"description": "cap. 1"})
+    assert edited.status_code == 200
+    assert edited.json["title"] == "ler"
+    assert edited.json["description"] == "cap. 1"
+
+
+def _counters():
+    from app import db
+    from models.StudentModel import Student
+
+    db.session.expire_all()
+    student = db.session.get(Student, 1)
+    return student.total_todos, student.completed_todos
+
+
+def test_counters_follow_create_toggle_and_delete(client):
+    done = client.post("/api/todos/", json={"student_id": 1, "title": "a", "done": True}).json
+    first = client.post("/api/todos/", json={"student_id": 1, "title": "b"}).json
+    second = client.post("/api/todos/", json={"student_id": 1, "title": "c"}).json
+    assert _counters() == (3, 1)
+
+    # já feito fica de fora do UPDATE e não conta de novo
+    ids = [done["id"], first["id"], second["id"]]
+    toggled = client.post("/api/todos/toggle", json={"ids": ids, "done": True}).json
+    assert sorted(toggled["changed"]) == sorted([first["id"], second["id"]])
+    assert _counters() == (3, 3)
+    assert client.post("/api/todos/toggle", json={"ids": ids, "done": True}).json["changed"] == []
+    assert _counters() == (3, 3)
+
+    client.post("/api/todos/toggle", json={"ids": [second["id"]], "done": False})
+    assert _counters() == (3, 2)
+
+    assert client.delete(f"/api/todos/{done['id']}").status_code == 200
+    assert client.delete(f"/api/todos/{second['id']}").status_code == 200
+    assert _counters() == (1, 1)
+    assert client.delete(f"/api/todos/{second['id']}").status_code == 404
+    assert _counters() == (1, 1)
@@ -0,0 +1,46 @@
+# tests/test_token_blocklist.py
+# Blocklist de tokens: o store padrão é a tabela revoked_tokens, comum a
+# todos os workers
+import time
+
+import pytest
+
+
+@pytest.fixture
+def blocklist(make_client):
+    from app import token_blocklist
+
+    make_client(())
+    return token_blocklist
+
+
+def test_revocation_from_another_worker_is_seen_after_sync(blocklist):
+    from utils.token_blocklist import DatabaseStore
+
+    assert not blocklist.is_revoked("outro-worker")
+
+    # outro processo grava direto no banco; este só sabe depois do sync
+    DatabaseStore().add("outro-worker", time.time() + 60)
+    blocklist.sync()
+    assert blocklist.is_revoked("outro-worker")
+
+
+def test_expired_revocations_are_ignored_and_pruned(blocklist):
+    from app import db
+    from models.RevokedTokenModel import RevokedToken
+
+    blocklist.revoke("vencido", time.time() - 1)
+    blocklist.revoke("valendo", time.time() + 60)
+    blocklist.revoke("para-sempre")
+
+    assert not blocklist.is_revoked("vencido")
+    assert blocklist.is_revoked("valendo")
+    assert blocklist.is_revoked("para-sempre")
+
+    blocklist.sync()
+    assert set(db.session.scalars(db.select(RevokedToken.jti))) == {"valendo", "para-sempre"}
+
+
+def test_memory_store_refused_with_several_workers(make_client):
+    with pytest.raises(RuntimeError, match="BLOCKLIST_STORAGE_URL"):
+        make_client((), env={"BLOCKLIST_STORAGE_URL": "memory://", "WEB_CONCURRENCY": "3"})
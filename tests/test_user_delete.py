@@ -0,0 +1,78 @@
+# tests/test_user_delete.py
+# Apagar usuário com DELETE em Core: o banco leva o estudante e os PDIs junto
+import os
+
+
+from conftest import PDI_TABLES
+
+MIGRATIONS = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+def _seed(session):
+    from models.PDI import PDI
+    from models.RoleModel import Role
+    from models.StudentModel import Student
+    from models.UserModel import User
+
+    admin_role = Role(name="admin", can_manage_users=True)
+    session.add_all([Role(name="user"), admin_role])
+    session.flush()
+    admin = User(username="admin", email="admin@example.com", role=admin_role)
+    bia = User(username="bia", email="bia@example.com")
+    session.add_all([admin, bia])
+    session.flush()
+    student = Student(user_id=bia.id, course="cc", enrollment_year=2024)
+    session.add(student)
+    session.flush()
+    session.add(PDI(title="pdi", student_id=student.id))
+
+
+def _counts():
+    from app import db
+    from models.PDI import PDI
+    from models.StudentModel import Student
+
+    return (
+        db.session.scalar(db.select(db.func.count()).select_from(Student)),
+        db.session.scalar(db.select(db.func.count()).select_from(PDI)),
+    )
+
+
+def test_delete_user_removes_student_and_pdis(make_client):
+    from app import db
+    from models.UserModel import User
+
+    client = make_client(PDI_TABLES, seed=_seed, identity="admin")
+    bia = db.session.scalar(db.select(User).where(User.username == "bia"))
+
+    assert client.delete(f"/api/users/{bia.id}").status_code == 200
+    assert _counts() == (0, 0)
+
+
+def test_migration_adds_cascade_to_existing_student_table(make_client):
+    from flask_migrate import upgrade
+    from sqlalchemy.schema import CreateTable
+    from app import db
+
+    client = make_client(("role", "user"), identity="admin")
+    tables = db.metadata.tables
+    # student como nos bancos antigos: FK para user sem ON DELETE CASCADE
+    old_student = str(CreateTable(tables["student"]).compile(db.engine)).replace("ON DELETE CASCADE", "")
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(old_student)
+        connection.exec_driver_sql(
+            "CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"
+        )
+        connection.exec_driver_sql("INSERT INTO alembic_version VALUES ('2e8cfd7ee687')")
+    db.metadata.create_all(db.engine, tables=[tables[name] for name in PDI_TABLES[3:]])
+    _seed(db.session)
+    db.session.commit()
+
+    db.session.remove()
+    upgrade(directory=MIGRATIONS)
+    # a tabela foi recriada: os PDIs dos estudantes continuam lá
+    assert _counts() == (1, 1)
+
+    bia = db.session.scalar(db.text("SELECT id FROM user WHERE username = 'bia'"))
+    assert client.delete(f"/api/users/{bia}").status_code == 200
+    assert _counts() == (0, 0)
@@ -0,0 +1,71 @@
+# tests/test_user_import.py
+# Importação de usuários em background: 202 na hora, resultado no job
+import time
+
+import pytest
+
+
+def _seed_admin(session):
+    from models.RoleModel import Role
+    from models.UserModel import User
+
+    admin_role = Role(name="admin", can_manage_users=True)
+    session.add_all([Role(name="user"), admin_role])
+    session.flush()
+    admin = User(username="admin", email="admin@example.com", role=admin_role)
+    admin.password = "segredo"
+    session.add(admin)
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(("role", "user", "user_imports"), seed=_seed_admin, identity="admin")
+
+
+def _wait(client, location, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(location).json
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"importação não terminou: {job}")
+
+
+def test_import_runs_in_background_and_reports_per_row(client):
+    from app import db
+    from models.UserModel import User
+
+    response = client.post("/api/users/import", json={"users": [
+        {"username": "bia", "email": "bia@example.com", "password": "s1"},
+        {"username": "caio", "email": "admin@example.com", "password": "s2"},
+        {"username": "duda", "password": "s3"},
+    ]})
+    assert response.status_code == 202
+    assert response.json["status"] in ("queued", "running", "done")
+    assert response.json["received"] == 3
+
+    job = _wait(client, response.headers["Location"])
+    assert job["status"] == "done"
+    assert (job["created"], job["failed"]) == (1, 2)
+    assert [row["status"] for row in job["results"]] == ["created", "duplicate", "invalid"]
+
+    db.session.expire_all()
+    bia = db.session.scalars(db.select(User).filter_by(username="bia")).one()
+    assert bia.verify_password("s1")
+    assert bia.role.name == "user"
+
+
+def test_import_status_requires_user_management(client):
+    from app import db
+    from models.RoleModel import Role
+    from models.UserModel import User
+
+    response = client.post("/api/users/import", json={"users": []})
+    location = response.headers["Location"]
+    _wait(client, location)
+
+    admin = db.session.scalars(db.select(User).filter_by(username="admin")).one()
+    admin.role = db.session.scalars(db.select(Role).filter_by(name="user")).one()
+    db.session.commit()
+    assert client.get(location).status_code == 403
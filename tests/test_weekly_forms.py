@@ -0,0 +1,43 @@
+# tests/test_weekly_forms.py
+# Envio de formulários semanais: reenvio aplica só a diferença nos somatórios
+import pytest
+
+from conftest import STUDENT_TABLES, seed_student
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(
+        STUDENT_TABLES + ("weekly_form", "weekly_form_student_totals", "weekly_form_cohort_rollup"),
+        seed=seed_student,
+    )
+
+
+def _form(week, mood, dedication, student_id=1):
+    return {"student_id": student_id, "week": week, "mood": mood, "dedication": dedication}
+
+
+def test_resubmit_replaces_form_and_applies_delta(client):
+    from app import db
+    from models.WeeklyFormModel import WeeklyForm, WeeklyStudentTotals
+
+    first = client.post("/api/weekly-forms/bulk", json={"forms": [
+        _form("2026-10-05", 3, 4),
+        _form("2026-10-12", 5, 5),
+        _form("2026-10-13", 1, 1),  # mesma semana: o último vence
+        _form("2026-10-12", 2, 2, student_id=99),
+    ]}).json
+    assert (first["created"], first["updated"], len(first["errors"])) == (2, 0, 1)
+
+    second = client.post("/api/weekly-forms/bulk", json={"forms": [
+        _form("2026-10-05", 4, 2),
+        _form("2026-10-19", 2, 3),
+    ]}).json
+    assert (second["created"], second["updated"]) == (1, 1)
+
+    db.session.expire_all()
+    assert db.session.scalar(db.select(db.func.count()).select_from(WeeklyForm)) == 3
+    totals = db.session.get(WeeklyStudentTotals, 1)
+    assert totals.forms_count == 3
+    assert totals.mood_sum == 4 + 1 + 2
+    assert totals.dedication_sum == 2 + 1 + 3
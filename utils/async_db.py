@@ -0,0 +1,113 @@
+# utils/async_db.py
+import asyncio
+import os
+import threading
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Driver assíncrono usado para cada banco quando ASYNC_DATABASE_URL não é dado
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def async_url(url):
+    """Troca o driver da URL síncrona pelo equivalente assíncrono"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Sem driver assíncrono conhecido para '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+class AsyncDatabase:
+    """Engine assíncrono do SQLAlchemy para as views ``async def``.
+
+    O Flask roda cada view assíncrona num event loop novo, e uma conexão
+    aberta num loop não pode ser usada em outro. Por isso o engine vive num
+    event loop próprio, numa thread por processo, com um pool pequeno
+    (``ASYNC_DB_POOL_SIZE`` + ``ASYNC_DB_MAX_OVERFLOW``): a view entrega as
+    consultas a esse loop e espera o resultado. As conexões sobrevivem entre
+    requisições, então cada consulta não paga um handshake TCP + autenticação
+    no PostgreSQL; cada consulta de ``gather`` ainda usa a sua conexão do
+    pool, o que permite rodá-las ao mesmo tempo.
+
+    A URL vem de ``ASYNC_DATABASE_URL`` ou é derivada de
+    ``SQLALCHEMY_DATABASE_URI`` (``sqlite://`` vira ``sqlite+aiosqlite://``).
+    Bancos SQLite em memória não funcionam aqui: cada conexão veria um
+    banco vazio diferente.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._engine = None
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("ASYNC_DATABASE_URL", None)
+        app.config.setdefault("ASYNC_DB_POOL_SIZE", 5)
+        app.config.setdefault("ASYNC_DB_MAX_OVERFLOW", 10)
+        app.extensions["async_db"] = self
+        self.app = app
+
+    def _ensure_process(self):
+        # loop e engine por processo: os de antes do fork não valem no worker
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Importado aqui: sqlalchemy.ext.asyncio pesa no cold start e só
+            # as views assíncronas precisam dele
+            try:
+                from sqlalchemy.ext.asyncio import create_async_engine
+            except ImportError as e:  # pragma: no cover - SQLAlchemy sem extras de asyncio
+                raise RuntimeError("SQLAlchemy sem suporte a asyncio") from e
+            url = make_url(self.app.config["ASYNC_DATABASE_URL"] or async_url(
+                self.app.config["SQLALCHEMY_DATABASE_URI"]
+            ))
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-db", daemon=True).start()
+            # Pool explícito: o padrão do aiosqlite é NullPool
+            self._engine = create_async_engine(
+                url,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=self.app.config["ASYNC_DB_POOL_SIZE"],
+                max_overflow=self.app.config["ASYNC_DB_MAX_OVERFLOW"],
+                pool_pre_ping=True,
+            )
+            self._loop = loop
+            self._pid = os.getpid()
+
+    @property
+    def engine(self):
+        self._ensure_process()
+        return self._engine
+
+    def submit(self, coroutine):
+        """Agenda a coroutine no loop do engine; devolve um ``concurrent.futures.Future``"""
+        self._ensure_process()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def _fetch_all(self, statement):
+        async with self._engine.connect() as connection:
+            result = await connection.execute(statement)
+            return result.mappings().all()
+
+    async def _gather(self, statements):
+        return await asyncio.gather(*(self._fetch_all(statement) for statement in statements))
+
+    async def fetch_all(self, statement):
+        """Executa uma consulta e devolve as linhas como mappings"""
+        return await asyncio.wrap_future(self.submit(self._fetch_all(statement)))
+
+    async def gather(self, *statements):
+        """Executa consultas independentes em paralelo, uma conexão cada"""
+        return await asyncio.wrap_future(self.submit(self._gather(statements)))
@@ -0,0 +1,59 @@
+# utils/database.py
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Liga a verificação de chaves estrangeiras no SQLite.
+
+    Sem o PRAGMA o SQLite ignora os ``ondelete="CASCADE"`` das FKs, e os
+    deletes em massa deixariam metas, tarefas e projetos órfãos.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def upsert(table, rows, index_elements, increment=(), replace=(), connection=None, returning=()):
+    """INSERT ... ON CONFLICT DO UPDATE em lote (SQLite e PostgreSQL).
+
+    Em conflito nas colunas ``index_elements``, as colunas de ``increment``
+    são somadas ao valor atual (``col = col + excluded.col``) e as de
+    ``replace`` são sobrescritas. A soma acontece no banco, então dois
+    workers atualizando a mesma linha não perdem incrementos.
+
+    ``connection`` executa fora da sessão (ex. em eventos do mapper, que
+    recebem a conexão do flush em andamento). Devolve o resultado do
+    execute (``rowcount`` diz quantas linhas entraram ou mudaram); com
+    ``returning`` o resultado traz essas colunas das linhas inseridas ou
+    atualizadas (em DO NOTHING, só das que entraram).
+    """
+    from app import db
+
+    if not rows:
+        return
+
+    executor = db.session if connection is None else connection
+    dialect = db.session.get_bind().dialect.name if connection is None else connection.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"upsert não suportado para {dialect}")
+
+    stmt = insert(table)
+    set_ = {name: table.c[name] + stmt.excluded[name] for name in increment}
+    set_.update({name: stmt.excluded[name] for name in replace})
+    if set_:
+        stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+    if returning:
+        stmt = stmt.returning(*returning)
+
+    return executor.execute(stmt, rows)
@@ -0,0 +1,273 @@
+# utils/due_scheduler.py
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask.signals import Namespace
+from sqlalchemy import event
+
+_signals = Namespace()
+
+# Disparado com kind ("tarefa" | "meta" | "pdi"), id, pdi_id, title, due e
+# reminder ("upcoming" antes do prazo, "overdue" no prazo), depois que o
+# lembrete foi gravado (``pdi_due_reminders``, lido em /students/<id>/reminders)
+# e posto no outbox dos webhooks. Para quem quiser reagir também no processo.
+due_reminder = _signals.signal("due-reminder")
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class DueScheduler:
+    """Lembretes de prazo de tarefas, metas e PDIs sem varrer o banco.
+
+    Mantém um min-heap com os próximos disparos. Na subida o heap é montado
+    com uma consulta por faixa de datas (índices de ``data_prevista``,
+    ``data_fim_previsto`` e ``deadline``) cobrindo só o horizonte configurado;
+    a cada meio horizonte a janela avança com outra consulta por faixa.
+    Inserts e updates dos modelos atualizam o heap direto pelos eventos do
+    SQLAlchemy; quem grava com UPDATE em Core (sem eventos) chama ``notify``
+    depois do commit, e status e prazo são conferidos no banco antes de cada
+    disparo. Entradas antigas não são removidas do heap: ficam obsoletas e
+    são ignoradas quando chegam ao topo.
+
+    Cada processo roda o seu (threads não atravessam o fork: com o app
+    pré-carregado os workers nascem com uma cópia do heap e nenhuma thread),
+    subindo no ``post_worker_init`` do gunicorn ou na primeira escrita. Os
+    heaps dos workers se sobrepõem; ``claim_reminder`` garante que cada
+    lembrete sai uma vez só. Sair é gravar a linha em ``pdi_due_reminders``
+    (a caixa de lembretes dos clientes) e o evento ``<kind>.due_<reminder>``
+    no outbox, na mesma transação, e então mandar o sinal ``due_reminder``.
+
+    Configuração: ``DUE_SCHEDULER_ENABLED``, ``DUE_SCHEDULER_HORIZON_HOURS`` e
+    ``DUE_REMINDER_LEAD_HOURS`` (antecedência do lembrete "upcoming").
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._heap = []
+        self._due = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stopped = False
+        self._loaded_until = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("DUE_SCHEDULER_ENABLED", False)
+        app.config.setdefault("DUE_SCHEDULER_HORIZON_HOURS", 24)
+        app.config.setdefault("DUE_REMINDER_LEAD_HOURS", 24)
+        app.extensions["due_scheduler"] = self
+        self.app = app
+
+        # Processo único (flask run); sob o gunicorn cada worker sobe o seu
+        self.ensure_started()
+
+    @property
+    def horizon(self):
+        return self.app.config["DUE_SCHEDULER_HORIZON_HOURS"] * 3600
+
+    @property
+    def lead(self):
+        return self.app.config["DUE_REMINDER_LEAD_HOURS"] * 3600
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def ensure_started(self):
+        """Sobe o scheduler neste processo, se ligado e ainda não subiu"""
+        if self.app is None or not self.app.config["DUE_SCHEDULER_ENABLED"]:
+            return
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            _register_model_listeners(self)
+            # Estado novo: o herdado do fork é de outro processo
+            self._cond = threading.Condition()
+            self._heap, self._due = [], {}
+            self._stopped = False
+            # Os notify já valem para a janela inicial; o heap é carregado
+            # pela thread, fora da escrita que pode ter chamado este método
+            self._loaded_until = time.time() + self.horizon + self.lead
+            self._thread = threading.Thread(target=self._run, name="due-scheduler", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        """Para a thread deste processo (ex. no master do gunicorn)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def rebuild(self):
+        """Recarrega o heap a partir do índice de prazos"""
+        now = time.time()
+        with self._cond:
+            self._heap = []
+            self._due = {}
+            self._loaded_until = now
+        self._load_window(now, now + self.horizon + self.lead)
+
+    def _load_window(self, since, until):
+        from models.PDI.due_dates import pending_due_between
+
+        with self.app.app_context():
+            rows = pending_due_between(
+                datetime.fromtimestamp(since, timezone.utc),
+                datetime.fromtimestamp(until, timezone.utc),
+            )
+
+        with self._cond:
+            for row in rows:
+                self._push(row.kind, row.id, row.pdi_id, row.title, _timestamp(row.due))
+            self._loaded_until = max(self._loaded_until, until)
+            self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # Heap
+    # ------------------------------------------------------------------
+
+    def _push(self, kind, item_id, pdi_id, title, due):
+        self._due[(kind, item_id)] = due
+        item = (kind, item_id, pdi_id, title, due)
+        heapq.heappush(self._heap, (due - self.lead, next(self._seq), "upcoming", item))
+        heapq.heappush(self._heap, (due, next(self._seq), "overdue", item))
+
+    def notify(self, kind, item_id, pdi_id, title, due, closed=False):
+        """Chamado nas escritas: agenda, reagenda ou cancela o lembrete"""
+        self.ensure_started()
+        due = _timestamp(due)
+        with self._cond:
+            key = (kind, item_id)
+            if closed or due is None:
+                self._due.pop(key, None)
+                return
+            if self._due.get(key) == due:
+                return
+            if due >= self._loaded_until:
+                # fora da janela carregada: entra quando a janela avançar
+                self._due.pop(key, None)
+                return
+            self._push(kind, item_id, pdi_id, title, due)
+            self._cond.notify()
+
+    def _run(self):
+        self._load_window(time.time(), self._loaded_until)
+        refresh_every = self.horizon / 2
+        next_refresh = time.time() + refresh_every
+
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    _, _, reminder, item = heapq.heappop(self._heap)
+                else:
+                    timeout = next_refresh - now
+                    if self._heap:
+                        timeout = min(timeout, self._heap[0][0] - now)
+                    self._cond.wait(max(timeout, 0))
+                    item = None
+
+            if item is not None:
+                self._fire(reminder, item)
+
+            if time.time() >= next_refresh:
+                since = self._loaded_until
+                self._load_window(since, time.time() + self.horizon + self.lead)
+                self._prune()
+                next_refresh = time.time() + refresh_every
+
+    def _prune(self):
+        """Esquece os lembretes enviados de prazos que já passaram há tempo"""
+        from models.PDI.due_reminder_model import prune_reminders
+
+        before = datetime.fromtimestamp(time.time() - self.horizon - self.lead, timezone.utc)
+        with self.app.app_context():
+            prune_reminders(before)
+
+    def _fire(self, reminder, item):
+        kind, item_id, pdi_id, title, due = item
+        if self._due.get((kind, item_id)) != due:
+            return  # reagendado ou concluído depois de entrar no heap
+
+        if reminder == "overdue":
+            self._due.pop((kind, item_id), None)
+
+        # O item pode ter sido fechado ou reagendado por outro worker (ou por
+        # um UPDATE em Core, sem eventos): confere no banco. Depois reivindica
+        # o lembrete, já que os outros workers têm o mesmo item no heap.
+        from models.PDI.due_dates import is_stale
+        from models.PDI.due_reminder_model import claim_reminder
+        with self.app.app_context():
+            if is_stale(kind, item_id, due):
+                self._due.pop((kind, item_id), None)
+                return
+            claimed = claim_reminder(
+                kind, item_id, reminder, datetime.fromtimestamp(due, timezone.utc), pdi_id, title,
+            )
+            if not claimed:
+                return
+
+        due_reminder.send(
+            self.app,
+            kind=kind,
+            id=item_id,
+            pdi_id=pdi_id,
+            title=title,
+            due=datetime.fromtimestamp(due, timezone.utc),
+            reminder=reminder,
+        )
+
+
+_listeners_registered = False
+
+
+def _register_model_listeners(scheduler):
+    """Liga inserts/updates de Tarefa, Meta e PDI ao scheduler (uma vez só)"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+
+    from models.PDI import PDI, Meta, Tarefa
+    from models.PDI.due_dates import META_CLOSED, PDI_CLOSED, TAREFA_CLOSED
+
+    watched = (
+        (Tarefa, "tarefa", "data_prevista", TAREFA_CLOSED, lambda t: t.pdi_id),
+        (Meta, "meta", "data_fim_previsto", META_CLOSED, lambda m: m.pdi_id),
+        (PDI, "pdi", "deadline", PDI_CLOSED, lambda p: p.id),
+    )
+
+    for model, kind, due_attr, closed_status, pdi_of in watched:
+
+        def on_write(mapper, connection, target, kind=kind, due_attr=due_attr,
+                     closed_status=closed_status, pdi_of=pdi_of):
+            scheduler.notify(
+                kind,
+                target.id,
+                pdi_of(target),
+                target.title,
+                getattr(target, due_attr),
+                closed=target.status in closed_status,
+            )
+
+        event.listen(model, "after_insert", on_write)
+        event.listen(model, "after_update", on_write)
+
+    _listeners_registered = True
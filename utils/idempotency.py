@@ -0,0 +1,281 @@
+# utils/idempotency.py
+import base64
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+
+from utils.cache import TTLCache
+from utils.shared_storage import refuse_per_process
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class MemoryStore:
+    """Respostas por chave em memória, por processo.
+
+    As concluídas ficam num ``TTLCache`` (limite de itens + TTL). As em
+    andamento ficam em ``_inflight`` com um ``threading.Event``: uma
+    duplicata concorrente espera o evento em vez de executar de novo.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._done = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key, wait):
+        """None se a chave foi reservada para esta requisição; senão o registro salvo"""
+        deadline = time.monotonic() + wait
+        while True:
+            with self._lock:
+                record = self._done.get(key)
+                if record is not None:
+                    return record
+                event = self._inflight.get(key)
+                if event is None:
+                    self._inflight[key] = threading.Event()
+                    return None
+            if not event.wait(max(0.0, deadline - time.monotonic())):
+                return {"pending": True}
+            # a original terminou: salvou a resposta ou liberou a chave
+
+    def save(self, key, record):
+        with self._lock:
+            self._done.set(key, record)
+            self._inflight.pop(key).set()
+
+    def release(self, key):
+        with self._lock:
+            self._inflight.pop(key).set()
+
+
+class RedisStore:
+    """Respostas por chave no Redis, compartilhadas entre workers.
+
+    A reserva é um ``SET NX`` com um marcador que expira em
+    ``lock_seconds``, para um worker que morreu no meio não travar a chave
+    para sempre. Duplicatas concorrentes consultam a chave até a resposta
+    aparecer.
+    """
+
+    PENDING = b"pending"
+    POLL_SECONDS = 0.05
+
+    def __init__(self, url, ttl, lock_seconds=60, prefix="idempotency:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("IDEMPOTENCY_STORAGE_URL com redis:// requer o pacote 'redis'") from e
+
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def reserve(self, key, wait):
+        deadline = time.monotonic() + wait
+        while True:
+            if self.client.set(self.prefix + key, self.PENDING, nx=True, ex=self.lock_seconds):
+                return None
+            value = self.client.get(self.prefix + key)
+            if value is not None and value != self.PENDING:
+                return json.loads(value)
+            if time.monotonic() >= deadline:
+                return {"pending": True}
+            time.sleep(self.POLL_SECONDS)
+
+    def save(self, key, record):
+        self.client.set(self.prefix + key, json.dumps(record), ex=int(self.ttl))
+
+    def release(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class DatabaseStore:
+    """Respostas por chave na tabela ``idempotency_keys`` (padrão).
+
+    Mesmo protocolo do ``RedisStore`` sobre o banco do app, compartilhado
+    entre workers: a reserva é um INSERT ... ON CONFLICT DO NOTHING de uma
+    linha sem resposta que trava a chave por ``lock_seconds``; duplicatas
+    consultam a linha até a resposta aparecer. Linha vencida (resposta
+    além do TTL ou reserva de um worker que morreu) é apagada e a chave
+    disputada de novo; ``save`` também apaga as vencidas das outras chaves.
+    Usa conexões próprias, fora da sessão da requisição.
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(self, ttl, lock_seconds=60):
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+
+    def reserve(self, key, wait):
+        from app import db
+        from models.IdempotencyKeyModel import IdempotencyKey
+        from utils.database import upsert
+
+        deadline = time.monotonic() + wait
+        while True:
+            now = datetime.now(timezone.utc)
+            with db.engine.begin() as connection:
+                inserted = upsert(
+                    IdempotencyKey.__table__,
+                    [{"key": key, "record": None,
+                      "expires_at": now + timedelta(seconds=self.lock_seconds)}],
+                    index_elements=["key"], connection=connection,
+                ).rowcount
+                if inserted:
+                    return None
+
+                row = connection.execute(
+                    db.select(IdempotencyKey.record)
+                    .where(IdempotencyKey.key == key, IdempotencyKey.expires_at > now)
+                ).first()
+                if row is None:
+                    connection.execute(
+                        db.delete(IdempotencyKey)
+                        .where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+                    )
+                    continue
+            if row.record is not None:
+                return row.record
+            if time.monotonic() >= deadline:
+                return {"pending": True}
+            time.sleep(self.POLL_SECONDS)
+
+    def save(self, key, record):
+        from app import db
+        from models.IdempotencyKeyModel import IdempotencyKey
+
+        now = datetime.now(timezone.utc)
+        with db.engine.begin() as connection:
+            connection.execute(
+                db.update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(record=record, expires_at=now + timedelta(seconds=self.ttl))
+            )
+            connection.execute(db.delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+
+    def release(self, key):
+        from app import db
+        from models.IdempotencyKeyModel import IdempotencyKey
+
+        with db.engine.begin() as connection:
+            connection.execute(db.delete(IdempotencyKey).where(IdempotencyKey.key == key))
+
+
+def create_store(url, maxsize, ttl):
+    if not url or url.startswith("database://"):
+        return DatabaseStore(ttl)
+    if url.startswith("memory://"):
+        return MemoryStore(maxsize, ttl)
+    if url.startswith(("redis://", "rediss://")):
+        return RedisStore(url, ttl)
+    raise ValueError(f"IDEMPOTENCY_STORAGE_URL não suportada: {url}")
+
+
+def _error(message, status):
+    response = jsonify({"error": message})
+    response.status_code = status
+    return response
+
+
+class Idempotency:
+    """Suporte ao header ``Idempotency-Key`` em rotas de criação.
+
+    A primeira resposta 2xx para (usuário, chave, rota) é guardada e
+    devolvida nas repetições sem executar a view de novo. Respostas de erro
+    não são guardadas: a chave é liberada e o cliente pode tentar outra vez.
+
+    Configuração:
+    - ``IDEMPOTENCY_STORAGE_URL``: ``database://`` (padrão, tabela
+      ``idempotency_keys``), ``redis://...`` ou ``memory://`` (um worker
+      só: com vários uma repetição que cai em outro worker criaria o
+      recurso de novo, então o app não sobe);
+    - ``IDEMPOTENCY_TTL_SECONDS``: por quanto tempo a resposta vale;
+    - ``IDEMPOTENCY_MAX_KEYS``: limite de respostas em memória;
+    - ``IDEMPOTENCY_WAIT_SECONDS``: quanto uma duplicata concorrente espera
+      a original antes de receber 409.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("IDEMPOTENCY_STORAGE_URL", "database://")
+        app.config.setdefault("IDEMPOTENCY_TTL_SECONDS", 86400)
+        app.config.setdefault("IDEMPOTENCY_MAX_KEYS", 10_000)
+        app.config.setdefault("IDEMPOTENCY_WAIT_SECONDS", 10)
+
+        self.store = create_store(
+            app.config["IDEMPOTENCY_STORAGE_URL"],
+            app.config["IDEMPOTENCY_MAX_KEYS"],
+            app.config["IDEMPOTENCY_TTL_SECONDS"],
+        )
+        app.extensions["idempotency"] = self
+        refuse_per_process(
+            app, "IDEMPOTENCY_STORAGE_URL",
+            "repetições que caem em outro worker executam a criação de novo",
+        )
+
+    def idempotent(self, func):
+        """Decorator: usar depois de ``jwt_required`` (a chave é por usuário)"""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            idempotency_key = request.headers.get(HEADER)
+            if idempotency_key is None:
+                return func(*args, **kwargs)
+            if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+                return _error(f"{HEADER} deve ter de 1 a {MAX_KEY_LENGTH} caracteres", 400)
+
+            key = f"{get_jwt_identity()}:{request.method}:{request.path}:{idempotency_key}"
+            fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+
+            record = self.store.reserve(key, current_app.config["IDEMPOTENCY_WAIT_SECONDS"])
+            if record is not None:
+                return self._replay(record, fingerprint)
+
+            try:
+                response = current_app.make_response(func(*args, **kwargs))
+            except BaseException:
+                self.store.release(key)
+                raise
+
+            if 200 <= response.status_code < 300:
+                self.store.save(key, {
+                    "fingerprint": fingerprint,
+                    "status": response.status_code,
+                    "mimetype": response.mimetype,
+                    "body": base64.b64encode(response.get_data()).decode(),
+                })
+            else:
+                self.store.release(key)
+            return response
+
+        return wrapper
+
+    def _replay(self, record, fingerprint):
+        if record.get("pending"):
+            response = _error("Requisição com esta Idempotency-Key ainda em andamento", 409)
+            response.headers["Retry-After"] = "1"
+            return response
+        if record["fingerprint"] != fingerprint:
+            return _error("Idempotency-Key já usada com outro corpo de requisição", 422)
+
+        response = current_app.response_class(
+            base64.b64decode(record["body"]),
+            status=record["status"],
+            mimetype=record["mimetype"],
+        )
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
@@ -0,0 +1,232 @@
+# utils/leaderboard.py
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, union_all
+
+PERIODS = ("weekly", "monthly", "all")
+GLOBAL = None  # escopo do ranking geral; os outros escopos são cursos
+
+
+def period_key(period, when):
+    if period == "weekly":
+        year, week, _ = when.isocalendar()
+        return (year, week)
+    if period == "monthly":
+        return (when.year, when.month)
+    return ()
+
+
+def period_start(period, when):
+    day = datetime(when.year, when.month, when.day, tzinfo=timezone.utc)
+    if period == "weekly":
+        return day - timedelta(days=day.weekday())
+    if period == "monthly":
+        return day.replace(day=1)
+    return None
+
+
+class TopK:
+    """Pontuação de todos os estudantes de um ranking + os K primeiros.
+
+    Como concluir tarefas só soma pontos, o top-K é mantido a cada soma sem
+    reordenar todo mundo: quem já está no top só atualiza, e quem está fora
+    entra se passar do último colocado.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.scores = {}
+        self.top = {}
+
+    def add(self, student_id, points):
+        score = self.scores.get(student_id, 0) + points
+        self.scores[student_id] = score
+
+        if student_id in self.top or len(self.top) < self.k:
+            self.top[student_id] = score
+            return
+
+        last = min(self.top, key=self.top.get)
+        if score > self.top[last]:
+            del self.top[last]
+            self.top[student_id] = score
+
+    def ranking(self, limit):
+        ordered = sorted(self.top.items(), key=lambda item: (-item[1], item[0]))
+        return ordered[:limit]
+
+
+class Leaderboard:
+    """Rankings de pontos (``Tarefa.pontos``) semanal, mensal e geral, global
+    e por curso, mantidos em memória.
+
+    A leitura nunca consulta o banco: ``ranking`` só olha os rankings em
+    memória e ``record_completion`` soma os pontos de cada conclusão. Os
+    rankings são montados (um ``SUM ... GROUP BY`` por período) numa thread
+    de cada processo, na subida e a cada ``LEADERBOARD_REBUILD_SECONDS``
+    para incluir conclusões feitas em outros workers; o resultado novo
+    substitui o antigo de uma vez. Quando a semana/mês vira, o período novo
+    começa vazio (ninguém tem pontos nele ainda) sem esperar a remontagem.
+
+    Cada montagem tem uma marca d'água: só lê conclusões com
+    ``data_conclusao`` até ``início - LEADERBOARD_COMMIT_GRACE_SECONDS``
+    (folga para as transações já carimbadas terminarem de gravar). As
+    conclusões deste processo depois da marca ficam em ``_recent`` e são
+    reaplicadas sobre o resultado novo na troca; as anteriores já estão
+    nele. Assim uma conclusão durante a montagem não é contada duas vezes
+    nem perdida.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._boards = {}
+        self._hwm = None
+        self._recent = []
+        self._pid = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("LEADERBOARD_SIZE", 100)
+        app.config.setdefault("LEADERBOARD_REBUILD_SECONDS", 300)
+        # Quanto a primeira leitura do processo espera a montagem inicial
+        app.config.setdefault("LEADERBOARD_WARMUP_SECONDS", 5)
+        app.config.setdefault("LEADERBOARD_COMMIT_GRACE_SECONDS", 30)
+        app.extensions["leaderboard"] = self
+        self.app = app
+
+    # ------------------------------------------------------------------
+
+    def _build(self, period, now, hwm):
+        """Monta os rankings de um período a partir do agregado no banco.
+
+        Soma as tarefas quentes e as do arquivo: arquivar um PDI não tira
+        do estudante os pontos que ele já ganhou. Só entram conclusões até
+        a marca ``hwm``.
+        """
+        from app import db
+        from models.StudentModel import Student
+        from models.PDI import PDI, Tarefa
+        from models.PDI.archive_model import pdi_archive, tarefas_archive
+        from models.PDI.enums import MetaStatus
+
+        since = period_start(period, now)
+        sources = []
+        for pdis, tarefas in ((PDI.__table__, Tarefa.__table__), (pdi_archive, tarefas_archive)):
+            source = (
+                select(pdis.c.student_id, tarefas.c.pontos)
+                .join(pdis, pdis.c.id == tarefas.c.pdi_id)
+                .where(
+                    tarefas.c.status == MetaStatus.COMPLETED.value,
+                    tarefas.c.pontos > 0,
+                    tarefas.c.data_conclusao <= hwm,
+                )
+            )
+            if since is not None:
+                source = source.where(tarefas.c.data_conclusao >= since)
+            sources.append(source)
+        earned = union_all(*sources).subquery()
+
+        query = (
+            select(Student.id, Student.course, func.sum(earned.c.pontos))
+            .join(earned, earned.c.student_id == Student.id)
+            .group_by(Student.id, Student.course)
+        )
+
+        k = self.app.config["LEADERBOARD_SIZE"]
+        boards = {GLOBAL: TopK(k)}
+        for student_id, course, points in db.session.execute(query):
+            boards[GLOBAL].add(student_id, points or 0)
+            if course:
+                boards.setdefault(course, TopK(k)).add(student_id, points or 0)
+
+        return period_key(period, now), boards
+
+    def _ensure_started(self):
+        """Uma thread de remontagem por processo (o fork não leva threads)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # processo novo: o estado herdado não recebe mais incrementos
+            self._boards, self._hwm, self._recent = {}, None, []
+            self._ready, self._pid = threading.Event(), os.getpid()
+            threading.Thread(target=self._run, name="leaderboard", daemon=True).start()
+
+    def _run(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            try:
+                self.rebuild()
+            except Exception:
+                self.app.logger.exception("Falha ao montar o leaderboard")
+            time.sleep(self.app.config["LEADERBOARD_REBUILD_SECONDS"])
+
+    def rebuild(self):
+        """Monta todos os períodos fora do lock e troca os rankings de uma vez"""
+        now = datetime.now(timezone.utc)
+        hwm = now - timedelta(seconds=self.app.config["LEADERBOARD_COMMIT_GRACE_SECONDS"])
+        with self.app.app_context():
+            boards = {period: self._build(period, now, hwm) for period in PERIODS}
+        with self._lock:
+            # conclusões deste processo depois da marca não estão no resultado
+            self._recent = [entry for entry in self._recent if entry[3] > hwm]
+            for entry in self._recent:
+                self._apply(boards, *entry)
+            self._boards, self._hwm = boards, hwm
+        self._ready.set()
+
+    def _period_boards(self, boards, period, when):
+        """Rankings do período de ``when`` em ``boards`` (chamar com o lock)"""
+        entry = boards.get(period)
+        key = period_key(period, when)
+        if entry is None or entry[0] != key:
+            if entry is not None and entry[0] > key:
+                return None  # conclusão de um período que já passou
+            # semana/mês novo: começa sem pontos, sem consultar o banco
+            entry = (key, {GLOBAL: TopK(self.app.config["LEADERBOARD_SIZE"])})
+            boards[period] = entry
+        return entry[1]
+
+    def _apply(self, boards, student_id, course, points, when):
+        k = self.app.config["LEADERBOARD_SIZE"]
+        for period in PERIODS:
+            period_boards = self._period_boards(boards, period, when)
+            if period_boards is None:
+                continue
+            period_boards[GLOBAL].add(student_id, points)
+            if course:
+                period_boards.setdefault(course, TopK(k)).add(student_id, points)
+
+    def ranking(self, period="weekly", course=GLOBAL, limit=10):
+        self._ensure_started()
+        self._ready.wait(self.app.config["LEADERBOARD_WARMUP_SECONDS"])
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            if period not in self._boards:
+                return []  # montagem inicial ainda não terminou
+            boards = self._period_boards(self._boards, period, now)
+            board = boards.get(course) if boards else None
+            return board.ranking(limit) if board else []
+
+    def record_completion(self, student_id, course, points, when=None):
+        """Soma os pontos de uma tarefa concluída nos rankings em memória"""
+        if not points:
+            return
+        self._ensure_started()
+        when = when or datetime.now(timezone.utc)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)  # SQLite devolve sem fuso
+        with self._lock:
+            if self._hwm is not None and when <= self._hwm:
+                return  # já lida pela última montagem
+            # guardada para reaplicar se a montagem em andamento não a leu
+            self._recent.append((student_id, course, points, when))
+            if self._ready.is_set():
+                self._apply(self._boards, student_id, course, points, when)
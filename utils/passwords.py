@@ -0,0 +1,58 @@
+# utils/passwords.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash
+
+# Abaixo disso abrir/usar o pool custa mais que hashear na própria thread
+POOL_THRESHOLD = 16
+
+_pool = None
+_pool_pid = None
+_pool_workers = 1
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Pool de processos criado no primeiro uso, um por worker.
+
+    ``PASSWORD_HASH_WORKERS`` processos; por padrão as CPUs divididas por
+    ``WEB_CONCURRENCY``.
+
+    Usa ``spawn``: os filhos só importam o werkzeug, e não herdam threads,
+    locks nem conexões do worker do servidor como aconteceria com fork.
+    """
+    global _pool, _pool_pid, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # Um pool por worker do gunicorn: divididos os núcleos entre eles
+            # para a soma não passar do número de CPUs
+            workers = int(os.environ.get("WEB_CONCURRENCY") or 1)
+            _pool_workers = int(
+                os.environ.get("PASSWORD_HASH_WORKERS") or max(1, (os.cpu_count() or 1) // workers)
+            )
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def hash_passwords(passwords):
+    """Gera o hash (mesmo método de ``User.password``) de várias senhas.
+
+    Cada hash é PBKDF2 com centenas de milhares de iterações; em lote o
+    trabalho vai para processos separados, que usam os outros núcleos sem
+    ocupar o worker que atende as requisições. Devolve os hashes na ordem
+    das senhas.
+    """
+    passwords = list(passwords)
+    if len(passwords) < POOL_THRESHOLD:
+        return [generate_password_hash(password) for password in passwords]
+
+    pool = _get_pool()
+    chunksize = max(1, len(passwords) // (_pool_workers * 4))
+    return list(pool.map(generate_password_hash, passwords, chunksize=chunksize))
@@ -0,0 +1,93 @@
+# utils/pdi_archive.py
+import threading
+import time
+
+import click
+from flask.cli import with_appcontext
+
+
+def archive_pdis(batch_size=500, completed_days=0):
+    """Arquiva lotes até não sobrar PDI elegível; devolve quantos PDIs.
+
+    Cada lote é uma transação curta (ver ``archive_batch``), então o
+    servidor continua atendendo enquanto o arquivamento anda.
+    """
+    from models.PDI.archive_model import archive_batch
+
+    total = 0
+    while True:
+        moved = archive_batch(batch_size, completed_days)
+        total += moved
+        if moved < batch_size:
+            return total
+
+
+class PDIArchiveJob:
+    """Move periodicamente os PDIs arquivados para as tabelas de arquivo.
+
+    Ligado quando ``PDI_ARCHIVE_INTERVAL_HOURS`` é maior que zero. Com
+    ``PDI_ARCHIVE_COMPLETED_DAYS`` > 0 também leva os PDIs concluídos sem
+    atualização há esse número de dias.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PDI_ARCHIVE_INTERVAL_HOURS", 0)
+        app.config.setdefault("PDI_ARCHIVE_COMPLETED_DAYS", 0)
+        app.config.setdefault("PDI_ARCHIVE_BATCH_SIZE", 500)
+        app.extensions["pdi_archive"] = self
+        app.cli.add_command(pdi_archive_cli)
+        self.app = app
+
+        if app.config["PDI_ARCHIVE_INTERVAL_HOURS"] > 0:
+            self.start()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="pdi-archive", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        interval = self.app.config["PDI_ARCHIVE_INTERVAL_HOURS"] * 3600
+        while True:
+            try:
+                with self.app.app_context():
+                    started = time.perf_counter()
+                    count = archive_pdis(
+                        self.app.config["PDI_ARCHIVE_BATCH_SIZE"],
+                        self.app.config["PDI_ARCHIVE_COMPLETED_DAYS"],
+                    )
+                    self.app.logger.info(
+                        "%d PDIs arquivados em %.2fs", count, time.perf_counter() - started,
+                    )
+            except Exception:
+                self.app.logger.exception("Falha ao arquivar PDIs")
+            time.sleep(interval)
+
+
+@click.group("pdi-archive")
+def pdi_archive_cli():
+    """Arquivo dos PDIs arquivados/concluídos"""
+
+
+@pdi_archive_cli.command("run")
+@click.option("--batch-size", type=int, default=None, help="PDIs por transação")
+@click.option("--completed-days", type=int, default=None,
+              help="Arquiva também PDIs concluídos sem atualização há N dias")
+@with_appcontext
+def run_command(batch_size, completed_days):
+    """Move os PDIs elegíveis para as tabelas de arquivo"""
+    from flask import current_app
+
+    batch_size = batch_size or current_app.config["PDI_ARCHIVE_BATCH_SIZE"]
+    if completed_days is None:
+        completed_days = current_app.config["PDI_ARCHIVE_COMPLETED_DAYS"]
+    started = time.perf_counter()
+    count = archive_pdis(batch_size, completed_days)
+    click.echo(f"{count} PDIs arquivados em {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,144 @@
+# utils/progress_history.py
+import atexit
+import os
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+
+def _naive_utc(value):
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class ProgressHistory:
+    """Buffer em memória para os eventos de progresso.
+
+    ``record`` só acrescenta o evento numa lista; uma thread grava o buffer
+    em lote (um INSERT executemany) a cada ``PROGRESS_HISTORY_FLUSH_SECONDS``
+    ou assim que ele chega a ``PROGRESS_HISTORY_BUFFER_SIZE`` eventos. Se a
+    gravação atrasar e o buffer passar de ``PROGRESS_HISTORY_MAX_BUFFER``,
+    quem chamou ``record`` grava na hora. Na saída do processo o que restar é
+    gravado (``atexit``).
+
+    A thread é criada no primeiro ``record`` de cada processo, então funciona
+    com servidores que fazem fork depois de carregar o app.
+
+    As leituras do histórico juntam ao banco o que ainda está na memória
+    deste processo (``pending``), sem forçar uma gravação a cada leitura.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._buffer = []
+        self._flushing = []  # lotes tirados do buffer e ainda não gravados
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PROGRESS_HISTORY_ENABLED", True)
+        app.config.setdefault("PROGRESS_HISTORY_BUFFER_SIZE", 500)
+        app.config.setdefault("PROGRESS_HISTORY_FLUSH_SECONDS", 5.0)
+        app.config.setdefault("PROGRESS_HISTORY_MAX_BUFFER", 10_000)
+        app.extensions["progress_history"] = self
+        self.app = app
+        atexit.register(self.flush)
+
+    def record(self, entity_type, entity_id, pdi_id, student_id, progress, status):
+        if self.app is None or not self.app.config["PROGRESS_HISTORY_ENABLED"]:
+            return
+
+        self._ensure_worker()
+        event = {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "pdi_id": pdi_id,
+            "student_id": student_id,
+            "progress": progress,
+            "status": status,
+            "ts": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._buffer.append(event)
+            size = len(self._buffer)
+
+        if size >= self.app.config["PROGRESS_HISTORY_MAX_BUFFER"]:
+            self.flush()
+        elif size >= self.app.config["PROGRESS_HISTORY_BUFFER_SIZE"]:
+            self._wakeup.set()
+
+    def flush(self):
+        """Grava tudo que está no buffer numa transação própria"""
+        from models.PDI.progress_event_model import ProgressEvent
+
+        with self._lock:
+            events, self._buffer = self._buffer, []
+            if events:
+                self._flushing.append(events)
+        if not events or self.app is None:
+            return 0
+
+        from app import db
+
+        try:
+            with self.app.app_context():
+                # conexão própria: não mexe na sessão da requisição em andamento
+                with db.engine.begin() as connection:
+                    connection.execute(insert(ProgressEvent.__table__), events)
+        except Exception:
+            # devolve ao buffer para a próxima tentativa, respeitando o limite
+            with self._lock:
+                self._drop_flushing(events)
+                keep = self.app.config["PROGRESS_HISTORY_MAX_BUFFER"] - len(self._buffer)
+                self._buffer[:0] = events[-keep:] if keep > 0 else []
+            raise
+        with self._lock:
+            self._drop_flushing(events)
+        return len(events)
+
+    def _drop_flushing(self, events):
+        self._flushing = [batch for batch in self._flushing if batch is not events]
+
+    def pending(self, entity_type=None, entity_id=None, student_id=None, since=None, until=None):
+        """Eventos deste processo ainda não gravados, com os filtros de
+        ``progress_history_between`` (``ts`` sem fuso, em UTC, como no banco)"""
+        since, until = _naive_utc(since), _naive_utc(until)
+        with self._lock:
+            events = [event for batch in self._flushing for event in batch] + self._buffer
+
+        result = []
+        for event in events:
+            if student_id is not None:
+                if event["student_id"] != student_id:
+                    continue
+            elif (event["entity_type"], event["entity_id"]) != (entity_type, entity_id):
+                continue
+            ts = _naive_utc(event["ts"])
+            if (since is not None and ts < since) or (until is not None and ts >= until):
+                continue
+            result.append({**event, "ts": ts})
+        return result
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="progress-history", daemon=True).start()
+
+    def _run(self):
+        interval = self.app.config["PROGRESS_HISTORY_FLUSH_SECONDS"]
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception("Falha ao gravar histórico de progresso")
@@ -0,0 +1,229 @@
+# utils/progress_stream.py
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from .shared_storage import warn_if_per_process
+
+
+class Subscription:
+    """Fila de eventos de uma conexão SSE.
+
+    Eventos são estado (o progresso mais novo de um PDI ou meta), então a
+    fila guarda só o último de cada entidade: um cliente lento recebe menos
+    eventos, não eventos velhos. Se passar de ``max_pending`` entidades
+    diferentes a fila é descartada e o cliente recebe ``resync`` (deve
+    recarregar os PDIs), sem nunca bloquear quem publica.
+    """
+
+    def __init__(self, channels, max_pending):
+        self.channels = channels
+        self.max_pending = max_pending
+        self._pending = OrderedDict()
+        self._overflow = False
+        self._cond = threading.Condition()
+
+    def put(self, event):
+        key = (event["type"], event["meta_id"] or event["pdi_id"])
+        with self._cond:
+            if self._overflow:
+                return
+            self._pending.pop(key, None)
+            if len(self._pending) >= self.max_pending:
+                self._pending.clear()
+                self._overflow = True
+            else:
+                self._pending[key] = event
+            self._cond.notify()
+
+    def get(self, timeout):
+        """Espera até ``timeout`` e devolve ``(eventos, resync)``"""
+        with self._cond:
+            if not self._pending and not self._overflow:
+                self._cond.wait(timeout)
+            events = list(self._pending.values())
+            resync = self._overflow
+            self._pending.clear()
+            self._overflow = False
+        return events, resync
+
+
+class RedisBackend:
+    """Pub/sub no Redis para os eventos chegarem às conexões de todos os workers"""
+
+    def __init__(self, url, prefix="pdi-progress:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("PROGRESS_STREAM_STORAGE_URL com redis:// requer o pacote 'redis'") from e
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel, event):
+        self.client.publish(self.prefix + channel, json.dumps(event))
+
+    def listen(self, dispatch):
+        """Bloqueia repassando as mensagens recebidas para ``dispatch``"""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(self.prefix + "*")
+        start = len(self.prefix)
+        try:
+            for message in pubsub.listen():
+                dispatch(message["channel"].decode()[start:], json.loads(message["data"]))
+        finally:
+            pubsub.close()
+
+
+def create_backend(url):
+    if not url or url.startswith("memory://"):
+        return None
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    raise ValueError(f"PROGRESS_STREAM_STORAGE_URL não suportada: {url}")
+
+
+class ProgressStream:
+    """Pub/sub das mudanças de progresso para as conexões SSE.
+
+    ``publish`` entrega o evento às inscrições dos canais do estudante e do
+    mentor do PDI. Com ``memory://`` (padrão) só as conexões deste processo
+    recebem; com ``redis://...`` o evento passa pelo Redis e uma thread por
+    worker repassa para as conexões locais.
+
+    Configuração:
+    - ``PROGRESS_STREAM_STORAGE_URL``: ``memory://`` (um worker só) ou
+      ``redis://...`` (obrigatório em produção com vários workers);
+    - ``PROGRESS_STREAM_MAX_SUBSCRIBERS``: conexões abertas por worker. Cada
+      uma prende uma thread do gthread por até ``PROGRESS_STREAM_MAX_SECONDS``,
+      então o limite efetivo é metade de ``SERVER_THREADS`` (com o padrão de
+      2 threads, um stream por worker); para mais dashboards abertos suba
+      ``GUNICORN_THREADS``;
+    - ``PROGRESS_STREAM_MAX_PENDING``: eventos por conexão antes do resync;
+    - ``PROGRESS_STREAM_HEARTBEAT_SECONDS``: comentário enviado sem eventos,
+      mantém proxies abertos e detecta cliente desconectado;
+    - ``PROGRESS_STREAM_MAX_SECONDS``: duração máxima de uma conexão; o
+      EventSource reconecta sozinho e a thread volta para o pool.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = None
+        self._subscriptions = defaultdict(set)
+        self._count = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PROGRESS_STREAM_STORAGE_URL", "memory://")
+        app.config.setdefault("PROGRESS_STREAM_MAX_SUBSCRIBERS", 100)
+        app.config.setdefault("PROGRESS_STREAM_MAX_PENDING", 256)
+        app.config.setdefault("PROGRESS_STREAM_HEARTBEAT_SECONDS", 15)
+        app.config.setdefault("PROGRESS_STREAM_MAX_SECONDS", 300)
+        app.extensions["progress_stream"] = self
+        self.app = app
+        self.backend = create_backend(app.config["PROGRESS_STREAM_STORAGE_URL"])
+
+        threads = app.config.get("SERVER_THREADS") or 0
+        if threads and app.config["PROGRESS_STREAM_MAX_SUBSCRIBERS"] > threads // 2:
+            app.logger.warning(
+                "PROGRESS_STREAM_MAX_SUBSCRIBERS=%d com %d threads por worker: "
+                "limitado a %d para os streams não tomarem o worker da API",
+                app.config["PROGRESS_STREAM_MAX_SUBSCRIBERS"], threads, threads // 2,
+            )
+            app.config["PROGRESS_STREAM_MAX_SUBSCRIBERS"] = threads // 2
+        warn_if_per_process(
+            app, "PROGRESS_STREAM_STORAGE_URL",
+            "conexões SSE não recebem eventos publicados por outros workers",
+        )
+
+    def publish(self, event, student_id=None, mentor_id=None):
+        channels = []
+        if student_id is not None:
+            channels.append(f"student:{student_id}")
+        if mentor_id is not None:
+            channels.append(f"mentor:{mentor_id}")
+
+        for channel in channels:
+            if self.backend is None:
+                self._dispatch(channel, event)
+                continue
+            try:
+                self.backend.publish(channel, event)
+            except Exception:
+                # o stream é só notificação: a mudança já está gravada
+                self.app.logger.exception("Falha ao publicar evento de progresso")
+
+    def subscribe(self, *channels):
+        """Nova inscrição, ou None se o worker já está no limite de conexões"""
+        if self.backend is not None:
+            self._ensure_worker()
+        subscription = Subscription(channels, self.app.config["PROGRESS_STREAM_MAX_PENDING"])
+        with self._lock:
+            if self._count >= self.app.config["PROGRESS_STREAM_MAX_SUBSCRIBERS"]:
+                return None
+            self._count += 1
+            for channel in channels:
+                self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._count -= 1
+            for channel in subscription.channels:
+                subscriptions = self._subscriptions.get(channel)
+                if subscriptions is None:
+                    continue
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[channel]
+
+    def _dispatch(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            # estado herdado do processo pai (fork) não vale aqui
+            self._subscriptions.clear()
+            self._count = 0
+        threading.Thread(target=self._run, name="progress-stream", daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.backend.listen(self._dispatch)
+            except Exception:
+                self.app.logger.exception("Conexão do pub/sub de progresso caiu; reconectando")
+                time.sleep(1)
+
+    def events(self, subscription):
+        """Gera o corpo SSE da inscrição até ``PROGRESS_STREAM_MAX_SECONDS``"""
+        heartbeat = self.app.config["PROGRESS_STREAM_HEARTBEAT_SECONDS"]
+        deadline = time.monotonic() + self.app.config["PROGRESS_STREAM_MAX_SECONDS"]
+        try:
+            yield f"retry: {heartbeat * 1000}\n\n"
+            while time.monotonic() < deadline:
+                events, resync = subscription.get(min(heartbeat, deadline - time.monotonic()))
+                if resync:
+                    yield "event: resync\ndata: {}\n\n"
+                elif events:
+                    yield "".join(
+                        f"event: progress\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+                        for event in events
+                    )
+                else:
+                    yield ": ping\n\n"
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,184 @@
+# utils/ratelimit.py
+import math
+import time
+from collections import Counter
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_limit(limit):
+    """Converte "5/minute" em (tokens por segundo, capacidade do balde)"""
+    count, _, period = limit.partition("/")
+    seconds = _PERIODS[period.strip().rstrip("s")]
+    count = int(count)
+    return count / seconds, count
+
+
+class MemoryBackend:
+    """Token bucket em memória, por processo.
+
+    Cada balde é uma tupla imutável ``(tokens, instante)`` trocada com uma
+    única atribuição no dict, então não há lock. Numa corrida entre threads o
+    pior caso é liberar uma requisição a mais, nunca travar ou corromper.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = {}
+
+    def consume(self, key, rate, capacity):
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * rate)
+
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            allowed, retry_after = True, 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            allowed, retry_after = False, (1 - tokens) / rate
+
+        if len(self._buckets) > self.max_keys:
+            self._prune(now, rate, capacity)
+        return allowed, retry_after
+
+    def _prune(self, now, rate, capacity):
+        # Baldes parados tempo suficiente para encher de novo não guardam nada
+        idle = capacity / rate
+        for key, (_, last) in list(self._buckets.items()):
+            if now - last >= idle:
+                self._buckets.pop(key, None)
+
+
+class RedisBackend:
+    """Token bucket compartilhado entre workers, guardado no Redis.
+
+    O cálculo roda num script Lua, atômico no servidor.
+    """
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url, prefix="ratelimit:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RATELIMIT_STORAGE_URL com redis:// requer o pacote 'redis'") from e
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+
+    def consume(self, key, rate, capacity):
+        allowed, tokens = self.script(
+            keys=[self.prefix + key], args=[rate, capacity, time.time()]
+        )
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / rate
+
+
+def create_backend(url):
+    if not url or url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    raise ValueError(f"RATELIMIT_STORAGE_URL não suportada: {url}")
+
+
+def ip_key():
+    if current_app.config.get("RATELIMIT_TRUST_PROXY") and request.access_route:
+        return request.access_route[0]
+    return request.remote_addr or "unknown"
+
+
+def user_key():
+    """Identidade do JWT; sem token válido cai para o IP"""
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None
+    return f"user:{identity}" if identity is not None else f"ip:{ip_key()}"
+
+
+KEY_FUNCS = {"ip": lambda: f"ip:{ip_key()}", "user": user_key}
+
+
+class RateLimiter:
+    """Extensão de rate limit por rota (token bucket).
+
+    Configuração:
+    - ``RATELIMIT_ENABLED``: liga/desliga tudo;
+    - ``RATELIMIT_STORAGE_URL``: ``memory://`` (padrão) ou ``redis://...``;
+    - ``RATELIMIT_ROUTE_LIMITS``: sobrescreve o limite por endpoint,
+      ex. ``{"auth_controller.login": "20/minute"}``.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.rejected = Counter()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RATELIMIT_ENABLED", True)
+        app.config.setdefault("RATELIMIT_STORAGE_URL", "memory://")
+        app.config.setdefault("RATELIMIT_ROUTE_LIMITS", {})
+        app.config.setdefault("RATELIMIT_TRUST_PROXY", False)
+
+        self.backend = create_backend(app.config["RATELIMIT_STORAGE_URL"])
+        app.extensions["ratelimit"] = self
+
+    def limit(self, limit, key="ip"):
+        """Decorator: aplica ``limit`` (ex. "5/minute") por IP ou por usuário"""
+        key_func = KEY_FUNCS[key]
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not current_app.config["RATELIMIT_ENABLED"]:
+                    return func(*args, **kwargs)
+
+                endpoint = request.endpoint
+                route_limit = current_app.config["RATELIMIT_ROUTE_LIMITS"].get(endpoint, limit)
+                rate, capacity = parse_limit(route_limit)
+
+                allowed, retry_after = self.backend.consume(
+                    f"{endpoint}:{key_func()}", rate, capacity
+                )
+                if not allowed:
+                    self.rejected[endpoint] += 1
+                    retry_after = max(1, math.ceil(retry_after))
+                    response = jsonify({"msg": f"Muitas requisições, tente novamente em {retry_after}s"})
+                    response.status_code = 429
+                    response.headers["Retry-After"] = str(retry_after)
+                    return response
+
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def stats(self):
+        return {"rejected": dict(self.rejected), "total_rejected": sum(self.rejected.values())}
@@ -0,0 +1,214 @@
+# utils/risk_score.py
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import case, func, select, update
+
+# Peso de cada fator no score final (soma 1, score entre 0 e 1)
+WEIGHTS = {
+    "overdue": 0.30,
+    "stalled": 0.25,
+    "completion": 0.20,
+    "mood": 0.15,
+    "dedication": 0.10,
+}
+
+OVERDUE_SATURATION = 3  # a partir de 3 metas vencidas o fator fica no máximo
+SCALE_MAX = 10.0  # mood e dedication_score vão de 0 a 10
+UPDATE_CHUNK = 5000
+
+
+def _aligned(student_ids, rows, n_columns, fill=0.0):
+    """Coloca o resultado de um ``GROUP BY student_id`` na ordem de
+    ``student_ids``; devolve uma linha por coluna agregada"""
+    import numpy as np
+
+    out = np.full((n_columns, len(student_ids)), fill)
+    if rows:
+        positions = np.searchsorted(student_ids, [row[0] for row in rows])
+        out[:, positions] = np.array([row[1:] for row in rows], dtype=np.float64).T
+    return out
+
+
+def compute_risk_scores(stalled_days=14, now=None):
+    """Calcula o risk_score de todos os estudantes de uma vez.
+
+    São três consultas agregadas (estudantes, metas vencidas por estudante,
+    progresso dos PDIs/tarefas por estudante); o resto é aritmética de arrays
+    NumPy sobre a população inteira. Devolve ``(student_ids, scores)``.
+    """
+    # NumPy só aqui: importado no topo custaria o cold start de todo processo
+    import numpy as np
+
+    from app import db
+    from models.StudentModel import Student
+    from models.PDI import PDI, Meta, Tarefa
+    from models.PDI.due_dates import META_CLOSED, PDI_CLOSED
+    from models.PDI.enums import MetaStatus
+
+    now = now or datetime.now(timezone.utc)
+
+    students = db.session.execute(
+        select(Student.id, Student.mood, Student.dedication_score).order_by(Student.id)
+    ).all()
+    if not students:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    student_ids = np.array([row.id for row in students], dtype=np.int64)
+    mood = np.array([np.nan if r.mood is None else r.mood for r in students], dtype=np.float64)
+    dedication = np.array(
+        [np.nan if r.dedication_score is None else r.dedication_score for r in students],
+        dtype=np.float64,
+    )
+
+    overdue_rows = db.session.execute(
+        select(PDI.student_id, func.count(Meta.id))
+        .join(Meta, Meta.pdi_id == PDI.id)
+        .where(
+            Meta.data_fim_previsto < now,
+            Meta.status.not_in(META_CLOSED),
+        )
+        .group_by(PDI.student_id)
+    ).all()
+    (overdue,) = _aligned(student_ids, overdue_rows, 1)
+
+    activity_rows = db.session.execute(
+        select(PDI.student_id, func.max(PDI.last_update))
+        .where(PDI.status.not_in(PDI_CLOSED))
+        .group_by(PDI.student_id)
+    ).all()
+    last_update = np.full(len(student_ids), np.datetime64("NaT"), dtype="datetime64[s]")
+    if activity_rows:
+        positions = np.searchsorted(student_ids, [row[0] for row in activity_rows])
+        last_update[positions] = np.array([row[1] for row in activity_rows], dtype="datetime64[s]")
+
+    task_rows = db.session.execute(
+        select(
+            PDI.student_id,
+            func.count(Tarefa.id),
+            func.sum(case((Tarefa.status == MetaStatus.COMPLETED.value, 1), else_=0)),
+        )
+        .join(Tarefa, Tarefa.pdi_id == PDI.id)
+        .group_by(PDI.student_id)
+    ).all()
+    total_tasks, done_tasks = _aligned(student_ids, task_rows, 2)
+
+    # Fatores normalizados em [0, 1]; 1 = mais risco
+    overdue_factor = np.clip(overdue / OVERDUE_SATURATION, 0, 1)
+
+    today = np.datetime64(now.replace(tzinfo=None), "s")
+    idle_days = (today - last_update) / np.timedelta64(1, "D")
+    stalled_factor = np.where(np.isnan(idle_days), 0.0, np.clip(idle_days / stalled_days, 0, 1))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        completion_factor = np.where(total_tasks > 0, 1 - done_tasks / total_tasks, 0.5)
+
+    # Sem dado de humor/dedicação conta como neutro
+    mood_factor = np.where(np.isnan(mood), 0.5, 1 - np.clip(mood / SCALE_MAX, 0, 1))
+    dedication_factor = np.where(
+        np.isnan(dedication), 0.5, 1 - np.clip(dedication / SCALE_MAX, 0, 1)
+    )
+
+    scores = (
+        WEIGHTS["overdue"] * overdue_factor
+        + WEIGHTS["stalled"] * stalled_factor
+        + WEIGHTS["completion"] * completion_factor
+        + WEIGHTS["mood"] * mood_factor
+        + WEIGHTS["dedication"] * dedication_factor
+    )
+    return student_ids, np.round(scores, 4)
+
+
+def update_risk_scores(stalled_days=14):
+    """Calcula e grava os scores com UPDATE em lote (executemany por PK)"""
+    from app import db
+    from models.StudentModel import Student
+
+    student_ids, scores = compute_risk_scores(stalled_days=stalled_days)
+    rows = [
+        {"id": student_id, "risk_score": score}
+        for student_id, score in zip(student_ids.tolist(), scores.tolist())
+    ]
+    for start in range(0, len(rows), UPDATE_CHUNK):
+        db.session.execute(update(Student), rows[start:start + UPDATE_CHUNK])
+    db.session.commit()
+
+    return len(rows)
+
+
+class RiskScoreJob:
+    """Recalcula o risk_score periodicamente numa thread em background.
+
+    Ligado quando ``RISK_SCORE_INTERVAL_HOURS`` é maior que zero. A thread
+    sobe só no servidor: no ``post_worker_init`` do gunicorn ou na primeira
+    requisição do ``flask run``; comandos do CLI (``flask db upgrade``,
+    ``flask risk compute``...) montam o app sem ela.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RISK_SCORE_INTERVAL_HOURS", 0)
+        app.config.setdefault("RISK_SCORE_STALLED_DAYS", 14)
+        app.extensions["risk_score"] = self
+        app.cli.add_command(risk_cli)
+        app.before_request(self.ensure_started)
+        self.app = app
+
+    def ensure_started(self):
+        """Sobe a thread neste processo, se ligada e ainda não subiu"""
+        if self.app is None or self.app.config["RISK_SCORE_INTERVAL_HOURS"] <= 0:
+            return
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # threads não atravessam o fork: cada worker sobe a sua
+            self._thread = threading.Thread(target=self._run, name="risk-score", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        interval = self.app.config["RISK_SCORE_INTERVAL_HOURS"] * 3600
+        while True:
+            try:
+                with self.app.app_context():
+                    started = time.perf_counter()
+                    count = update_risk_scores(self.app.config["RISK_SCORE_STALLED_DAYS"])
+                    self.app.logger.info(
+                        "risk_score atualizado para %d estudantes em %.2fs",
+                        count, time.perf_counter() - started,
+                    )
+            except Exception:
+                self.app.logger.exception("Falha ao calcular risk_score")
+            time.sleep(interval)
+
+
+@click.group("risk")
+def risk_cli():
+    """Comandos do risk score dos estudantes"""
+
+
+@risk_cli.command("compute")
+@click.option("--stalled-days", type=int, default=None,
+              help="Dias sem atualização para considerar o PDI parado")
+@with_appcontext
+def compute_command(stalled_days):
+    """Recalcula o risk_score de todos os estudantes"""
+    from flask import current_app
+
+    stalled_days = stalled_days or current_app.config["RISK_SCORE_STALLED_DAYS"]
+    started = time.perf_counter()
+    count = update_risk_scores(stalled_days)
+    click.echo(f"risk_score atualizado para {count} estudantes em {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,34 @@
+# utils/shared_storage.py
+
+
+def _per_process_workers(app, setting):
+    """Número de workers se ``setting`` é ``memory://`` com mais de um; senão 0"""
+    url = app.config.get(setting) or "memory://"
+    workers = app.config.get("WEB_CONCURRENCY", 1)
+    return workers if workers > 1 and url.startswith("memory://") else 0
+
+
+def warn_if_per_process(app, setting, consequence):
+    """Avisa na subida quando ``setting`` é ``memory://`` com vários workers.
+
+    O estado em memória é de cada processo; com ``WEB_CONCURRENCY`` > 1
+    (o gunicorn.conf.py publica o número de workers) o que um worker grava
+    os outros não veem. Em produção use ``redis://...``.
+    """
+    workers = _per_process_workers(app, setting)
+    if workers:
+        app.logger.error(
+            "%s=memory:// com %d workers: %s. Configure %s=redis://... em produção.",
+            setting, workers, consequence, setting,
+        )
+
+
+def refuse_per_process(app, setting, consequence):
+    """Como ``warn_if_per_process``, mas não deixa o app subir: para stores
+    em que o estado por worker quebra a garantia da funcionalidade"""
+    workers = _per_process_workers(app, setting)
+    if workers:
+        raise RuntimeError(
+            f"{setting}=memory:// com {workers} workers: {consequence}. "
+            f"Use {setting}=database:// (padrão) ou redis://..."
+        )
@@ -0,0 +1,52 @@
+# utils/spec.py
+import json
+import os
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from spectree import SpecTree
+
+
+class PrebuiltSpecTree(SpecTree):
+    """SpecTree que lê o documento OpenAPI de ``OPENAPI_SPEC_FILE``.
+
+    O SpecTree já só monta o documento no primeiro acesso a ``spec``; aqui,
+    se ``OPENAPI_SPEC_FILE`` apontar para um arquivo existente (gerado com
+    ``flask openapi dump``), esse primeiro acesso lê o arquivo em vez de
+    percorrer o ``url_map`` e gerar os schemas de todas as rotas.
+    """
+
+    @property
+    def spec(self):
+        if not hasattr(self, "_spec"):
+            self._spec = self._load_prebuilt_spec() or self._generate_spec()
+        return self._spec
+
+    def _load_prebuilt_spec(self):
+        app = getattr(self, "app", None)
+        path = app.config.get("OPENAPI_SPEC_FILE") if app is not None else None
+        if not path or not os.path.exists(path):
+            return None
+
+        with open(path, "r", encoding="utf-8") as spec_file:
+            return json.load(spec_file)
+
+
+@click.group("openapi")
+def openapi_cli():
+    """Comandos do documento OpenAPI"""
+
+
+@openapi_cli.command("dump")
+@click.argument("path", required=False)
+@with_appcontext
+def dump_spec(path):
+    """Gera o documento OpenAPI e grava em PATH (ou OPENAPI_SPEC_FILE)"""
+    api = current_app.extensions["spectree"]
+    path = path or current_app.config.get("OPENAPI_SPEC_FILE") or "openapi.json"
+
+    with open(path, "w", encoding="utf-8") as spec_file:
+        json.dump(api._generate_spec(), spec_file, ensure_ascii=False)
+
+    click.echo(f"OpenAPI gravado em {path}")
@@ -0,0 +1,270 @@
+# utils/token_blocklist.py
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from .shared_storage import refuse_per_process
+
+
+class BloomFilter:
+    """Conjunto probabilístico: ``in`` nunca dá falso negativo.
+
+    Dimensionado para ``capacity`` itens com taxa de falso positivo
+    ``error_rate``. Usa double hashing sobre um único blake2b, então cada
+    consulta custa um hash e ``hashes`` acessos ao bytearray.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        positions = self._positions(item)
+        # |= num byte é ler-modificar-escrever: sem lock duas threads podem
+        # perder um bit e o item viraria um falso negativo
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class MemoryStore:
+    """jti -> expiração em memória, por processo"""
+
+    shared = False
+
+    def __init__(self):
+        self._entries = {}
+
+    def add(self, jti, expires_at):
+        self._entries[jti] = expires_at
+
+    def contains(self, jti):
+        expires_at = self._entries.get(jti, 0)
+        return expires_at is None or expires_at > time.time()
+
+    def entries(self):
+        now = time.time()
+        for jti, expires_at in list(self._entries.items()):
+            if expires_at is None or expires_at > now:
+                yield jti
+            else:
+                self._entries.pop(jti, None)
+
+
+class RedisStore:
+    """jti revogados no Redis, cada um com TTL até o token expirar"""
+
+    shared = True
+
+    def __init__(self, url, prefix="blocklist:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("BLOCKLIST_STORAGE_URL com redis:// requer o pacote 'redis'") from e
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def add(self, jti, expires_at):
+        ttl = None if expires_at is None else max(1, math.ceil(expires_at - time.time()))
+        self.client.set(self.prefix + jti, 1, ex=ttl)
+
+    def contains(self, jti):
+        return bool(self.client.exists(self.prefix + jti))
+
+    def entries(self):
+        start = len(self.prefix)
+        for key in self.client.scan_iter(match=self.prefix + "*", count=1000):
+            yield key.decode()[start:]
+
+
+class DatabaseStore:
+    """jti revogados na tabela ``revoked_tokens`` do próprio banco (padrão).
+
+    Compartilhado entre workers sem serviço extra. Usa uma conexão própria
+    (não a sessão da requisição): a revogação vale mesmo se a requisição
+    fizer rollback depois. As linhas vencidas saem em ``entries``.
+    """
+
+    shared = True
+
+    def add(self, jti, expires_at):
+        from app import db
+        from models.RevokedTokenModel import RevokedToken
+        from utils.database import upsert
+
+        expires = None if expires_at is None else datetime.fromtimestamp(expires_at, timezone.utc)
+        with db.engine.begin() as connection:
+            upsert(
+                RevokedToken.__table__, [{"jti": jti, "expires_at": expires}],
+                index_elements=["jti"], replace=("expires_at",), connection=connection,
+            )
+
+    @staticmethod
+    def _alive(now):
+        from models.RevokedTokenModel import RevokedToken
+
+        return RevokedToken.expires_at.is_(None) | (RevokedToken.expires_at > now)
+
+    def contains(self, jti):
+        from app import db
+        from models.RevokedTokenModel import RevokedToken
+
+        with db.engine.connect() as connection:
+            return connection.scalar(
+                db.select(RevokedToken.jti)
+                .where(RevokedToken.jti == jti, self._alive(datetime.now(timezone.utc)))
+            ) is not None
+
+    def entries(self):
+        from app import db
+        from models.RevokedTokenModel import RevokedToken
+
+        now = datetime.now(timezone.utc)
+        with db.engine.begin() as connection:
+            connection.execute(db.delete(RevokedToken).where(RevokedToken.expires_at <= now))
+            return connection.scalars(db.select(RevokedToken.jti).where(self._alive(now))).all()
+
+
+def create_store(url):
+    if not url or url.startswith("database://"):
+        return DatabaseStore()
+    if url.startswith("memory://"):
+        return MemoryStore()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisStore(url)
+    raise ValueError(f"BLOCKLIST_STORAGE_URL não suportada: {url}")
+
+
+class TokenBlocklist:
+    """Revogação de JWTs com um Bloom filter na frente do store.
+
+    O caso comum (token não revogado) é respondido pelo Bloom filter em
+    memória, sem ir ao store. Só quando o filtro diz "talvez" o store é
+    consultado para confirmar (e descartar falsos positivos e entradas já
+    expiradas).
+
+    Com store compartilhado (``database://``, o padrão, ou ``redis://``)
+    cada worker remonta o próprio filtro a partir do store a cada
+    ``BLOCKLIST_SYNC_SECONDS``, numa thread em background; um logout feito
+    em outro worker passa a valer aqui em até esse intervalo. Com
+    ``memory://`` tudo fica no processo, o que só serve para um worker
+    (desenvolvimento); com mais workers o app não sobe.
+
+    Access tokens levam o jti do refresh token que os gerou (``rjti``): se
+    o refresh foi revogado, os access tokens dele também são.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.store = None
+        self._bloom = None
+        self._pid = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("BLOCKLIST_STORAGE_URL", "database://")
+        app.config.setdefault("BLOCKLIST_BLOOM_CAPACITY", 100_000)
+        app.config.setdefault("BLOCKLIST_BLOOM_ERROR_RATE", 0.001)
+        app.config.setdefault("BLOCKLIST_SYNC_SECONDS", 5)
+        app.extensions["token_blocklist"] = self
+        self.app = app
+
+        self.store = create_store(app.config["BLOCKLIST_STORAGE_URL"])
+        refuse_per_process(
+            app, "BLOCKLIST_STORAGE_URL", "logout feito num worker não vale nos outros",
+        )
+        self._bloom = self._new_bloom()
+
+        # JWTManager já precisa estar inicializado neste app
+        jwt = app.extensions["flask-jwt-extended"]
+        jwt.token_in_blocklist_loader(self._token_in_blocklist)
+
+    def _new_bloom(self):
+        return BloomFilter(
+            self.app.config["BLOCKLIST_BLOOM_CAPACITY"],
+            self.app.config["BLOCKLIST_BLOOM_ERROR_RATE"],
+        )
+
+    def _token_in_blocklist(self, jwt_header, jwt_payload):
+        refresh_jti = jwt_payload.get("rjti")
+        return self.is_revoked(jwt_payload["jti"]) or (
+            refresh_jti is not None and self.is_revoked(refresh_jti)
+        )
+
+    def is_revoked(self, jti):
+        if self.store.shared:
+            self._ensure_worker()
+        if jti not in self._bloom:
+            return False
+        return self.store.contains(jti)
+
+    def revoke(self, jti, expires_at=None):
+        """Revoga o token até ``expires_at`` (epoch; None = para sempre)"""
+        self.store.add(jti, expires_at)
+        with self._lock:
+            self._bloom.add(jti)
+            if self._pending is not None:
+                self._pending.append(jti)
+        if self._bloom.count > self._bloom.capacity:
+            # filtro cheio perde precisão: remonta só com o que ainda vale
+            self.sync()
+
+    def sync(self):
+        """Remonta o Bloom filter com as entradas vivas do store"""
+        with self._sync_lock:
+            with self._lock:
+                self._pending = []
+            bloom = self._new_bloom()
+            for jti in self.store.entries():
+                bloom.add(jti)
+            with self._lock:
+                # revogações feitas aqui enquanto o store era lido
+                for jti in self._pending:
+                    bloom.add(jti)
+                self._pending = None
+                self._bloom = bloom
+            return bloom.count
+
+    def _ensure_worker(self):
+        if self._pid == os.getpid():
+            return
+        with self._worker_lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.sync()
+            threading.Thread(target=self._run, name="token-blocklist", daemon=True).start()
+
+    def _run(self):
+        interval = self.app.config["BLOCKLIST_SYNC_SECONDS"]
+        while True:
+            time.sleep(interval)
+            try:
+                with self.app.app_context():
+                    self.sync()
+            except Exception:
+                self.app.logger.exception("Falha ao sincronizar a blocklist de tokens")
@@ -0,0 +1,89 @@
+# utils/user_import.py
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+
+class UserImportQueue:
+    """Roda as importações de usuários fora da requisição.
+
+    Hashear as senhas custa ~0.2s de CPU por usuário: um arquivo grande
+    passaria de qualquer timeout do servidor. A rota grava o job
+    (``UserImport``) e responde 202; aqui uma thread por worker processa os
+    jobs deste processo, um de cada vez, e grava o resultado no job. Um
+    por vez também limita os processos de hash (utils/passwords.py) ao
+    pool do worker.
+
+    As linhas ficam só na memória: se o worker sai antes de terminar
+    (``worker_exit`` chama ``fail_pending``), os jobs pendentes são
+    marcados como ``failed`` e o arquivo precisa ser reenviado.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._pid = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["user_import"] = self
+        self.app = app
+
+    def submit(self, job_id, rows):
+        with self._lock:
+            if self._pid != os.getpid():
+                # executor herdado do processo pai (fork) não tem thread aqui
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-import")
+                self._pending = set()
+                self._pid = os.getpid()
+            self._pending.add(job_id)
+            return self._executor.submit(self._run, job_id, rows)
+
+    def _run(self, job_id, rows):
+        from app import db
+        from models.UserModel import import_users
+
+        with self.app.app_context():
+            try:
+                self._update(job_id, status="running")
+                results = import_users(rows)
+                created = sum(1 for result in results if result["status"] == "created")
+                self._update(
+                    job_id, status="done", created=created, failed=len(rows) - created,
+                    results=results, finished_at=datetime.now(timezone.utc),
+                )
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.exception("Falha na importação de usuários %s", job_id)
+                self._update(
+                    job_id, status="failed", error=str(e), finished_at=datetime.now(timezone.utc),
+                )
+            finally:
+                with self._lock:
+                    self._pending.discard(job_id)
+
+    def fail_pending(self):
+        """Marca como ``failed`` os jobs deste processo que não terminaram"""
+        with self._lock:
+            if self._pid != os.getpid() or not self._pending:
+                return 0
+            pending = list(self._pending)
+        with self.app.app_context():
+            for job_id in pending:
+                self._update(
+                    job_id, status="failed", error="worker encerrado antes do fim; reenvie o arquivo",
+                    finished_at=datetime.now(timezone.utc),
+                )
+        return len(pending)
+
+    @staticmethod
+    def _update(job_id, **values):
+        from app import db
+        from models.UserModel import UserImport
+
+        db.session.execute(db.update(UserImport).where(UserImport.id == job_id).values(**values))
+        db.session.commit()
@@ -0,0 +1,85 @@
+# utils/validation.py
+import inspect
+import random
+from functools import wraps
+
+from flask import current_app, make_response
+from pydantic import ValidationError
+from spectree.plugins.flask_plugin import FlaskPlugin
+from spectree.plugins.werkzeug_utils import flask_response_unpack
+
+RESPONSE_VALIDATION_MODES = ("full", "sampled", "off")
+
+
+class SampledFlaskPlugin(FlaskPlugin):
+    """Backend do SpecTree com validação de resposta configurável.
+
+    A validação da requisição continua sempre ligada. A da resposta segue
+    ``API_RESPONSE_VALIDATION``:
+
+    - ``full``: valida todas as respostas (comportamento padrão);
+    - ``sampled``: valida uma fração ``API_RESPONSE_VALIDATION_SAMPLE_RATE``;
+    - ``off``: não valida respostas.
+
+    Quando valida, usa o validador já compilado do modelo pydantic, guardado
+    por rota e status, e valida o JSON direto dos bytes em vez de passar por
+    ``parse_raw``/``parse_obj``.
+    """
+
+    def __init__(self, spectree):
+        super().__init__(spectree)
+        self._validators = {}
+
+    def validate(self, func, *args, **kwargs):
+        # Views ``async def`` ficam por baixo do wrapper síncrono do SpecTree,
+        # então o Flask não as adapta sozinho; ensure_sync faz isso aqui
+        if inspect.iscoroutinefunction(func):
+            view = func
+
+            @wraps(view)
+            def func(*view_args, **view_kwargs):
+                return current_app.ensure_sync(view)(*view_args, **view_kwargs)
+
+        return super().validate(func, *args, **kwargs)
+
+    def should_validate_response(self):
+        mode = current_app.config.get("API_RESPONSE_VALIDATION", "full")
+        if mode == "off":
+            return False
+        if mode == "sampled":
+            rate = current_app.config.get("API_RESPONSE_VALIDATION_SAMPLE_RATE", 0.01)
+            return random.random() < rate
+        return True
+
+    def response_validator(self, resp_model, status):
+        key = (resp_model, status)
+        try:
+            return self._validators[key]
+        except KeyError:
+            model = resp_model.find_model(status)
+            validator = model.__pydantic_validator__ if model is not None else None
+            self._validators[key] = validator
+            return validator
+
+    def validate_response(self, resp, resp_model, skip_validation):
+        if skip_validation or resp_model is None or not self.should_validate_response():
+            return super().validate_response(resp, None, True)
+
+        payload, status, _ = flask_response_unpack(resp)
+        if self.is_app_response(payload):
+            # jsonify(...) devolve um Response; o status dele vale se não houver outro
+            if status == 200:
+                status = payload.status_code
+            payload = payload.get_data()
+
+        validator = self.response_validator(resp_model, status)
+        if validator is not None:
+            try:
+                if isinstance(payload, (bytes, str)):
+                    validator.validate_json(payload)
+                elif not isinstance(payload, resp_model.find_model(status)):
+                    validator.validate_python(payload)
+            except ValidationError as err:
+                return make_response(err.errors(include_context=False), 500), err
+
+        return super().validate_response(resp, None, True)
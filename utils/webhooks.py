@@ -0,0 +1,315 @@
+# utils/webhooks.py
+import hashlib
+import hmac
+import http.client
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import select, update
+
+
+class ConnectionPool:
+    """Conexões HTTP keep-alive reaproveitadas entre entregas.
+
+    Guarda até ``maxsize`` conexões ociosas para o host do webhook; quem
+    pega uma conexão a devolve com ``release`` (ou ``discard`` se deu erro,
+    já que o estado dela é desconhecido).
+    """
+
+    def __init__(self, url, maxsize=4, timeout=10):
+        parts = urlsplit(url)
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.host = parts.hostname
+        self.port = parts.port
+        self.connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def discard(self, connection):
+        connection.close()
+
+    def post(self, body, headers):
+        """POST no webhook; devolve ``(status, corpo)``"""
+        connection = self.acquire()
+        try:
+            connection.request("POST", self.path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except Exception:
+            self.discard(connection)
+            raise
+        if response.will_close:
+            self.discard(connection)
+        else:
+            self.release(connection)
+        return response.status, data
+
+
+def backoff_seconds(attempts, base, maximum):
+    """Exponencial com jitter: ``base * 2^(tentativas-1)``, no máximo ``maximum``"""
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def coalesce(events):
+    """Um evento por (tipo, entidade): o mais recente, com quantos ele resume"""
+    latest = {}
+    counts = {}
+    for event in events:
+        key = (event.event_type, event.entity_type, event.entity_id)
+        counts[key] = counts.get(key, 0) + 1
+        if key not in latest or event.id > latest[key].id:
+            latest[key] = event
+    return [
+        {
+            "id": event.id,
+            "type": event.event_type,
+            "entity_type": event.entity_type,
+            "entity_id": event.entity_id,
+            "created_at": event.created_at.isoformat(),
+            "coalesced": counts[key],
+            "data": event.payload,
+        }
+        for key, event in sorted(latest.items(), key=lambda item: item[1].id)
+    ]
+
+
+class WebhookDelivery:
+    """Entrega os eventos do outbox (``pdi_outbox``) para ``WEBHOOK_URL``.
+
+    A cada ciclo pega até ``WEBHOOK_BATCH_SIZE`` eventos pendentes, junta
+    os que se repetem para a mesma entidade e faz um único POST com o lote
+    (``{"events": [...]}``), assinado com HMAC-SHA256 em
+    ``X-Webhook-Signature`` quando há ``WEBHOOK_SECRET``. Falhou: todos do
+    lote voltam para a fila com backoff exponencial; depois de
+    ``WEBHOOK_MAX_ATTEMPTS`` ficam como ``failed``.
+
+    Os eventos são reservados com ``FOR UPDATE SKIP LOCKED`` e um prazo
+    (lease), então mais de um processo pode entregar sem duplicar. Roda
+    numa thread quando ``WEBHOOK_DELIVERY_ENABLED``; ``flask webhooks
+    deliver`` roda o mesmo ciclo fora do servidor.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pool = None
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("WEBHOOK_URL", None)
+        app.config.setdefault("WEBHOOK_SECRET", None)
+        app.config.setdefault("WEBHOOK_DELIVERY_ENABLED", False)
+        app.config.setdefault("WEBHOOK_BATCH_SIZE", 100)
+        app.config.setdefault("WEBHOOK_POLL_SECONDS", 2.0)
+        app.config.setdefault("WEBHOOK_TIMEOUT_SECONDS", 10)
+        app.config.setdefault("WEBHOOK_POOL_SIZE", 4)
+        app.config.setdefault("WEBHOOK_MAX_ATTEMPTS", 10)
+        app.config.setdefault("WEBHOOK_BACKOFF_SECONDS", 5.0)
+        app.config.setdefault("WEBHOOK_BACKOFF_MAX_SECONDS", 3600.0)
+        app.extensions["webhooks"] = self
+        app.cli.add_command(webhooks_cli)
+        self.app = app
+
+        if app.config["WEBHOOK_DELIVERY_ENABLED"] and app.config["WEBHOOK_URL"]:
+            self.start()
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ConnectionPool(
+                self.app.config["WEBHOOK_URL"],
+                maxsize=self.app.config["WEBHOOK_POOL_SIZE"],
+                timeout=self.app.config["WEBHOOK_TIMEOUT_SECONDS"],
+            )
+        return self._pool
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="webhook-delivery", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    delivered, _ = self.deliver_batch()
+            except Exception:
+                self.app.logger.exception("Falha na entrega de webhooks")
+                delivered = 0
+            # lote cheio: provavelmente há mais na fila, segue sem esperar
+            if delivered < self.app.config["WEBHOOK_BATCH_SIZE"]:
+                time.sleep(self.app.config["WEBHOOK_POLL_SECONDS"])
+
+    def _claim(self):
+        """Reserva um lote de pendentes vencidos e devolve os eventos"""
+        from app import db
+        from models.PDI.outbox_model import OutboxEvent, OUTBOX_PENDING
+
+        config = self.app.config
+        now = datetime.now(timezone.utc)
+        lease = timedelta(seconds=config["WEBHOOK_TIMEOUT_SECONDS"] * 3)
+
+        due = (
+            select(OutboxEvent.id)
+            .where(OutboxEvent.status == OUTBOX_PENDING, OutboxEvent.next_attempt_at <= now)
+            .order_by(OutboxEvent.id)
+            .limit(config["WEBHOOK_BATCH_SIZE"])
+            .with_for_update(skip_locked=True)
+        )
+        events = db.session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(due.scalar_subquery()))
+            .values(next_attempt_at=now + lease)
+            .returning(
+                OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.entity_type,
+                OutboxEvent.entity_id, OutboxEvent.payload, OutboxEvent.created_at,
+                OutboxEvent.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.session.commit()
+        return events
+
+    def _post(self, events):
+        body = json.dumps({"events": events}, separators=(",", ":")).encode()
+        headers = {"Content-Type": "application/json"}
+        secret = self.app.config["WEBHOOK_SECRET"]
+        if secret:
+            digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+            headers["X-Webhook-Signature"] = f"sha256={digest}"
+
+        try:
+            status, data = self.pool.post(body, headers)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        if 200 <= status < 300:
+            return None
+        return f"HTTP {status}: {data[:200].decode(errors='replace')}"
+
+    def deliver_batch(self):
+        """Um ciclo de entrega; devolve ``(entregues, com falha)``"""
+        from app import db
+        from models.PDI.outbox_model import OutboxEvent, OUTBOX_DELIVERED, OUTBOX_FAILED
+
+        events = self._claim()
+        if not events:
+            return 0, 0
+
+        error = self._post(coalesce(events))
+        now = datetime.now(timezone.utc)
+        config = self.app.config
+
+        if error is None:
+            rows = [
+                {"id": event.id, "status": OUTBOX_DELIVERED, "delivered_at": now,
+                 "attempts": event.attempts + 1}
+                for event in events
+            ]
+        else:
+            self.app.logger.warning("Webhook falhou para %d eventos: %s", len(events), error)
+            rows = []
+            for event in events:
+                attempts = event.attempts + 1
+                row = {"id": event.id, "attempts": attempts, "last_error": error}
+                if attempts >= config["WEBHOOK_MAX_ATTEMPTS"]:
+                    row["status"] = OUTBOX_FAILED
+                else:
+                    row["next_attempt_at"] = now + timedelta(seconds=backoff_seconds(
+                        attempts, config["WEBHOOK_BACKOFF_SECONDS"], config["WEBHOOK_BACKOFF_MAX_SECONDS"]
+                    ))
+                rows.append(row)
+
+        # UPDATE em lote por PK; as chaves variam por linha, então agrupa
+        by_keys = {}
+        for row in rows:
+            by_keys.setdefault(tuple(sorted(row)), []).append(row)
+        for group in by_keys.values():
+            db.session.execute(update(OutboxEvent), group)
+        db.session.commit()
+
+        return (len(events), 0) if error is None else (0, len(events))
+
+
+@click.group("webhooks")
+def webhooks_cli():
+    """Entrega dos eventos do outbox para WEBHOOK_URL"""
+
+
+@webhooks_cli.command("deliver")
+@click.option("--loop", is_flag=True, help="Continua entregando até ser interrompido")
+@with_appcontext
+def deliver_command(loop):
+    """Entrega os eventos pendentes do outbox"""
+    from flask import current_app
+
+    if not current_app.config["WEBHOOK_URL"]:
+        raise click.ClickException("WEBHOOK_URL não configurada")
+
+    delivery = current_app.extensions["webhooks"]
+    total_delivered = total_failed = 0
+    while True:
+        delivered, failed = delivery.deliver_batch()
+        total_delivered += delivered
+        total_failed += failed
+        # falhas voltam para a fila com backoff, então o lote seguinte é outro
+        if not delivered and not failed:
+            if not loop:
+                break
+            time.sleep(current_app.config["WEBHOOK_POLL_SECONDS"])
+    click.echo(f"{total_delivered} eventos entregues, {total_failed} com falha")
+
+
+@webhooks_cli.command("receiver")
+@click.option("--port", type=int, default=8099, show_default=True)
+@click.option("--fail-rate", type=float, default=0.0, help="Fração de requisições respondidas com 503")
+def receiver_command(port, fail_rate):
+    """Servidor local que faz o papel do sistema externo (desenvolvimento)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            status = 503 if random.random() < fail_rate else 200
+            if status == 200:
+                for event in json.loads(body)["events"]:
+                    click.echo(
+                        f"{event['type']} {event['entity_type']}={event['entity_id']} "
+                        f"(x{event['coalesced']}) {json.dumps(event['data'])}"
+                    )
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    click.echo(f"Recebendo webhooks em http://127.0.0.1:{port}/")
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()